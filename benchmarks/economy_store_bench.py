@@ -0,0 +1,92 @@
+"""Per-command latency of the economy store at different user counts.
+
+Usage: python -m benchmarks.economy_store_bench [--sizes 10000 100000 1000000]
+
+Each "command" is what ``!bal``/``!fish`` do against the store: one
+``get_user`` followed by one ``update_user``. When tinydb is installed the
+old ``TinyDB('economy.json')`` layout is measured too (only for sizes up to
+100k, it is far too slow beyond that).
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from utils.economy_store import SQLiteEconomyStore, default_user
+
+try:
+    from tinydb import TinyDB, Query
+except ImportError:
+    TinyDB = None
+
+
+def _users(start: int, stop: int):
+    users = []
+    for user_id in range(start, stop):
+        user = default_user(user_id)
+        user['wallet'] = random.randint(0, 100000)
+        users.append(user)
+    return users
+
+
+def _populate(insert, size: int, chunk: int = 50_000):
+    for start in range(0, size, chunk):
+        insert(_users(start, min(start + chunk, size)))
+
+
+def _report(name: str, size: int, samples):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:<8} {size:>9,} users  "
+          f"mean {statistics.mean(samples) * 1000:8.3f} ms  "
+          f"p50 {statistics.median(samples) * 1000:8.3f} ms  "
+          f"p99 {p99 * 1000:8.3f} ms")
+
+
+def bench_sqlite(workdir: Path, size: int, commands: int):
+    store = SQLiteEconomyStore(workdir / f"economy_{size}.db")
+    _populate(store.insert_users, size)
+    samples = []
+    for _ in range(commands):
+        user_id = random.randrange(size)
+        start = time.perf_counter()
+        data = store.get_user(user_id)
+        store.update_user(user_id, {'wallet': data['wallet'] + 1})
+        samples.append(time.perf_counter() - start)
+    store.close()
+    _report("sqlite", size, samples)
+
+
+def bench_tinydb(workdir: Path, size: int, commands: int):
+    db = TinyDB(workdir / f"economy_{size}.json")
+    _populate(db.insert_multiple, size)
+    User = Query()
+    samples = []
+    for _ in range(commands):
+        user_id = random.randrange(size)
+        start = time.perf_counter()
+        data = db.get(User.user_id == user_id)
+        db.update({'wallet': data['wallet'] + 1}, User.user_id == user_id)
+        samples.append(time.perf_counter() - start)
+    db.close()
+    _report("tinydb", size, samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--commands", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for size in args.sizes:
+            bench_sqlite(workdir, size, args.commands)
+            if TinyDB and size <= 100_000:
+                bench_tinydb(workdir, size, max(args.commands // 100, 10))
+
+
+if __name__ == "__main__":
+    main()
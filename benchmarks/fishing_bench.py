@@ -0,0 +1,71 @@
+"""Casts per second: compiled loot table vs. the old per-cast table rebuild.
+
+Usage: python -m benchmarks.fishing_bench [--casts 200000] [--luck 5]
+
+``legacy_cast`` is the pre-loot-table algorithm from ``FishingSystem.fishing``
+(tier weights rebuilt, fish list scanned, special events parsed from their
+display text on every cast), kept here only as the baseline.
+"""
+import argparse
+import random
+import time
+
+from utils.fish_data import ENCHANTMENTS, fish_data, modifiers, special_events, tiers
+from utils.loot_table import LOOT_TABLE
+
+EVENT_TEXTS = [event['text'] for event in special_events]
+
+
+def legacy_cast(luck_level: int):
+    enchanted_tiers = dict(tiers)
+    if luck_level > 0:
+        boost = ENCHANTMENTS['luck']['tier_boost_per_level'] * luck_level
+        for tier in ['rare', 'epic', 'legendary']:
+            if tier in enchanted_tiers:
+                enchanted_tiers[tier] *= (1 + boost)
+
+    tier = random.choices(list(enchanted_tiers.keys()), weights=list(enchanted_tiers.values()), k=1)[0]
+    tier_fish = [(name, data) for name, data in fish_data.items() if data[2] == tier]
+    caught_fish = random.choice(tier_fish)[0] if tier_fish else "🐟 Small Fish"
+    min_price, max_price, _ = fish_data[caught_fish]
+    earnings = random.randint(min_price, max_price)
+
+    for mod_name, mod_data in modifiers.items():
+        if random.random() < mod_data['chance']:
+            earnings = int(earnings * mod_data['multiplier'])
+            caught_fish = f"{mod_data['prefix']} {caught_fish} [{mod_name.title()}]"
+            break
+
+    if random.random() < 0.10:
+        special_event = random.choice(EVENT_TEXTS)
+        if "Double" in special_event:
+            earnings *= 2
+        elif "Triple" in special_event:
+            earnings *= 3
+        elif "Extra" in special_event:
+            earnings += int(special_event.split()[special_event.split().index("coins!") - 1])
+    return caught_fish, earnings
+
+
+def run(name: str, cast, casts: int):
+    start = time.perf_counter()
+    for _ in range(casts):
+        cast()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<12} {casts / elapsed:>12,.0f} casts/s  ({elapsed * 1e6 / casts:.2f} us/cast)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--casts", type=int, default=200_000)
+    parser.add_argument("--luck", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = run("legacy", lambda: legacy_cast(args.luck), args.casts)
+    compiled = run("loot table", lambda: LOOT_TABLE.cast(args.luck), args.casts)
+    print(f"speedup: {legacy / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,155 @@
-import json
 import nextcord
 from nextcord.ext import commands
 from nextcord import Embed
+import time
 from datetime import datetime
-import os
+from utils.mod_log_config import get_mod_log_configs
+from utils.log_dispatcher import get_log_dispatcher
+from utils.message_cache import CachedMessage, get_message_cache
+from utils.audit_archive import get_audit_archive
+
+# An uncached MESSAGE_UPDATE whose edit is older than this is a pin, an
+# embed unfurl or similar re-send of the whole message, not a new edit.
+EDIT_FRESHNESS = 60
+
 
 class LoggingListener(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.configs = get_mod_log_configs(bot)
+        self.dispatcher = get_log_dispatcher(bot)
+        self.messages = get_message_cache(bot)
+        self.archive = get_audit_archive(bot)
+        self.configs.subscribe(self.on_config_change)
+
+    def cog_unload(self):
+        self.configs.unsubscribe(self.on_config_change)
+        self.archive.flush()
+        self.dispatcher.flush_all()
+
+    def on_config_change(self, guild_id: int, config: dict):
+        if not self.logs_messages(config):
+            self.messages.drop_guild(guild_id)
 
     def get_guild_config(self, guild_id: int) -> dict:
-        path = f"database/mod_logs/{guild_id}.json"
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {"enabled": False, "log_channel": None, "log_types": {}}
+        return self.configs.get(guild_id)
 
     def get_log_channel(self, guild, config):
         log_channel_id = config.get("log_channel")
         return guild.get_channel(log_channel_id) if log_channel_id else None
 
+    def submit(self, log_channel, embed: Embed, log_type: str, user_id=None, channel_id=None, **fields):
+        """Send ``embed`` to the log channel and keep a copy in the audit archive."""
+        self.archive.record(log_channel.guild.id, log_type, user_id, channel_id,
+                            title=embed.title, description=embed.description, **fields)
+        self.dispatcher.submit(log_channel, embed, log_type)
+
+    def logs_messages(self, config) -> bool:
+        return config["enabled"] and (
+            config["log_types"].get("message_delete", False) or config["log_types"].get("message_edit", False)
+        )
+
+    @staticmethod
+    def format_content(record) -> str:
+        if record is None:
+            return "*Not cached*"
+        content = record.content[:1000] or "*No text*"
+        if record.attachments:
+            content += "\n" + "\n".join(record.attachments)
+        return content[:1024]
+
+    @commands.Cog.listener()
+    async def on_message(self, message: nextcord.Message):
+        if not message.guild or message.author.bot:
+            return
+        if self.logs_messages(self.get_guild_config(message.guild.id)):
+            self.messages.remember(message)
+
     @commands.Cog.listener()
-    async def on_message_delete(self, message: nextcord.Message):
-        if not message.guild:
+    async def on_raw_message_delete(self, payload: nextcord.RawMessageDeleteEvent):
+        if not payload.guild_id:
             return
 
-        config = self.get_guild_config(message.guild.id)
-        if config["enabled"] and config["log_types"].get("message_delete", False):
-            log_channel = self.get_log_channel(message.guild, config)
+        record = self.messages.pop(payload.guild_id, payload.message_id)
+        if record is None and payload.cached_message:
+            if payload.cached_message.author.bot:
+                return
+            record = CachedMessage.from_message(payload.cached_message)
+
+        config = self.get_guild_config(payload.guild_id)
+        guild = self.bot.get_guild(payload.guild_id)
+        if guild and config["enabled"] and config["log_types"].get("message_delete", False):
+            log_channel = self.get_log_channel(guild, config)
             if log_channel:
+                author_id = record.author_id if record else None
+                author = f"<@{author_id}>" if author_id else "Unknown"
                 embed = Embed(
                     title="🗑️ Message Deleted",
-                    description=f"**Author:** {message.author.mention}\n**Content:** {message.content[1000]}",
+                    description=(
+                        f"**Author:** {author}\n"
+                        f"**Channel:** <#{payload.channel_id}>\n"
+                        f"**Content:** {self.format_content(record)}"
+                    ),
                     color=0xff0000,
                     timestamp=datetime.utcnow()
                 )
-                embed.set_footer(text=f"Message ID: {message.id}")
-                await log_channel.send(embed=embed)
+                embed.set_footer(text=f"Message ID: {payload.message_id}")
+                self.submit(log_channel, embed, "message_delete", user_id=author_id, channel_id=payload.channel_id)
 
     @commands.Cog.listener()
-    async def on_message_edit(self, before: nextcord.Message, after: nextcord.Message):
-        if not before.guild:
+    async def on_raw_message_edit(self, payload: nextcord.RawMessageUpdateEvent):
+        data = payload.data
+        guild_id = data.get("guild_id")
+        # Embed-only updates (link previews) carry no content.
+        if not guild_id or "content" not in data or data.get("author", {}).get("bot"):
+            return
+        guild_id = int(guild_id)
+        try:
+            edited_at = datetime.fromisoformat(data["edited_timestamp"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            # Never edited: a pin or unfurl re-sending the message.
             return
 
-        config = self.get_guild_config(before.guild.id)
-        if config["enabled"] and config["log_types"].get("message_edit", False):
-            log_channel = self.get_log_channel(before.guild, config)
-            if log_channel and before.content != after.content:
+        before = self.messages.get(guild_id, payload.message_id)
+        if before is None and payload.cached_message:
+            before = CachedMessage.from_message(payload.cached_message)
+        if before is None and time.time() - edited_at > EDIT_FRESHNESS:
+            return
+        if before is not None and before.edited_at == edited_at:
+            return
+        author_id = int(data["author"]["id"]) if "author" in data else (before and before.author_id)
+        after = CachedMessage(
+            payload.message_id,
+            author_id,
+            payload.channel_id,
+            data["content"],
+            tuple(attachment["url"] for attachment in data.get("attachments", ())),
+            edited_at
+        )
+        if before is not None and before.content == after.content:
+            return
+
+        config = self.get_guild_config(guild_id)
+        if self.logs_messages(config):
+            self.messages.put(guild_id, after)
+        guild = self.bot.get_guild(guild_id)
+        if guild and config["enabled"] and config["log_types"].get("message_edit", False):
+            log_channel = self.get_log_channel(guild, config)
+            if log_channel:
+                author = f"<@{author_id}>" if author_id else "Unknown"
                 embed = Embed(
                     title="✏️ Message Edited",
                     description=(
-                        f"**Author:** {before.author.mention}\n"
-                        f"**Before:** {before.content[1000]}\n"
-                        f"**After:** {after.content[1000]}"
+                        f"**Author:** {author}\n"
+                        f"**Channel:** <#{payload.channel_id}>\n"
+                        f"**Before:** {self.format_content(before)}\n"
+                        f"**After:** {self.format_content(after)}"
                     ),
                     color=0x00ff00,
                     timestamp=datetime.utcnow()
                 )
-                embed.set_footer(text=f"Message ID: {before.id}")
-                await log_channel.send(embed=embed)
+                embed.set_footer(text=f"Message ID: {payload.message_id}")
+                self.submit(log_channel, embed, "message_edit", user_id=author_id, channel_id=payload.channel_id)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: nextcord.Member):
@@ -73,7 +164,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {member.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "member_join", user_id=member.id)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: nextcord.Member):
@@ -88,7 +179,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {member.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "member_leave", user_id=member.id)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: nextcord.Guild, user: nextcord.User):
@@ -103,7 +194,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {user.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "member_ban", user_id=user.id)
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild: nextcord.Guild, user: nextcord.User):
@@ -118,7 +209,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {user.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "member_unban", user_id=user.id)
 
     @commands.Cog.listener()
     async def on_guild_role_update(self, before: nextcord.Role, after: nextcord.Role):
@@ -137,7 +228,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Role ID: {after.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "role_update", role_id=after.id)
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: nextcord.abc.GuildChannel):
@@ -156,7 +247,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Channel ID: {channel.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "channel_create", channel_id=channel.id)
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel: nextcord.abc.GuildChannel):
@@ -175,7 +266,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Channel ID: {channel.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "channel_delete", channel_id=channel.id)
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before: nextcord.abc.GuildChannel, after: nextcord.abc.GuildChannel):
@@ -199,7 +290,7 @@ class LoggingListener(commands.Cog):
                         timestamp=datetime.utcnow()
                     )
                     embed.set_footer(text=f"Channel ID: {after.id}")
-                    await log_channel.send(embed=embed)
+                    self.submit(log_channel, embed, "channel_update", channel_id=after.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: nextcord.Member, before: nextcord.VoiceState, after: nextcord.VoiceState):
@@ -223,7 +314,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {member.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "voice_state", user_id=member.id, channel_id=(after.channel or before.channel).id)
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: nextcord.Role):
@@ -243,7 +334,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Role ID: {role.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "role_create", role_id=role.id)
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: nextcord.Role):
@@ -258,7 +349,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Role ID: {role.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "role_delete", role_id=role.id)
 
     @commands.Cog.listener()
     async def on_member_update(self, before: nextcord.Member, after: nextcord.Member):
@@ -278,7 +369,7 @@ class LoggingListener(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"User ID: {after.id}")
-                await log_channel.send(embed=embed)
+                self.submit(log_channel, embed, "member_timeout", user_id=after.id)
 
 def setup(bot):
     bot.add_cog(LoggingListener(bot))
\ No newline at end of file
@@ -1,34 +1,32 @@
 import nextcord
 from nextcord.ext import commands
-from tinydb import TinyDB, Query
 import random
 import time
 from typing import Optional
 import os
 import asyncio
+from utils.economy_store import get_economy_store
+from utils.economy_ledger import get_ledger, InsufficientFunds
+from utils.economy_journal import JournalRangeError
+from utils.leaderboard import get_leaderboard
+from utils.shop_data import items as shop_items, BANK_UPGRADE_CAPACITY
+from utils.gambling_data import gamble_win_chance, slot_symbols, slot_payouts
 
 os.makedirs('database', exist_ok=True)
 
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = TinyDB('database/economy.json')
-        self.User = Query()
+        self.db = get_economy_store(bot)
+        self.ledger = get_ledger(bot)
+        self.leaderboard = get_leaderboard(bot)
+        self.leaderboard_cache = {}
+
+    def cog_unload(self):
+        self.db.flush()
 
     def get_user_data(self, user_id: int):
-        user = self.db.get(self.User.user_id == user_id)
-        if not user:
-            user = {
-                'user_id': user_id,
-                'wallet': 0,
-                'bank': 0,
-                'bank_capacity': 1000,
-                'last_daily': 0,
-                'last_work': 0,
-                'inventory': []
-            }
-            self.db.insert(user)
-        return user
+        return self.db.get_user(user_id)
 
     @commands.command(name="balance", aliases=["bal", "money"])
     async def balance(self, ctx, member: Optional[nextcord.Member] = None):
@@ -41,66 +39,62 @@ class Economy(commands.Cog):
 
     @commands.command(aliases=["dep"])
     async def deposit(self, ctx, amount: str):
-        data = self.get_user_data(ctx.author.id)
-        if amount.lower() == "all":
-            amount = data['wallet']
-        else:
+        all_in = amount.lower() == "all"
+        if not all_in:
             try:
                 amount = int(amount)
             except ValueError:
                 await ctx.send("Please enter a valid amount!")
                 return
 
-        if amount <= 0:
-            await ctx.send("Amount must be positive!")
-            return
-        if amount > data['wallet']:
-            await ctx.send("You don't have that much money!")
-            return
-        if data['bank'] + amount > data['bank_capacity']:
-            await ctx.send("Your bank cannot hold that much!")
-            return
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+            if all_in:
+                amount = data['wallet']
+
+            if amount <= 0:
+                message = "Amount must be positive!"
+            elif amount > data['wallet']:
+                message = "You don't have that much money!"
+            elif data['bank'] + amount > data['bank_capacity']:
+                message = "Your bank cannot hold that much!"
+            else:
+                self.ledger.apply({ctx.author.id: -amount}, "deposit", {ctx.author.id: {'bank': data['bank'] + amount}})
+                message = f"Successfully deposited 💰 {amount}!"
 
-        self.db.update({
-            'wallet': data['wallet'] - amount,
-            'bank': data['bank'] + amount
-        }, self.User.user_id == ctx.author.id)
-        await ctx.send(f"Successfully deposited 💰 {amount}!")
+        await ctx.send(message)
 
     @commands.command(aliases=["with"])
     async def withdraw(self, ctx, amount: str):
-        data = self.get_user_data(ctx.author.id)
-        if amount.lower() == "all":
-            amount = data['bank']
-        else:
+        all_in = amount.lower() == "all"
+        if not all_in:
             try:
                 amount = int(amount)
             except ValueError:
                 await ctx.send("Please enter a valid amount!")
                 return
 
-        if amount <= 0:
-            await ctx.send("Amount must be positive!")
-            return
-        if amount > data['bank']:
-            await ctx.send("You don't have that much money in your bank!")
-            return
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+            if all_in:
+                amount = data['bank']
+
+            if amount <= 0:
+                message = "Amount must be positive!"
+            elif amount > data['bank']:
+                message = "You don't have that much money in your bank!"
+            else:
+                self.ledger.apply({ctx.author.id: amount}, "withdraw", {ctx.author.id: {'bank': data['bank'] - amount}})
+                message = f"Successfully withdrew 💰 {amount}!"
 
-        self.db.update({
-            'wallet': data['wallet'] + amount,
-            'bank': data['bank'] - amount
-        }, self.User.user_id == ctx.author.id)
-        await ctx.send(f"Successfully withdrew 💰 {amount}!")
+        await ctx.send(message)
 
     @commands.command(aliases=["daily"])
     @commands.cooldown(1, 86400, commands.BucketType.user)
     async def claim_daily(self, ctx):
         reward = random.randint(100, 500)
-        data = self.get_user_data(ctx.author.id)
-        self.db.update({
-            'wallet': data['wallet'] + reward,
-            'last_daily': time.time()
-        }, self.User.user_id == ctx.author.id)
+        async with self.ledger.lock(ctx.author.id):
+            self.ledger.apply({ctx.author.id: reward}, "daily", {ctx.author.id: {'last_daily': time.time()}})
         await ctx.send(f"You claimed your daily reward of 💰 {reward}!")
 
     @commands.command(aliases=["steal", "rob"])
@@ -110,34 +104,24 @@ class Economy(commands.Cog):
             await ctx.send("You can't rob yourself!")
             return
 
-        thief_data = self.get_user_data(ctx.author.id)
-        target_data = self.get_user_data(target.id)
-        
-        if target_data['wallet'] < 100:
-            await ctx.send("Target doesn't have enough money to steal!")
-            return
-        
-        if thief_data['wallet'] < 1000:
-            await ctx.send("You need at least 💰 1000 to attempt a heist!")
-            return
+        async with self.ledger.lock(ctx.author.id, target.id):
+            thief_data = self.get_user_data(ctx.author.id)
+            target_data = self.get_user_data(target.id)
 
-        success = random.random() < 0.4
-        
-        if success:
-            steal_amount = random.randint(1, min(target_data['wallet'], 1000))
-            self.db.update({
-                'wallet': thief_data['wallet'] + steal_amount
-            }, self.User.user_id == ctx.author.id)
-            self.db.update({
-                'wallet': target_data['wallet'] - steal_amount
-            }, self.User.user_id == target.id)
-            await ctx.send(f"Heist successful! You stole 💰 {steal_amount}!")
-        else:
-            fine = random.randint(500, 1000)
-            self.db.update({
-                'wallet': thief_data['wallet'] - fine
-            }, self.User.user_id == ctx.author.id)
-            await ctx.send(f"Heist failed! You were fined 💰 {fine}!")
+            if target_data['wallet'] < 100:
+                message = "Target doesn't have enough money to steal!"
+            elif thief_data['wallet'] < 1000:
+                message = "You need at least 💰 1000 to attempt a heist!"
+            elif random.random() < 0.4:
+                steal_amount = random.randint(1, min(target_data['wallet'], 1000))
+                self.ledger.apply({ctx.author.id: steal_amount, target.id: -steal_amount}, "heist")
+                message = f"Heist successful! You stole 💰 {steal_amount}!"
+            else:
+                fine = random.randint(500, 1000)
+                self.ledger.apply({ctx.author.id: -fine}, "heist_fine")
+                message = f"Heist failed! You were fined 💰 {fine}!"
+
+        await ctx.send(message)
 
     @commands.command(aliases=["givemoney", "pay"])
     async def transfer(self, ctx, target: nextcord.Member, amount: int):
@@ -145,32 +129,24 @@ class Economy(commands.Cog):
             await ctx.send("Amount must be positive!")
             return
             
-        sender_data = self.get_user_data(ctx.author.id)
-        if amount > sender_data['wallet']:
+        if target.id == ctx.author.id:
+            await ctx.send("You can't transfer money to yourself!")
+            return
+
+        try:
+            await self.ledger.transfer(ctx.author.id, target.id, amount)
+        except InsufficientFunds:
             await ctx.send("You don't have enough money!")
             return
-            
-        receiver_data = self.get_user_data(target.id)
-        
-        self.db.update({
-            'wallet': sender_data['wallet'] - amount
-        }, self.User.user_id == ctx.author.id)
-        self.db.update({
-            'wallet': receiver_data['wallet'] + amount
-        }, self.User.user_id == target.id)
-        
+
         await ctx.send(f"Successfully transferred 💰 {amount} to {target.name}!")
 
     @commands.command(aliases=["work", "job"])
     @commands.cooldown(1, 3600, commands.BucketType.user)
     async def earn(self, ctx):
         earnings = random.randint(50, 200)
-        data = self.get_user_data(ctx.author.id)
-        
-        self.db.update({
-            'wallet': data['wallet'] + earnings,
-            'last_work': time.time()
-        }, self.User.user_id == ctx.author.id)
+        async with self.ledger.lock(ctx.author.id):
+            self.ledger.apply({ctx.author.id: earnings}, "work", {ctx.author.id: {'last_work': time.time()}})
         
         jobs = ["programmer", "teacher", "chef", "driver", "artist"]
         job = random.choice(jobs)
@@ -179,145 +155,162 @@ class Economy(commands.Cog):
 
     @commands.command(aliases=["shop"])
     async def store(self, ctx):
-        items = [
-            {"name": "Fishing Rod", "price": 500, "id": "rod"},
-            {"name": "Laptop", "price": 2000, "id": "laptop"},
-            {"name": "Bank Upgrade", "price": 5000, "id": "bank_upgrade"}
-        ]
-        
         embed = nextcord.Embed(title="Store", description="Available items:", color=0x00ff00)
-        for item in items:
-            embed.add_field(name=item["name"], value=f"Price: 💰 {item['price']}\nID: {item['id']}", inline=False)
+        for item_id, item in shop_items.items():
+            embed.add_field(name=item["name"], value=f"Price: 💰 {item['price']}\nID: {item_id}", inline=False)
         
         await ctx.send(embed=embed)
 
     @commands.command(aliases=["purchase"])
     async def buy(self, ctx, item_id: str):
-        items = {
-            "rod": {"name": "Fishing Rod", "price": 500},
-            "laptop": {"name": "Laptop", "price": 2000},
-            "bank_upgrade": {"name": "Bank Upgrade", "price": 5000}
-        }
-        
-        if item_id not in items:
+        if item_id not in shop_items:
             await ctx.send("Invalid item ID!")
             return
             
-        item = items[item_id]
-        data = self.get_user_data(ctx.author.id)
-        
-        if data['wallet'] < item['price']:
-            await ctx.send("You don't have enough money!")
-            return
-            
-        if item_id == "bank_upgrade":
-            self.db.update({
-                'wallet': data['wallet'] - item['price'],
-                'bank_capacity': data['bank_capacity'] + 5000
-            }, self.User.user_id == ctx.author.id)
-            await ctx.send(f"You purchased a bank upgrade! New capacity: 💰 {data['bank_capacity'] + 5000}")
-        else:
-            inventory = data.get('inventory', [])
-            inventory.append(item_id)
-            self.db.update({
-                'wallet': data['wallet'] - item['price'],
-                'inventory': inventory
-            }, self.User.user_id == ctx.author.id)
-            await ctx.send(f"You purchased a {item['name']}!")
+        item = shop_items[item_id]
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+
+            if data['wallet'] < item['price']:
+                message = "You don't have enough money!"
+            else:
+                if item_id == "bank_upgrade":
+                    changes = {'bank_capacity': data['bank_capacity'] + BANK_UPGRADE_CAPACITY}
+                    message = f"You purchased a bank upgrade! New capacity: 💰 {changes['bank_capacity']}"
+                else:
+                    inventory = data['inventory']
+                    inventory[item_id] = inventory.get(item_id, 0) + 1
+                    changes = {'inventory': inventory}
+                    message = f"You purchased a {item['name']}!"
+                self.ledger.apply({ctx.author.id: -item['price']}, f"buy:{item_id}", {ctx.author.id: changes})
+
+        await ctx.send(message)
 
     @commands.command(aliases=["inv"])
     async def inventory(self, ctx):
         data = self.get_user_data(ctx.author.id)
-        inventory = data.get('inventory', [])
+        inventory = {item_id: count for item_id, count in data['inventory'].items() if count > 0}
         
         if not inventory:
             await ctx.send("Your inventory is empty!")
             return
             
-        item_counts = {}
-        for item in inventory:
-            item_counts[item] = item_counts.get(item, 0) + 1
-            
         embed = nextcord.Embed(title=f"{ctx.author.name}'s Inventory", color=0x00ff00)
-        for item, count in item_counts.items():
-            embed.add_field(name=item.title(), value=f"Quantity: {count}", inline=False)
+        for item_id, count in inventory.items():
+            name = shop_items.get(item_id, {}).get("name", item_id.title())
+            embed.add_field(name=name, value=f"Quantity: {count}", inline=False)
             
         await ctx.send(embed=embed)
 
     @commands.command(aliases=["bet"])
     @commands.cooldown(300, 30, commands.BucketType.user)
     async def gamble(self, ctx, amount: int):
-        data = self.get_user_data(ctx.author.id)
-        
         if amount <= 0:
             await ctx.send("Amount must be positive!")
             return
-        if amount > data['wallet']:
-            await ctx.send("You don't have enough money!")
+
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+            if amount > data['wallet']:
+                message = "You don't have enough money!"
+            elif random.random() < gamble_win_chance:
+                self.ledger.apply({ctx.author.id: amount}, "gamble")
+                message = f"🎰 You won! Your reward: 💰 {amount * 2}"
+            else:
+                self.ledger.apply({ctx.author.id: -amount}, "gamble")
+                message = "🎰 You lost! Better luck next time!"
+
+        await ctx.send(message)
+
+    async def get_user_name(self, user_id: int) -> str:
+        user = self.bot.get_user(user_id)
+        if user is None:
+            try:
+                user = await self.bot.fetch_user(user_id)
+            except nextcord.NotFound:
+                return f"Unknown User ({user_id})"
+        return user.name
+
+    async def send_leaderboard(self, ctx, page: int, guild: Optional[nextcord.Guild] = None):
+        if page < 1:
+            await ctx.send("Page must be 1 or higher!")
             return
-            
-        if random.random() < 0.45:
-            winnings = amount * 2
-            self.db.update({
-                'wallet': data['wallet'] + amount
-            }, self.User.user_id == ctx.author.id)
-            await ctx.send(f"🎰 You won! Your reward: 💰 {winnings}")
+
+        member_filter = (lambda user_id: guild.get_member(user_id) is not None) if guild else None
+        rows = tuple(self.leaderboard.page(page, 10, member_filter))
+        if not rows:
+            await ctx.send("There is nobody on that page!")
+            return
+
+        # Names are only looked up again when the ranking on this page changed.
+        key = (guild.id if guild else None, page)
+        cached = self.leaderboard_cache.get(key)
+        if cached and cached[0] == rows:
+            await ctx.send(embed=cached[1])
+            return
+
+        title = f"Richest Users in {guild.name}" if guild else "Richest Users"
+        embed = nextcord.Embed(title=title, color=0x00ff00)
+        for rank, user_id, total in rows:
+            embed.add_field(
+                name=f"{rank}. {await self.get_user_name(user_id)}",
+                value=f"Total: 💰 {total}",
+                inline=False
+            )
+        if not guild:
+            embed.set_footer(text=f"Page {page}/{self.leaderboard.page_count(10)}")
         else:
-            self.db.update({
-                'wallet': data['wallet'] - amount
-            }, self.User.user_id == ctx.author.id)
-            await ctx.send("🎰 You lost! Better luck next time!")
-
-    @commands.command(aliases=["lb"])
-    async def leaderboard(self, ctx):
-        all_users = self.db.all()
-        sorted_users = sorted(all_users, 
-                            key=lambda x: x.get('wallet', 0) + x.get('bank', 0), 
-                            reverse=True)[:10]
-        
-        embed = nextcord.Embed(title="Richest Users", color=0x00ff00)
-        for idx, user in enumerate(sorted_users, 1):
-            user_obj = self.bot.get_user(user['user_id'])
-            if user_obj:
-                total = user.get('wallet', 0) + user.get('bank', 0)
-                embed.add_field(
-                    name=f"{idx}. {user_obj.name}",
-                    value=f"Total: 💰 {total}",
-                    inline=False
-                )
+            embed.set_footer(text=f"Page {page}")
+
+        if len(self.leaderboard_cache) >= 500:
+            self.leaderboard_cache.clear()
+        self.leaderboard_cache[key] = (rows, embed)
         await ctx.send(embed=embed)
 
+    @commands.group(aliases=["lb"], invoke_without_command=True)
+    async def leaderboard(self, ctx, page: int = 1):
+        await self.send_leaderboard(ctx, page)
+
+    @leaderboard.command(name="page")
+    async def leaderboard_page(self, ctx, page: int):
+        await self.send_leaderboard(ctx, page)
+
+    @leaderboard.command(name="server", aliases=["guild"])
+    @commands.guild_only()
+    async def leaderboard_server(self, ctx, page: int = 1):
+        await self.send_leaderboard(ctx, page, ctx.guild)
+
     @commands.command(aliases=["sl"])
     @commands.cooldown(300, 30, commands.BucketType.user)
     async def slots(self, ctx, amount: int):
-        data = self.get_user_data(ctx.author.id)
-        
         if amount <= 0:
             await ctx.send("Amount must be positive!")
             return
-        if amount > data['wallet']:
-            await ctx.send("You don't have enough money!")
-            return
-            
-        emojis = ["🍎", "🍊", "🍇", "🍒", "💎", "7️⃣"]
-        slots = [random.choice(emojis) for _ in range(3)]
-        
-        result = " | ".join(slots)
-        await ctx.send(f"🎰 Spinning...\n{result}")
-        
+
+        slots = [random.choice(slot_symbols) for _ in range(3)]
+
         if len(set(slots)) == 1:
-            winnings = amount * 5
+            winnings = amount * slot_payouts[3]
             message = f"JACKPOT! You won 💰 {winnings}!"
         elif len(set(slots)) == 2:
-            winnings = amount * 2
+            winnings = amount * slot_payouts[2]
             message = f"Two of a kind! You won 💰 {winnings}!"
         else:
             winnings = -amount
             message = "No match! Better luck next time!"
-            
-        self.db.update({
-            'wallet': data['wallet'] + winnings
-        }, self.User.user_id == ctx.author.id)
+
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+            enough = amount <= data['wallet']
+            if enough:
+                self.ledger.apply({ctx.author.id: winnings}, "slots")
+
+        if not enough:
+            await ctx.send("You don't have enough money!")
+            return
+
+        result = " | ".join(slots)
+        await ctx.send(f"🎰 Spinning...\n{result}")
         await ctx.send(message)
 
 
@@ -334,6 +327,52 @@ class Economy(commands.Cog):
             {"capacity": 100000, "price": 50000}
         ]
 
+    @commands.command(name="history", aliases=["transactions"])
+    async def history(self, ctx, member: Optional[nextcord.Member] = None):
+        member = member or ctx.author
+        entries = self.ledger.history(member.id, 10)
+        embed = nextcord.Embed(title=f"{member.name}'s Recent Activity", color=0x00ff00)
+        if not entries:
+            embed.description = "No transactions yet."
+        else:
+            lines = []
+            for entry in entries:
+                delta = entry.get('wallet', 0)
+                amount = f"💰 {delta:+}" if delta else ", ".join(entry.get('set', {})) or "-"
+                lines.append(f"<t:{int(entry['ts'])}:R> **{entry['kind']}** {amount}")
+            embed.description = "\n".join(lines)
+        await ctx.send(embed=embed)
+
+    @commands.command(name="ecorestore")
+    @commands.is_owner()
+    async def economy_restore(self, ctx, timestamp: float):
+        """Roll every balance back to a unix timestamp from the journal."""
+        try:
+            restored = await self.ledger.restore(timestamp)
+        except JournalRangeError as e:
+            if e.earliest is None:
+                await ctx.send("The journal has no snapshots yet; nothing to restore from.")
+            else:
+                await ctx.send(f"The journal only goes back to <t:{int(e.earliest)}:f>; nothing was restored.")
+            return
+        self.leaderboard_cache.clear()
+        await ctx.send(f"Restored {restored} users to <t:{int(timestamp)}:f>.")
+
+    @commands.command(name="ecocache")
+    @commands.is_owner()
+    async def economy_cache_stats(self, ctx):
+        stats = self.db.stats()
+        embed = nextcord.Embed(title="Economy Cache", color=0x00ff00)
+        embed.add_field(name="Hit Rate", value=f"{stats['hit_rate'] * 100:.1f}% ({stats['hits']} hits / {stats['misses']} misses)", inline=False)
+        embed.add_field(name="Rows", value=f"{stats['cached_rows']} cached, {stats['dirty_rows']} dirty")
+        embed.add_field(name="Flushes", value=f"{stats['flushes']} ({stats['rows_flushed']} rows)")
+        embed.add_field(
+            name="Flush Latency",
+            value=f"last {stats['flush_ms_last']:.2f} ms | avg {stats['flush_ms_avg']:.2f} ms | max {stats['flush_ms_max']:.2f} ms",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
 def setup(bot):
     bot.add_cog(Economy(bot))
 
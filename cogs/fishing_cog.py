@@ -1,99 +1,69 @@
 import nextcord
 from nextcord.ext import commands
-from tinydb import TinyDB, Query
-import random
-from typing import Tuple
-from utils.fish_data import tiers, fish_data, modifiers, special_events
-
-ENCHANTMENTS = {
-    'luck': {
-        'name': 'Luck',
-        'description': 'Increases chance of better tier fish',
-        'max_level': 5,
-        'base_cost': 10000,
-        'tier_boost_per_level': 0.05
-    },
-    'fortune': {
-        'name': 'Fortune',
-        'description': 'Increases fish value',
-        'max_level': 5,
-        'base_cost': 15000,
-        'value_multiplier_per_level': 0.1
-    },
-    'efficiency': {
-        'name': 'Efficiency',
-        'description': 'Reduces fishing cooldown',
-        'max_level': 3,
-        'base_cost': 20000,
-        'cooldown_reduction_per_level': 0.2
-    }
-}
+from nextcord import SlashOption
+from utils.config import OWNER_ID
+from utils.economy_store import get_economy_store, has_item
+from utils.economy_ledger import get_ledger
+from utils.fish_data import tiers, fish_data, modifiers, ENCHANTMENTS, FISHING_COOLDOWN_RATE, FISHING_COOLDOWN_PER, BULK_FISHING_MAX
+from utils.loot_table import LOOT_TABLE
+from collections import Counter
+from typing import List
+import time
 
 class FishingSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = TinyDB('database/economy.json')
-        self.User = Query()
+        self.db = get_economy_store(bot)
         self.tiers = tiers
         self.fish_data = fish_data
         self.modifiers = modifiers
-        self.special_events = special_events
+        self.loot_table = LOOT_TABLE
+        self.ledger = get_ledger(bot)
+        # user_id -> time.monotonic() when the line from the last cast is back;
+        # expired entries are dropped when checked or swept in hold_line
+        self.line_out_until = {}
+
+    def cog_unload(self):
+        self.db.flush()
 
     def get_user_data(self, user_id: int):
-        user = self.db.get(self.User.user_id == user_id)
-        if not user:
-            user = {
-                'user_id': user_id,
-                'wallet': 0,
-                'bank': 0,
-                'bank_capacity': 1000,
-                'inventory': [],
-                'fishing_stats': {
-                    'total_caught': 0,
-                    'best_catch': None,
-                    'best_earnings': 0
-                },
-                'rod_enchantments': {
-                    'luck': 0,
-                    'fortune': 0,
-                    'efficiency': 0
-                }
-            }
-            self.db.insert(user)
-        return user
+        return self.db.get_user(user_id)
 
     def calculate_enchantment_cost(self, enchant_type: str, current_level: int) -> int:
         base_cost = ENCHANTMENTS[enchant_type]['base_cost']
         return base_cost * (current_level + 1) * 2
 
-    def apply_enchantments(self, tier_chances: dict, base_value: int, enchantments: dict) -> Tuple[dict, int]:
-        luck_level = enchantments.get('luck', 0)
-        if luck_level > 0:
-            boost = ENCHANTMENTS['luck']['tier_boost_per_level'] * luck_level
-            for tier in ['rare', 'epic', 'legendary']:
-                if tier in tier_chances:
-                    tier_chances[tier] *= (1 + boost)
-
-        fortune_level = enchantments.get('fortune', 0)
-        if fortune_level > 0:
-            value_boost = 1 + (ENCHANTMENTS['fortune']['value_multiplier_per_level'] * fortune_level)
-            base_value = int(base_value * value_boost)
-
-        return tier_chances, base_value
-
-    def get_fish_by_tier(self, tier: str) -> str:
-        tier_fish = [(name, data) for name, data in self.fish_data.items() 
-                    if data[2] == tier]
-        if tier_fish:
-            return random.choice(tier_fish)[0]
-        return "🐟 Small Fish"
-
-    def apply_modifier(self, fish_name: str, base_value: int) -> Tuple[str, int]:
-        for mod_name, mod_data in self.modifiers.items():
-            if random.random() < mod_data['chance']:
-                new_value = int(base_value * mod_data['multiplier'])
-                return f"{mod_data['prefix']} {fish_name} [{mod_name.title()}]", new_value
-        return fish_name, base_value
+    def max_bulk_casts(self, efficiency_level: int) -> int:
+        return BULK_FISHING_MAX + ENCHANTMENTS['efficiency']['bulk_casts_per_level'] * efficiency_level
+
+    def cast_seconds(self, efficiency_level: int) -> float:
+        """Cooldown budget one cast uses up."""
+        reduction = ENCHANTMENTS['efficiency']['cooldown_reduction_per_level'] * efficiency_level
+        return FISHING_COOLDOWN_PER / FISHING_COOLDOWN_RATE * max(0.0, 1 - reduction)
+
+    def hold_line(self, user_id: int, seconds: float):
+        now = time.monotonic()
+        if len(self.line_out_until) >= 1000:
+            self.line_out_until = {uid: until for uid, until in self.line_out_until.items() if until > now}
+        self.line_out_until[user_id] = now + seconds
+
+    async def record_catches(self, user_id: int, catches: List) -> dict:
+        """Add the catches to the wallet and fishing stats in one write."""
+        best = max(catches, key=lambda catch: catch.value)
+        async with self.ledger.lock(user_id):
+            data = self.get_user_data(user_id)
+            fishing_stats = data.get('fishing_stats', {'total_caught': 0, 'best_catch': None, 'best_earnings': 0})
+            fishing_stats['total_caught'] += len(catches)
+            if best.value > fishing_stats.get('best_earnings', 0):
+                fishing_stats['best_earnings'] = best.value
+                fishing_stats['best_catch'] = best.name
+
+            self.ledger.apply(
+                {user_id: sum(catch.value for catch in catches)},
+                "fish",
+                {user_id: {'fishing_stats': fishing_stats}}
+            )
+        return fishing_stats
 
     @commands.command(name="enchant")
     async def enchant_rod(self, ctx, enchant_type: str = None):
@@ -106,30 +76,28 @@ class FishingSystem(commands.Cog):
             await ctx.send(f"Invalid enchantment type. Available enchantments: {', '.join(ENCHANTMENTS.keys())}")
             return
 
-        data = self.get_user_data(ctx.author.id)
-        
-        if 'rod' not in data.get('inventory', []):
-            await ctx.send("You need a fishing rod first!")
-            return
-
-        current_level = data.get('rod_enchantments', {}).get(enchant_type, 0)
-        if current_level >= ENCHANTMENTS[enchant_type]['max_level']:
-            await ctx.send(f"Your rod already has maximum level of {enchant_type}!")
+        error = None
+        async with self.ledger.lock(ctx.author.id):
+            data = self.get_user_data(ctx.author.id)
+            current_level = data.get('rod_enchantments', {}).get(enchant_type, 0)
+            cost = self.calculate_enchantment_cost(enchant_type, current_level)
+
+            if not has_item(data, 'rod'):
+                error = "You need a fishing rod first!"
+            elif current_level >= ENCHANTMENTS[enchant_type]['max_level']:
+                error = f"Your rod already has maximum level of {enchant_type}!"
+            elif data['wallet'] < cost:
+                error = f"You need {cost} coins to enchant your rod with {enchant_type}!"
+            else:
+                enchantments = data.get('rod_enchantments', {})
+                enchantments[enchant_type] = current_level + 1
+                self.ledger.apply({ctx.author.id: -cost}, f"enchant:{enchant_type}",
+                                  {ctx.author.id: {'rod_enchantments': enchantments}})
+
+        if error:
+            await ctx.send(error)
             return
 
-        cost = self.calculate_enchantment_cost(enchant_type, current_level)
-        if data['wallet'] < cost:
-            await ctx.send(f"You need {cost} coins to enchant your rod with {enchant_type}!")
-            return
-
-        enchantments = data.get('rod_enchantments', {})
-        enchantments[enchant_type] = current_level + 1
-        
-        self.db.update({
-            'wallet': data['wallet'] - cost,
-            'rod_enchantments': enchantments
-        }, self.User.user_id == ctx.author.id)
-
         embed = nextcord.Embed(
             title="🎣 Rod Enchanted!",
             description=f"Successfully enchanted your rod with {ENCHANTMENTS[enchant_type]['name']}!",
@@ -167,55 +135,33 @@ class FishingSystem(commands.Cog):
         await ctx.send(embed=embed)
 
     @commands.command(aliases=["fish"])
-    @commands.cooldown(5, 3, commands.BucketType.user)
-    async def fishing(self, ctx):
+    @commands.cooldown(FISHING_COOLDOWN_RATE, FISHING_COOLDOWN_PER, commands.BucketType.user)
+    async def fishing(self, ctx, mode: str = None, count: int = 1):
+        if mode is not None and (mode.lower() != "x" or count < 1):
+            await ctx.send("Usage: `!fish` or `!fish x <count>`")
+            return
+
         data = self.get_user_data(ctx.author.id)
         
-        if 'rod' not in data.get('inventory', []):
+        if not has_item(data, 'rod'):
             await ctx.send("You need a fishing rod! Buy one from the store.")
             return
 
-        enchanted_tiers = dict(self.tiers)
-        base_earnings = 0
-        enchanted_tiers, base_earnings = self.apply_enchantments(
-            enchanted_tiers,
-            base_earnings,
-            data.get('rod_enchantments', {})
-        )
+        if ctx.author.id in self.line_out_until:
+            wait = self.line_out_until[ctx.author.id] - time.monotonic()
+            if wait > 0:
+                await ctx.send(f"Your line is still out from your last cast! Try again in {wait:.1f}s.")
+                return
+            del self.line_out_until[ctx.author.id]
+
+        enchantments = data.get('rod_enchantments', {})
+        if mode is not None:
+            await self.bulk_fishing(ctx, enchantments, count)
+            return
 
-        tier = random.choices(
-            list(enchanted_tiers.keys()),
-            weights=list(enchanted_tiers.values()),
-            k=1
-        )[0]
-
-        caught_fish = self.get_fish_by_tier(tier)
-        min_price, max_price, _ = self.fish_data[caught_fish]
-        base_earnings = random.randint(min_price, max_price)
-
-        final_fish, final_earnings = self.apply_modifier(caught_fish, base_earnings)
-
-        special_event = None
-        if random.random() < 0.10:
-            special_event = random.choice(self.special_events)
-            if "Double" in special_event:
-                final_earnings *= 2
-            elif "Triple" in special_event:
-                final_earnings *= 3
-            elif "Extra" in special_event:
-                bonus = int(special_event.split()[special_event.split().index("coins!") - 1])
-                final_earnings += bonus
-
-        fishing_stats = data.get('fishing_stats', {'total_caught': 0, 'best_catch': None, 'best_earnings': 0})
-        fishing_stats['total_caught'] += 1
-        if final_earnings > fishing_stats.get('best_earnings', 0):
-            fishing_stats['best_earnings'] = final_earnings
-            fishing_stats['best_catch'] = final_fish
-
-        self.db.update({
-            'wallet': data['wallet'] + final_earnings,
-            'fishing_stats': fishing_stats
-        }, self.User.user_id == ctx.author.id)
+        catch = self.loot_table.cast(enchantments.get('luck', 0))
+        final_fish, final_earnings = catch.name, catch.value
+        fishing_stats = await self.record_catches(ctx.author.id, [catch])
 
         embed = nextcord.Embed(
             title="🎣 Fishing Results",
@@ -224,8 +170,8 @@ class FishingSystem(commands.Cog):
         embed.add_field(name="You caught", value=final_fish, inline=False)
         embed.add_field(name="Earnings", value=f"💰 {final_earnings}", inline=False)
         
-        if special_event:
-            embed.add_field(name="Special Event!", value=special_event, inline=False)
+        if catch.event:
+            embed.add_field(name="Special Event!", value=catch.event.text, inline=False)
             
         if fishing_stats['total_caught'] % 10 == 0:
             embed.add_field(
@@ -234,11 +180,57 @@ class FishingSystem(commands.Cog):
                 inline=False
             )
 
-        efficiency_level = data.get('rod_enchantments', {}).get('efficiency', 0)
+        efficiency_level = enchantments.get('efficiency', 0)
         if efficiency_level > 0:
-            cooldown_reduction = ENCHANTMENTS['efficiency']['cooldown_reduction_per_level'] * efficiency_level
+            # Efficient rods skip the command cooldown and pay the shorter
+            # per-cast time instead, the same budget bulk casts use.
             self.fishing.reset_cooldown(ctx)
-            self.fishing._buckets.update_rate_limit(ctx)
+            self.hold_line(ctx.author.id, self.cast_seconds(efficiency_level))
+
+        await ctx.send(embed=embed)
+
+    async def bulk_fishing(self, ctx, enchantments: dict, count: int):
+        efficiency_level = enchantments.get('efficiency', 0)
+        max_casts = self.max_bulk_casts(efficiency_level)
+        if count > max_casts:
+            await ctx.send(f"You can cast at most {max_casts} times at once! Efficiency enchantments raise this.")
+            return
+
+        catches = self.loot_table.cast_many(count, enchantments.get('luck', 0))
+        fishing_stats = await self.record_catches(ctx.author.id, catches)
+        previous_total = fishing_stats['total_caught'] - count
+        self.hold_line(ctx.author.id, count * self.cast_seconds(efficiency_level))
+
+        earnings = sum(catch.value for catch in catches)
+        best = max(catches, key=lambda catch: catch.value)
+        by_tier = Counter(catch.fish.tier for catch in catches)
+        events = Counter(catch.event.text for catch in catches if catch.event)
+
+        embed = nextcord.Embed(
+            title=f"🎣 Bulk Fishing Results ({count} casts)",
+            color=0x00ff00
+        )
+        embed.add_field(
+            name="Catches by Tier",
+            value="\n".join(f"{tier.title()}: {by_tier[tier]}" for tier in self.tiers if by_tier[tier]),
+            inline=False
+        )
+        embed.add_field(name="Best Catch", value=f"{best.name} (💰 {best.value})", inline=False)
+        embed.add_field(name="Total Earnings", value=f"💰 {earnings}", inline=False)
+
+        if events:
+            embed.add_field(
+                name="Special Events!",
+                value="\n".join(f"{text} x{times}" if times > 1 else text for text, times in events.items())[:1024],
+                inline=False
+            )
+
+        if fishing_stats['total_caught'] // 10 > previous_total // 10:
+            embed.add_field(
+                name="Milestone!",
+                value=f"You've caught {fishing_stats['total_caught']} fish in total! 🎉",
+                inline=False
+            )
 
         await ctx.send(embed=embed)
 
@@ -267,9 +259,8 @@ class FishingSystem(commands.Cog):
         )
 
         for tier, chance in self.tiers.items():
-            tier_fish = [f"{name} ({data[0]}-{data[1]} coins)"
-                        for name, data in self.fish_data.items()
-                        if data[2] == tier]
+            tier_fish = [f"{fish.name} ({fish.min_price}-{fish.max_price} coins)"
+                        for fish in self.loot_table.tier_fish[tier]]
             if tier_fish:
                 embed.add_field(
                     name=f"{tier.title()} Tier ({chance*100}% chance)",
@@ -291,5 +282,35 @@ class FishingSystem(commands.Cog):
         
         await ctx.send(embed=embed)
 
+    @nextcord.slash_command(name="economysim", description="[🎣] Simulate fishing and gambling payouts (owner only)")
+    async def economy_sim(
+        self,
+        interaction: nextcord.Interaction,
+        luck: int = SlashOption(description="Luck enchantment level", default=5, min_value=0, max_value=ENCHANTMENTS['luck']['max_level']),
+        population: int = SlashOption(description="Players fishing one hour a day", default=1000, min_value=1),
+        bet: int = SlashOption(description="Bet size for gamble/slots", default=100, min_value=1)
+    ):
+        if interaction.user.id != OWNER_ID:
+            await interaction.response.send_message("You don't have permission to use this command.", ephemeral=True)
+            return
+
+        try:
+            from utils.economy_sim import run_simulation
+        except ImportError:
+            await interaction.response.send_message("The simulator needs numpy installed.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        report = await self.bot.loop.run_in_executor(
+            None,
+            lambda: run_simulation(luck=luck, population=population, bet=bet)
+        )
+        embed = nextcord.Embed(
+            title="🎲 Economy Simulation",
+            description="```\n" + "\n".join(report) + "\n```",
+            color=0x00ff00
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
 def setup(bot):
     bot.add_cog(FishingSystem(bot))
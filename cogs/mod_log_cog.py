@@ -1,86 +1,25 @@
-import json
 import nextcord
 from nextcord.ext import commands
 from nextcord import Embed
-import os
 from datetime import datetime
+import time
+from itertools import islice
 from typing import Literal
+from utils.mod_log_config import DEFAULT_LOG_TYPES, get_mod_log_configs
+from utils.log_dispatcher import get_log_dispatcher
+from utils.audit_archive import get_audit_archive
+from utils.message_cache import get_message_cache
+
+SEARCH_LIMIT = 20
 
 class ModLogging(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.base_path = "database/mod_logs"
-        self.ensure_directory()
-        
-    def ensure_directory(self):
-        """Ensure the database directory exists"""
-        if not os.path.exists(self.base_path):
-            os.makedirs(self.base_path)
-
-    def get_config_path(self, guild_id: int) -> str:
-        """Get the path for a guild's config file"""
-        return os.path.join(self.base_path, f"{guild_id}.json")
-
-    def load_config(self, guild_id: int) -> dict:
-        """Load config for a specific guild"""
-        config_path = self.get_config_path(guild_id)
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return self.get_default_config()
-
-    def save_config(self, guild_id: int, config: dict):
-        """Save config for a specific guild"""
-        config_path = self.get_config_path(guild_id)
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
-
-    def get_default_config(self) -> dict:
-        """Get default configuration for a new guild"""
-        return {
-            "enabled": False,
-            "log_channel": None,
-            "log_types": {
-                "message_delete": True,
-                "message_edit": True,
-                "member_ban": True,
-                "member_unban": True,
-                "role_update": True,
-                "member_join": True,
-                "member_leave": True,
-                "nickname_change": True,
-                "channel_create": True,
-                "channel_delete": True,
-                "channel_update": True,
-                "voice_state": True,
-                "role_create": True,
-                "role_delete": True,
-                "member_timeout": True
-            }
-        }
+        self.configs = get_mod_log_configs(bot)
 
     def get_guild_config(self, guild_id: int) -> dict:
         """Get configuration for a specific guild"""
-        config = self.load_config(guild_id)
-        # Ensure all default config keys exist
-        default_config = self.get_default_config()
-        modified = False
-        
-        # Add any missing keys from default config
-        for key, value in default_config.items():
-            if key not in config:
-                config[key] = value
-                modified = True
-            elif key == "log_types":
-                for type_key, type_value in default_config["log_types"].items():
-                    if type_key not in config["log_types"]:
-                        config["log_types"][type_key] = type_value
-                        modified = True
-
-        if modified:
-            self.save_config(guild_id, config)
-            
-        return config
+        return self.configs.get(guild_id)
 
     # [Previous event listeners remain the same...]
 
@@ -94,9 +33,7 @@ class ModLogging(commands.Cog):
             await interaction.response.send_message("❌ You don't have permission to use this command", ephemeral=True)
             return
 
-        config = self.get_guild_config(interaction.guild.id)
-        config["log_channel"] = channel.id
-        self.save_config(interaction.guild.id, config)
+        self.configs.update(interaction.guild.id, log_channel=channel.id)
 
         embed = Embed(
             title="✅ Channel Set Successfully",
@@ -112,9 +49,7 @@ class ModLogging(commands.Cog):
             await interaction.response.send_message("❌ You don't have permission to use this command", ephemeral=True)
             return
 
-        config = self.get_guild_config(interaction.guild.id)
-        config["enabled"] = action == 'enable'
-        self.save_config(interaction.guild.id, config)
+        self.configs.update(interaction.guild.id, enabled=action == 'enable')
 
         status = "enabled" if action == 'enable' else "disabled"
         embed = Embed(
@@ -148,8 +83,7 @@ class ModLogging(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        config["log_types"][type] = action == 'enable'
-        self.save_config(interaction.guild.id, config)
+        self.configs.update(interaction.guild.id, log_types={type: action == 'enable'})
 
         status = "enabled" if action == 'enable' else "disabled"
         type_display = type.replace('_', ' ').title()
@@ -198,6 +132,82 @@ class ModLogging(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @mod_log.subcommand(name="queue", description="Show log delivery queue and message cache metrics")
+    async def show_queue(self, interaction: nextcord.Interaction):
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You don't have permission to use this command", ephemeral=True)
+            return
+
+        dispatcher = get_log_dispatcher(self.bot)
+        stats = dispatcher.stats()
+        cache = get_message_cache(self.bot).stats()
+        config = self.get_guild_config(interaction.guild.id)
+        buffer = dispatcher.buffers.get(config["log_channel"])
+
+        embed = Embed(
+            title="📬 Log Queue",
+            description=(
+                f"**This server:** {len(buffer.pending) if buffer else 0} queued, "
+                f"{sum(buffer.dropped.values()) if buffer else 0} awaiting summary\n"
+                f"**All servers:** {stats['queued']} queued in {stats['channels']} channels "
+                f"(deepest {stats['max_depth']})\n"
+                f"**Sent:** {stats['embeds_sent']} embeds in {stats['messages_sent']} messages\n"
+                f"**Dropped:** {stats['embeds_dropped']} | **Failed sends:** {stats['send_failures']}\n"
+                f"**Message cache:** {cache['messages']} messages in {cache['guilds']} servers "
+                f"({cache['bytes'] / 1024:.0f} KiB), {cache['hits']} hits / {cache['misses']} misses, "
+                f"{cache['evictions']} evicted"
+            ),
+            color=0x00ff00
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @mod_log.subcommand(name="search", description="Search archived log events")
+    async def search(self, interaction: nextcord.Interaction,
+                     user: nextcord.Member = None,
+                     channel: nextcord.abc.GuildChannel = None,
+                     type: str = None,
+                     days: int = 7):
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("❌ You don't have permission to use this command", ephemeral=True)
+            return
+
+        if type is not None and type not in DEFAULT_LOG_TYPES:
+            await interaction.response.send_message(f"❌ Unknown log type `{type}`", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        archive = get_audit_archive(self.bot)
+        await archive.flush()
+        matches = archive.search(
+            interaction.guild.id,
+            user_id=user.id if user else None,
+            channel_id=channel.id if channel else None,
+            event_type=type,
+            since=time.time() - max(days, 1) * 86400
+        )
+        results = await self.bot.loop.run_in_executor(None, lambda: list(islice(matches, SEARCH_LIMIT)))
+
+        lines = []
+        for entry in results:
+            summary = " | ".join((entry.get("description") or entry.get("title") or "").splitlines())
+            if len(summary) > 150:
+                summary = summary[:147] + "..."
+            lines.append(f"<t:{int(entry['ts'])}:f> `{entry['type']}` {summary}")
+
+        filters = [f"user {user.display_name}" if user else None,
+                   f"channel #{channel.name}" if channel else None,
+                   f"type `{type}`" if type else None]
+        embed = Embed(
+            title="🔎 Log Search",
+            description="\n".join(lines)[:4096] if lines else "No matching events.",
+            color=0x00ff00
+        )
+        embed.set_footer(text=(
+            f"Last {days} days, " + (", ".join(part for part in filters if part) or "all events") +
+            f" — newest {SEARCH_LIMIT} shown"
+        ))
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
     @mod_log.subcommand(name="help", description="Show help for mod_log commands")
     async def show_help(self, interaction: nextcord.Interaction):
         embed = Embed(
@@ -212,6 +222,8 @@ class ModLogging(commands.Cog):
                 "`/mod_log set_channel #channel` - Set logging channel\n"
                 "`/mod_log toggle enable/disable` - Enable/disable all logging\n"
                 "`/mod_log status` - Show current configuration\n"
+                "`/mod_log queue` - Show log delivery queue and message cache metrics\n"
+                "`/mod_log search [user] [channel] [type] [days]` - Search archived events\n"
                 "`/mod_log help` - Show this help message"
             ),
             inline=False
@@ -230,7 +242,7 @@ class ModLogging(commands.Cog):
             name="📋 Available Log Types",
             value="\n".join([
                 f"• `{type_name.replace('_', ' ').title()}`" 
-                for type_name in self.get_default_config()["log_types"].keys()
+                for type_name in DEFAULT_LOG_TYPES.keys()
             ]),
             inline=False
         )
@@ -7,32 +7,213 @@ from mafic import SearchType
 import asyncio
 import random
 from utils.music_utils import create_embed, format_duration, voice_channel_check
-from utils.config import LAVALINK_PORT
-from utils.config import LAVALINK_HOST
-from utils.config import LAVALINK_PASSWORD
+from utils.music_queue import AutoplayBuffer, TrackQueue
+from utils.music_nodes import configured_nodes, least_loaded_node, node_penalty
+from utils.track_cache import cache_key, get_track_cache
+from utils.music_sessions import get_music_sessions
+from utils.config import NODE_HEALTH_INTERVAL, MUSIC_SESSION_SAVE_INTERVAL
 
 class GuildMusicState:
     def __init__(self):
-        self.queue = []
+        self.queue = TrackQueue()
         self.current_track = None
         self.volume = 100
         self.disconnect_task = None
         self.autoplay = False
+        self.autoplay_buffer = AutoplayBuffer()
+
+class QueueView(nextcord.ui.View):
+    """Previous/next buttons for ``/queue``."""
+
+    def __init__(self, cog, guild_id: int, user_id: int, page: int = 1):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.page = page
+        self.update_buttons()
+
+    def update_buttons(self):
+        guild_state = self.cog.bot.guild_music_states[self.guild_id]
+        self.page = max(1, min(self.page, guild_state.queue.page_count()))
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= guild_state.queue.page_count()
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("Use /queue to browse the queue yourself.", ephemeral=True)
+            return False
+        return True
+
+    async def show(self, interaction: nextcord.Interaction):
+        self.update_buttons()
+        embed = self.cog.queue_embed(self.guild_id, self.page)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @nextcord.ui.button(emoji="⬅️", style=nextcord.ButtonStyle.secondary)
+    async def previous_page(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        self.page -= 1
+        await self.show(interaction)
+
+    @nextcord.ui.button(emoji="➡️", style=nextcord.ButtonStyle.secondary)
+    async def next_page(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        self.page += 1
+        await self.show(interaction)
 
 class MusicCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.bot.pool = mafic.NodePool(self.bot)
-        self.bot.guild_music_states = defaultdict(GuildMusicState)
-        self.bot.loop.create_task(self.add_nodes())
+        # Reloading the cog keeps the pool, players and queues that are live.
+        if getattr(bot, "pool", None) is None:
+            self.bot.pool = mafic.NodePool(self.bot)
+            self.bot.loop.create_task(self.add_nodes())
+        if getattr(bot, "guild_music_states", None) is None:
+            self.bot.guild_music_states = defaultdict(GuildMusicState)
+        self.track_cache = get_track_cache(bot)
+        self.sessions = get_music_sessions(bot)
+        self.health_task = self.bot.loop.create_task(self.watch_nodes())
+        self.save_task = self.bot.loop.create_task(self.save_sessions())
+        self.bot.loop.create_task(self.restore_sessions())
+
+    def cog_unload(self):
+        self.health_task.cancel()
+        self.save_task.cancel()
+        for guild_id in self.bot.guild_music_states:
+            self.sessions.mark(guild_id)
+        self.sessions.flush(self.session_snapshot)
+
+    def mark_session(self, guild_id: int, queue: bool = True):
+        self.sessions.mark(guild_id, queue)
+
+    def session_snapshot(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        player = guild.voice_client if guild else None
+        guild_state = self.bot.guild_music_states.get(guild_id)
+        if not isinstance(player, mafic.Player) or guild_state is None:
+            return None
+        if not guild_state.current_track and not guild_state.queue:
+            return None
+        return {
+            'channel_id': player.channel.id,
+            'current_track': guild_state.current_track.id if guild_state.current_track else None,
+            'position': player.position or 0,
+            'volume': guild_state.volume,
+            'autoplay': guild_state.autoplay,
+            'queue': [track.id for track in guild_state.queue],
+        }
+
+    async def save_sessions(self):
+        """Flush marked sessions in one batch, refreshing positions of playing guilds."""
+        await self.bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(MUSIC_SESSION_SAVE_INTERVAL)
+            for guild_id, guild_state in list(self.bot.guild_music_states.items()):
+                if guild_state.current_track:
+                    self.sessions.mark(guild_id, queue=False)
+            try:
+                self.sessions.flush(self.session_snapshot)
+            except Exception as e:
+                print(f"[WARN]: Failed to save music sessions: {e}")
+
+    async def restore_sessions(self):
+        """Rejoin voice and resume every session saved before a restart."""
+        await self.bot.wait_until_ready()
+        for _ in range(60):
+            if any(node.available for node in self.bot.pool.nodes):
+                break
+            await asyncio.sleep(1)
+        else:
+            return
+
+        for session in self.sessions.load_all():
+            guild_id = session['guild_id']
+            if guild_id in self.bot.guild_music_states:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(session['channel_id']) if guild else None
+            if channel is None:
+                self.sessions.delete(guild_id)
+                continue
+            try:
+                await self.resume_session(guild, channel, session)
+            except Exception as e:
+                print(f"[WARN]: Failed to restore music session of {guild_id}: {e}")
+
+    async def resume_session(self, guild, channel, session: dict):
+        encoded = ([session['current_track']] if session['current_track'] else []) + session['queue']
+        node = least_loaded_node(self.bot.pool.nodes)
+        tracks = await node.decode_tracks(encoded) if encoded else []
+
+        guild_state = self.bot.guild_music_states[guild.id]
+        guild_state.volume = session['volume']
+        guild_state.autoplay = session['autoplay']
+        if session['current_track']:
+            guild_state.current_track, tracks = tracks[0], tracks[1:]
+        guild_state.queue.extend(tracks)
+
+        player = guild.voice_client or await self.connect_player(channel)
+        await player.set_volume(guild_state.volume)
+        if guild_state.current_track:
+            await player.play(guild_state.current_track, start_time=session['position'])
+        else:
+            await self.play_next(guild.id)
 
     async def add_nodes(self):
-        await self.bot.pool.create_node(
-            host=LAVALINK_HOST,
-            port=LAVALINK_PORT,
-            label="MAIN",
-            password=LAVALINK_PASSWORD,
-        )
+        for node in configured_nodes():
+            try:
+                await self.bot.pool.create_node(
+                    host=node["host"],
+                    port=node["port"],
+                    label=node["label"],
+                    password=node["password"],
+                    secure=node["secure"],
+                )
+            except Exception as e:
+                print(f"[WARN]: Cannot connect to lavalink node {node['label']}: {e}")
+
+    async def connect_player(self, channel, exclude=None) -> mafic.Player:
+        """Join ``channel`` with a player placed on the least loaded node."""
+        node = least_loaded_node(self.bot.pool.nodes, exclude=exclude)
+        if node is None:
+            return await channel.connect(cls=mafic.Player)
+        return await channel.connect(cls=lambda client, voice_channel: mafic.Player(client, voice_channel, node=node))
+
+    async def search(self, player: mafic.Player, query: str, search_type=SearchType.YOUTUBE):
+        """``player.fetch_tracks`` through the shared search cache."""
+        key = cache_key(query, search_type)
+        found, tracks = self.track_cache.get(key)
+        if not found:
+            tracks = await player.fetch_tracks(query, search_type=search_type)
+            self.track_cache.put(key, tracks)
+        return tracks
+
+    async def watch_nodes(self):
+        await self.bot.wait_until_ready()
+        while True:
+            await asyncio.sleep(NODE_HEALTH_INTERVAL)
+            for guild_id in list(self.bot.guild_music_states):
+                guild = self.bot.get_guild(guild_id)
+                player = guild.voice_client if guild else None
+                if isinstance(player, mafic.Player) and not player.node.available:
+                    try:
+                        await self.migrate_player(player)
+                    except Exception as e:
+                        print(f"[WARN]: Failed to move player of {guild_id} off {player.node.label}: {e}")
+
+    async def migrate_player(self, player: mafic.Player):
+        """Reconnect a player on a healthy node and resume where it stopped."""
+        if least_loaded_node(self.bot.pool.nodes, exclude=player.node) is None:
+            return
+        guild_state = self.bot.guild_music_states[player.guild.id]
+        channel = player.channel
+        position = player.position or 0
+
+        await player.disconnect(force=True)
+        new_player = await self.connect_player(channel, exclude=player.node)
+        await new_player.set_volume(guild_state.volume)
+        if guild_state.current_track:
+            await new_player.play(guild_state.current_track, start_time=position)
+        self.mark_session(player.guild.id, queue=False)
 
     @nextcord.slash_command(name="play", description="[🌺] Play some music")
     async def play(self, inter: nextcord.Interaction, query: str = SlashOption(description="Tracks name or url")):
@@ -44,7 +225,7 @@ class MusicCog(commands.Cog):
 
         guild_state = self.bot.guild_music_states[inter.guild.id]
         if not inter.guild.voice_client:
-            player = await inter.user.voice.channel.connect(cls=mafic.Player)
+            player = await self.connect_player(inter.user.voice.channel)
         else:
             player = inter.guild.voice_client
             if player.channel != inter.user.voice.channel:
@@ -52,7 +233,7 @@ class MusicCog(commands.Cog):
                 return await inter.followup.send(embed=embed)
 
         try:
-            tracks = await player.fetch_tracks(query, search_type=SearchType.YOUTUBE_MUSIC)
+            tracks = await self.search(player, query, SearchType.YOUTUBE_MUSIC)
 
         except Exception as e:
             embed = create_embed("<a:9211092078964408931:1276525091588669531>", f"error while searching traks: {str(e)}", color=nextcord.Color.red())
@@ -64,17 +245,20 @@ class MusicCog(commands.Cog):
 
         if isinstance(tracks, mafic.Playlist):
             playlist = tracks
-            for track in playlist.tracks:
-                guild_state.queue.append(track)
-            if not guild_state.current_track:
-                guild_state.current_track = playlist.tracks[0]
+            pending = playlist.tracks
+            if not guild_state.current_track and pending:
+                guild_state.current_track = pending[0]
                 await player.play(guild_state.current_track)
+                pending = pending[1:]
+            added = guild_state.queue.extend(pending)
 
 
             embed = create_embed("", f"> **<a:experience:1276521604431482900> [{playlist.name}]({playlist.tracks[0].uri if playlist.tracks else ''})**")
             embed.set_author(name="🎵 | Added to queue", icon_url=self.bot.user.avatar.url)
             embed.set_thumbnail(url=playlist.tracks[0].artwork_url if playlist.tracks else None)
             embed.add_field(name="<:enchanted_book:1287070850633171026> Playlist Info", value=f"┗ **{inter.user.mention}** ``{len(playlist.tracks)} traks from playlist``")
+            if added < len(pending):
+                embed.add_field(name="Queue full", value=f"Skipped {len(pending) - added} tracks (limit {guild_state.queue.max_size})", inline=False)
             embed.set_footer(text=f"🌺 {self.bot.user.name} | By KaiTy_Ez")
         else:
             track = tracks[0]
@@ -82,9 +266,11 @@ class MusicCog(commands.Cog):
                 guild_state.current_track = track
                 await player.play(track)
                 status = "🎵 | Now playing"
-            else:
-                guild_state.queue.append(track)
+            elif guild_state.queue.append(track):
                 status = "🎵 | Added Track"
+            else:
+                embed = create_embed("<a:9211092078964408931:1276525091588669531>", f"Queue is full ({guild_state.queue.max_size} tracks)", color=nextcord.Color.red())
+                return await inter.followup.send(embed=embed)
 
             embed = create_embed("", f"> **<a:experience:1276521604431482900> [{track.title}]({track.uri})**")
             embed.set_author(name=status, icon_url=self.bot.user.avatar.url)
@@ -94,6 +280,7 @@ class MusicCog(commands.Cog):
 
         await inter.followup.send(embed=embed)
         await player.set_volume(guild_state.volume)
+        self.mark_session(inter.guild.id)
 
         if guild_state.disconnect_task:
             guild_state.disconnect_task.cancel()
@@ -104,11 +291,59 @@ class MusicCog(commands.Cog):
     async def autoplay(self, inter: nextcord.Interaction):
         guild_state = self.bot.guild_music_states[inter.guild.id]
         guild_state.autoplay = not guild_state.autoplay
+        self.mark_session(inter.guild.id, queue=False)
+        if guild_state.autoplay:
+            self.prefetch_autoplay(inter.guild.id)
+        else:
+            guild_state.autoplay_buffer.clear()
 
         status = "On" if guild_state.autoplay else "Off"
         embed = create_embed("", f"Autoplay is now {status}")
         await inter.response.send_message(embed=embed)
 
+    @commands.Cog.listener()
+    async def on_track_start(self, event):
+        guild_state = self.bot.guild_music_states[event.player.guild.id]
+        guild_state.autoplay_buffer.record(event.track)
+        if guild_state.autoplay and not guild_state.queue:
+            self.prefetch_autoplay(event.player.guild.id)
+
+    def prefetch_autoplay(self, guild_id: int):
+        """Top up the autoplay buffer in the background while the current track plays."""
+        buffer = self.bot.guild_music_states[guild_id].autoplay_buffer
+        if buffer.needs_refill:
+            buffer.refill_task = asyncio.create_task(self.refill_autoplay(guild_id))
+
+    async def refill_autoplay(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        player = guild.voice_client if guild else None
+        if player is None:
+            return
+        buffer = self.bot.guild_music_states[guild_id].autoplay_buffer
+
+        queries = ["lofi lee"]
+        seed = buffer.seed()
+        if seed is not None:
+            if seed.source == "youtube":
+                # YouTube's mix for a video is its list of related tracks.
+                queries.insert(0, f"https://www.youtube.com/watch?v={seed.identifier}&list=RD{seed.identifier}")
+            else:
+                queries.insert(0, seed.author)
+
+        for query in queries:
+            try:
+                tracks = await self.search(player, query, SearchType.YOUTUBE_MUSIC)
+            except Exception as e:
+                print(f"[WARN]: Autoplay search failed for {guild_id}: {e}")
+                continue
+            if isinstance(tracks, mafic.Playlist):
+                tracks = tracks.tracks
+            tracks = list(tracks or [])
+            random.shuffle(tracks)
+            buffer.add(tracks)
+            if len(buffer) >= buffer.size:
+                break
+
     @commands.Cog.listener()
     async def on_track_end(self, event):
         guild_id = event.player.guild.id
@@ -116,18 +351,24 @@ class MusicCog(commands.Cog):
 
     async def play_next(self, guild_id):
         guild_state = self.bot.guild_music_states[guild_id]
+        self.mark_session(guild_id)
         player = self.bot.get_guild(guild_id).voice_client
 
         if guild_state.queue:
-            next_track = guild_state.queue.pop(0)
+            next_track = guild_state.queue.pop()
             guild_state.current_track = next_track
             await player.play(next_track)
         else:
             guild_state.current_track = None
             if guild_state.autoplay:
-                tracks = await player.fetch_tracks("lofi lee")
-                if tracks:
-                    next_track = random.choice(tracks)
+                buffer = guild_state.autoplay_buffer
+                if not buffer:
+                    # Nothing prefetched yet (autoplay was just enabled or the refill is slow).
+                    if buffer.needs_refill:
+                        self.prefetch_autoplay(guild_id)
+                    await asyncio.wait([buffer.refill_task])
+                next_track = buffer.pop()
+                if next_track:
                     guild_state.current_track = next_track
                     await player.play(next_track)
             else:
@@ -139,6 +380,7 @@ class MusicCog(commands.Cog):
         if guild and guild.voice_client:
             await guild.voice_client.disconnect()
         self.bot.guild_music_states[guild_id].disconnect_task = None
+        self.mark_session(guild_id)
 
     @nextcord.slash_command( description="[🌺]  Temp stop the song")
     async def pause(self, inter: nextcord.Interaction):
@@ -161,29 +403,31 @@ class MusicCog(commands.Cog):
     async def node(self, inter: nextcord.Interaction):
         await inter.response.defer()
 
-        try:
-            stats = self.bot.pool.nodes[0].stats
-        except Exception as e:
-            embed = create_embed("❌", f"Error while fetching info: {str(e)}", color=0xe74c3c)
+        nodes = self.bot.pool.nodes
+        if not nodes:
+            embed = create_embed("❌", "No lavalink nodes are connected", color=0xe74c3c)
             return await inter.followup.send(embed=embed)
 
-        uptime = str(stats.uptime)
-        memory_used = stats.memory.used / 1024 / 1024
-        memory_free = stats.memory.free / 1024 / 1024
-        memory_allocated = stats.memory.allocated / 1024 / 1024
-        memory_reservable = stats.memory.reservable / 1024 / 1024
-        cpu_load = stats.cpu.system_load
-        lavalink_load = stats.cpu.lavalink_load
-        player_count = stats.player_count
-        playing_player_count = stats.playing_player_count
-
-        embed = create_embed("🔍Lavalink Node Status", f"""
-```- Uptime: {uptime}
+        embed = create_embed("🔍Lavalink Node Status", f"{len(nodes)} nodes | {sum(len(node.players) for node in nodes)} players")
+        for node in nodes:
+            stats = node.stats
+            status = "🟢" if node.available else "🔴"
+            if stats is None:
+                embed.add_field(name=f"{status} {node.label}", value="```- No stats yet```", inline=False)
+                continue
+
+            memory_used = stats.memory.used / 1024 / 1024
+            memory_allocated = stats.memory.allocated / 1024 / 1024
+            embed.add_field(name=f"{status} {node.label}", value=f"""```- Uptime: {stats.uptime}
 - Memory Used: {memory_used:.2f}/{memory_allocated:.2f} MiB
-- CPU Load: {cpu_load:.2f}%
-- Players Connected: {player_count}
-- Playing Players: {playing_player_count}```
-""")
+- CPU Load: {stats.cpu.system_load:.2f}% (lavalink {stats.cpu.lavalink_load:.2f}%)
+- Players Connected: {stats.player_count}
+- Playing Players: {stats.playing_player_count}
+- Load Score: {node_penalty(node):.1f}```""", inline=False)
+        cache = self.track_cache.stats()
+        embed.add_field(name="🗃️ Search Cache", value=f"""```- Hit Rate: {cache['hit_rate'] * 100:.1f}% ({cache['hits']} hits, {cache['negative_hits']} cached misses, {cache['misses']} misses)
+- Entries: {cache['entries']} ({cache['bytes'] / 1024 / 1024:.2f}/{cache['max_bytes'] / 1024 / 1024:.0f} MiB)
+- Evictions: {cache['evictions']}```""", inline=False)
         embed.set_author(name="Node Status", icon_url=self.bot.user.avatar.url)
         embed.set_footer(text=f"🌺 {self.bot.user.name} | By KaiTy_Ez")
 
@@ -203,6 +447,7 @@ class MusicCog(commands.Cog):
 
         guild_state = self.bot.guild_music_states[inter.guild.id]
         guild_state.volume = volume
+        self.mark_session(inter.guild.id, queue=False)
         player = inter.guild.voice_client
         await player.set_volume(volume)
         embed = create_embed("", f"volume now set to {volume}%")
@@ -218,36 +463,91 @@ class MusicCog(commands.Cog):
 
         guild_state = self.bot.guild_music_states[inter.guild.id]
         guild_state.queue.clear()
+        guild_state.autoplay_buffer.clear()
         guild_state.current_track = None
+        self.mark_session(inter.guild.id)
         await inter.guild.voice_client.disconnect()
         embed = create_embed("", "Disconnected")
         await inter.response.send_message(embed=embed)
 
+    def queue_embed(self, guild_id: int, page: int) -> nextcord.Embed:
+        guild_state = self.bot.guild_music_states[guild_id]
+        queue = guild_state.queue
+        embed = create_embed("📋 Current Queue", "")
+        if guild_state.current_track:
+            embed.add_field(name="🎵 Playing", value=f"[{guild_state.current_track.title}]({guild_state.current_track.uri}) | `{format_duration(guild_state.current_track.length)}`", inline=False)
+
+        if queue:
+            start = (page - 1) * 10
+            queue_list = "\n".join([f"`{start + i + 1}.` [{track.title}]({track.uri}) | `{format_duration(track.length)}`" for i, track in enumerate(queue.page(page))])
+            embed.add_field(name="<a:soon:1286713974574022757> Next", value=queue_list, inline=False)
+            embed.set_footer(text=f"Page {page}/{queue.page_count()} | {len(queue)} Tracks | {format_duration(queue.duration())}")
+        return embed
+
     @nextcord.slash_command( description="[🌺] Check queue")
-    async def queue(self, inter: nextcord.Interaction):
+    async def queue(self, inter: nextcord.Interaction, page: int = SlashOption(description="page number", required=False, default=1)):
         if not await voice_channel_check(inter):
                 return
         await inter.response.defer()
-        if not inter.guild.voice_client:
-            embed = create_embed("<a:9211092078964408931:1276525091588669531>", "Im not in voice channel", color=nextcord.Color.red())
-            return await inter.response.send_message(embed=embed)
 
         guild_state = self.bot.guild_music_states[inter.guild.id]
         if not guild_state.current_track and not guild_state.queue:
             embed = create_embed("📋", "No Tracks in queue", color=0xf39c12)
+            return await inter.followup.send(embed=embed)
+
+        view = QueueView(self, inter.guild.id, inter.user.id, page)
+        await inter.followup.send(embed=self.queue_embed(inter.guild.id, view.page), view=view)
+
+    @nextcord.slash_command( description="[🌺] Shuffle the queue")
+    async def shuffle(self, inter: nextcord.Interaction):
+        if not await voice_channel_check(inter):
+            return
+        guild_state = self.bot.guild_music_states[inter.guild.id]
+        guild_state.queue.shuffle()
+        self.mark_session(inter.guild.id)
+        embed = create_embed("", f"Shuffled {len(guild_state.queue)} tracks")
+        await inter.response.send_message(embed=embed)
+
+    @nextcord.slash_command( description="[🌺] Remove a track from the queue")
+    async def remove(self, inter: nextcord.Interaction, position: int = SlashOption(description="position in /queue")):
+        if not await voice_channel_check(inter):
+            return
+        guild_state = self.bot.guild_music_states[inter.guild.id]
+        if not 1 <= position <= len(guild_state.queue):
+            embed = create_embed("<a:9211092078964408931:1276525091588669531>", f"position need to be between 1 to {len(guild_state.queue)}", color=nextcord.Color.red())
             return await inter.response.send_message(embed=embed)
 
-        embed = create_embed("📋 Current Queue", "")
-        if guild_state.current_track:
-            embed.add_field(name="🎵 Playing", value=f"[{guild_state.current_track.title}]({guild_state.current_track.uri}) | `{format_duration(guild_state.current_track.length)}`", inline=False)
+        track = guild_state.queue.remove(position - 1)
+        self.mark_session(inter.guild.id)
+        embed = create_embed("", f"Removed [{track.title}]({track.uri})")
+        await inter.response.send_message(embed=embed)
 
-        if guild_state.queue:
-            queue_list = "\n".join([f"`{i+1}.` [{track.title}]({track.uri}) | `{format_duration(track.length)}`" for i, track in enumerate(guild_state.queue[:10])])
-            embed.add_field(name="<a:soon:1286713974574022757> Next", value=queue_list, inline=False)
-        if len(guild_state.queue) > 10:
-            embed.set_footer(text=f"Show 10 Tacks of {len(guild_state.queue)} Tracks")
+    @nextcord.slash_command( description="[🌺] Move a track in the queue")
+    async def move(self, inter: nextcord.Interaction,
+                   source: int = SlashOption(description="current position"),
+                   destination: int = SlashOption(description="new position")):
+        if not await voice_channel_check(inter):
+            return
+        guild_state = self.bot.guild_music_states[inter.guild.id]
+        size = len(guild_state.queue)
+        if not (1 <= source <= size and 1 <= destination <= size):
+            embed = create_embed("<a:9211092078964408931:1276525091588669531>", f"positions need to be between 1 to {size}", color=nextcord.Color.red())
+            return await inter.response.send_message(embed=embed)
 
-        await inter.followup.send(embed=embed)
+        track = guild_state.queue.move(source - 1, destination - 1)
+        self.mark_session(inter.guild.id)
+        embed = create_embed("", f"Moved [{track.title}]({track.uri}) to `{destination}`")
+        await inter.response.send_message(embed=embed)
+
+    @nextcord.slash_command( description="[🌺] Remove duplicate tracks from the queue")
+    async def dedupe(self, inter: nextcord.Interaction):
+        if not await voice_channel_check(inter):
+            return
+        guild_state = self.bot.guild_music_states[inter.guild.id]
+        removed = guild_state.queue.dedupe()
+        self.mark_session(inter.guild.id)
+        embed = create_embed("", f"Removed {removed} duplicate tracks")
+        await inter.response.send_message(embed=embed)
 
     @nextcord.slash_command( description="[🌺] Skip playing song")
     async def skip(self, inter: nextcord.Interaction):
@@ -298,11 +598,13 @@ class MusicCog(commands.Cog):
         player = inter.guild.voice_client
         await player.stop()
         guild_state.queue.clear()
+        guild_state.autoplay_buffer.clear()
         guild_state.current_track = None
+        self.mark_session(inter.guild.id)
         embed = create_embed("", "Wiped queue and stop songs")
         await inter.response.send_message(embed=embed)
 def setup(bot):
-    if LAVALINK_PORT and LAVALINK_HOST and LAVALINK_PASSWORD:
+    if configured_nodes():
       bot.add_cog(MusicCog(bot))
     else:
       print("[WARN]: Cannot load music features due to improper configuration!")
@@ -1,81 +1,61 @@
 import nextcord
-from nextcord.ext import commands, tasks
-from typing import List, Dict, Optional, Union
-import os
-import json
+from nextcord.ext import commands
+from nextcord import SlashOption
+from typing import List, Dict, Optional, Set
 from datetime import datetime, timedelta
 import re
-from dataclasses import dataclass, asdict
 import logging
-from pathlib import Path
+from utils.reminder_scheduler import ReminderScheduler
+from utils.reminder_store import Reminder, get_reminder_store
+from utils.reminder_delivery import ReminderDelivery
+from utils.recurrence import CATCH_UP_POLICIES, RecurrenceRule, RuleError, catch_up
 
-@dataclass
-class Reminder:
-    """Data class for storing reminder information."""
-    name: str
-    time: datetime
-    channel_id: Optional[int] = None  # Allow sending to specific channel
-    message: str = ""  # Optional custom message
-    recurring: bool = False  # Support for recurring reminders
-    
-    def to_dict(self) -> Dict:
-        """Convert reminder to dictionary for JSON storage."""
-        return {
-            "name": self.name,
-            "time": self.time.isoformat(),
-            "channel_id": self.channel_id,
-            "message": self.message,
-            "recurring": self.recurring
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'Reminder':
-        """Create reminder from dictionary."""
-        return cls(
-            name=data["name"],
-            time=datetime.fromisoformat(data["time"]),
-            channel_id=data.get("channel_id"),
-            message=data.get("message", ""),
-            recurring=data.get("recurring", False)
-        )
-
-class ReminderManager:
-    """Handles reminder storage and retrieval."""
-    def __init__(self, base_path: Union[str, Path]):
-        self.base_path = Path(base_path)
-        self.base_path.mkdir(parents=True, exist_ok=True)
-    
-    def get_user_file(self, user_id: int) -> Path:
-        return self.base_path / f"{user_id}_reminder.json"
-    
-    def load_reminders(self, user_id: int) -> List[Reminder]:
-        try:
-            path = self.get_user_file(user_id)
-            if not path.exists():
-                return []
-            with path.open('r') as file:
-                data = json.load(file)
-                return [Reminder.from_dict(rem) for rem in data]
-        except Exception as e:
-            logger.error(f"Error loading reminders for user {user_id}: {e}")
-            return []
-    
-    def save_reminders(self, user_id: int, reminders: List[Reminder]) -> bool:
-        try:
-            path = self.get_user_file(user_id)
-            with path.open('w') as file:
-                json.dump([rem.to_dict() for rem in reminders], file, indent=4)
-            return True
-        except Exception as e:
-            logger.error(f"Error saving reminders for user {user_id}: {e}")
-            return False
+logger = logging.getLogger(__name__)
 
 class ReminderCog(commands.Cog):
+    SCHEDULE_WINDOW = 1000
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.manager = ReminderManager('database/reminder')
-        self.reminder_check.start()
-        
+        self.store = get_reminder_store(bot)
+        # Only the next SCHEDULE_WINDOW reminders are held in memory; the
+        # rest stay in the store until the window drains.
+        self.window: Dict[int, Reminder] = {}
+        self.horizon = float("inf")
+        # Fired reminders whose message hasn't gone out yet; their rows
+        # are only deleted or advanced once it has (see finish).
+        self.inflight: Set[int] = set()
+        self.scheduler = ReminderScheduler(self.process_due)
+        self.delivery = ReminderDelivery(bot, on_done=self.finish)
+        self.bot.loop.create_task(self.start_scheduler())
+
+    def cog_unload(self):
+        self.scheduler.stop()
+        self.delivery.stop()
+
+    async def start_scheduler(self):
+        await self.bot.wait_until_ready()
+        self.load_window()
+        self.delivery.start()
+        self.scheduler.start(self.bot.loop)
+
+    def load_window(self):
+        """Schedule the next SCHEDULE_WINDOW reminders due."""
+        due = self.store.next_due(self.SCHEDULE_WINDOW)
+        self.horizon = due[-1].due_at if len(due) == self.SCHEDULE_WINDOW else float("inf")
+        for reminder in due:
+            if reminder.id not in self.window and reminder.id not in self.inflight:
+                self.track(reminder)
+
+    def track(self, reminder: Reminder):
+        if reminder.due_at <= self.horizon:
+            self.window[reminder.id] = reminder
+            self.scheduler.schedule(reminder.id, reminder.due_at)
+
+    def untrack(self, reminder_id: int):
+        if self.window.pop(reminder_id, None) is not None:
+            self.scheduler.cancel(reminder_id)
+
     def parse_duration(self, duration: str) -> Optional[timedelta]:
         """Parse duration strings like '1h30m' or '2d12h' into timedelta."""
         time_pattern = re.compile(r'(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?')
@@ -107,45 +87,73 @@ class ReminderCog(commands.Cog):
         self,
         interaction: nextcord.Interaction,
         name: str,
-        duration: str,
+        duration: str = "",
         message: str = "",
         channel: nextcord.TextChannel = None,
-        recurring: bool = False
+        recurring: bool = False,
+        repeat: str = SlashOption(
+            description="e.g. 'every 30m', 'weekdays 09:00' or a cron expression (UTC)",
+            required=False,
+            default=""
+        ),
+        catch_up_policy: str = SlashOption(
+            name="catch_up",
+            description="Missed occurrences after downtime: fire once, fire all, or skip",
+            choices=CATCH_UP_POLICIES,
+            required=False,
+            default="once"
+        )
     ):
         """Create a reminder with optional custom message and channel."""
         try:
-            delta = self.parse_duration(duration)
-            if not delta:
+            rule = first_due = None
+            now = datetime.utcnow()
+            if repeat or recurring:
+                try:
+                    rule = RecurrenceRule(repeat or "every 1d")
+                    # Also rejects rules that parse but never fire, e.g. "0 0 30 2 *".
+                    first_due = rule.next_after(now, now)
+                except RuleError as e:
+                    await interaction.response.send_message(f"Invalid repeat rule: {e}", ephemeral=True)
+                    return
+
+            if duration:
+                delta = self.parse_duration(duration)
+                if not delta:
+                    await interaction.response.send_message(
+                        "Invalid duration format! Use combinations like '1d12h30m' or '45s'.",
+                        ephemeral=True
+                    )
+                    return
+                remind_time = now + delta
+            elif rule:
+                remind_time = first_due
+            else:
                 await interaction.response.send_message(
-                    "Invalid duration format! Use combinations like '1d12h30m' or '45s'.",
+                    "Give a duration, a repeat rule, or both.",
                     ephemeral=True
                 )
                 return
 
-            remind_time = datetime.utcnow() + delta
             reminder = Reminder(
                 name=name,
                 time=remind_time,
                 channel_id=channel.id if channel else None,
                 message=message,
-                recurring=recurring
+                recurring=rule is not None,
+                user_id=interaction.user.id,
+                rule=rule.text if rule else None,
+                catch_up=catch_up_policy
             )
             
-            reminders = self.manager.load_reminders(interaction.user.id)
-            reminders.append(reminder)
-            
-            if self.manager.save_reminders(interaction.user.id, reminders):
-                response = f"✅ Reminder '{name}' set for {duration}"
-                if channel:
-                    response += f" in #{channel.name}"
-                if recurring:
-                    response += " (recurring)"
-                await interaction.response.send_message(response, ephemeral=True)
-            else:
-                await interaction.response.send_message(
-                    "❌ Failed to save reminder. Please try again.",
-                    ephemeral=True
-                )
+            self.store.add(reminder)
+            self.track(reminder)
+            response = f"✅ Reminder #{reminder.id} '{name}' set for <t:{int(reminder.due_at)}:f>"
+            if channel:
+                response += f" in #{channel.name}"
+            if rule:
+                response += f" (repeats {rule.text})"
+            await interaction.response.send_message(response, ephemeral=True)
         except Exception as e:
             logger.error(f"Error creating reminder: {e}")
             await interaction.response.send_message(
@@ -156,7 +164,7 @@ class ReminderCog(commands.Cog):
     @reminder.subcommand(description="List your reminders")
     async def list(self, interaction: nextcord.Interaction):
         """List all active reminders."""
-        reminders = self.manager.load_reminders(interaction.user.id)
+        reminders = self.store.list_user(interaction.user.id)
         
         if not reminders:
             await interaction.response.send_message("You have no active reminders.", ephemeral=True)
@@ -167,7 +175,7 @@ class ReminderCog(commands.Cog):
             color=nextcord.Color.blue()
         )
         
-        for i, rem in enumerate(reminders, 1):
+        for rem in reminders:
             time_left = rem.time - datetime.utcnow()
             if time_left.total_seconds() > 0:
                 value = f"Due in: {self.format_timedelta(time_left)}\n"
@@ -177,10 +185,10 @@ class ReminderCog(commands.Cog):
                 if rem.message:
                     value += f"Message: {rem.message}\n"
                 if rem.recurring:
-                    value += "🔄 Recurring"
+                    value += f"🔄 Repeats {rem.rule or 'every 1d'} (catch-up: {rem.catch_up})"
                 
                 embed.add_field(
-                    name=f"{i}. {rem.name}",
+                    name=f"#{rem.id} {rem.name}",
                     value=value.strip(),
                     inline=False
                 )
@@ -188,28 +196,26 @@ class ReminderCog(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @reminder.subcommand(description="Delete a specific reminder")
-    async def delete(self, interaction: nextcord.Interaction, reminder_number: int):
-        """Delete a specific reminder by its number from the list."""
-        reminders = self.manager.load_reminders(interaction.user.id)
-        
-        if not reminders:
-            await interaction.response.send_message("You have no reminders to delete.", ephemeral=True)
-            return
-            
-        if not 1 <= reminder_number <= len(reminders):
-            await interaction.response.send_message(
-                f"Invalid reminder number. Please use /reminder list to see valid numbers.",
-                ephemeral=True
-            )
-            return
-            
-        deleted_reminder = reminders.pop(reminder_number - 1)
-        if self.manager.save_reminders(interaction.user.id, reminders):
+    async def delete(self, interaction: nextcord.Interaction, reminder_id: int):
+        """Delete a specific reminder by the id shown in /reminder list."""
+        try:
+            deleted_reminder = self.store.get(reminder_id)
+            if deleted_reminder is None or deleted_reminder.user_id != interaction.user.id:
+                await interaction.response.send_message(
+                    f"No reminder #{reminder_id}. Please use /reminder list to see your reminders.",
+                    ephemeral=True
+                )
+                return
+
+            self.store.delete(reminder_id, interaction.user.id)
+            self.untrack(reminder_id)
+            self.refill_window()
             await interaction.response.send_message(
                 f"✅ Deleted reminder: {deleted_reminder.name}",
                 ephemeral=True
             )
-        else:
+        except Exception as e:
+            logger.error(f"Error deleting reminder {reminder_id}: {e}")
             await interaction.response.send_message(
                 "❌ Failed to delete reminder. Please try again.",
                 ephemeral=True
@@ -218,10 +224,12 @@ class ReminderCog(commands.Cog):
     @reminder.subcommand(description="Clear all reminders")
     async def clear(self, interaction: nextcord.Interaction):
         """Clear all reminders for the user."""
-        path = self.manager.get_user_file(interaction.user.id)
         try:
-            if path.exists():
-                path.unlink()
+            deleted = self.store.delete_user(interaction.user.id)
+            for reminder_id in deleted:
+                self.untrack(reminder_id)
+            self.refill_window()
+            if deleted:
                 await interaction.response.send_message("✅ All reminders cleared.", ephemeral=True)
             else:
                 await interaction.response.send_message("You have no reminders to clear.", ephemeral=True)
@@ -232,57 +240,72 @@ class ReminderCog(commands.Cog):
                 ephemeral=True
             )
 
-    @tasks.loop(minutes=1)
-    async def reminder_check(self):
-        """Check and process due reminders."""
-        try:
-            for user_file in self.manager.base_path.glob('*_reminder.json'):
-                user_id = int(user_file.stem.split('_')[0])
-                reminders = self.manager.load_reminders(user_id)
-                new_reminders = []
-                current_time = datetime.utcnow()
-
-                for reminder in reminders:
-                    if current_time >= reminder.time:
-                        try:
-                            await self.send_reminder(user_id, reminder)
-                            if reminder.recurring:
-                                # Add next occurrence for recurring reminders
-                                reminder.time = current_time + timedelta(days=1)
-                                new_reminders.append(reminder)
-                        except Exception as e:
-                            logger.error(f"Error sending reminder: {e}")
-                    else:
-                        new_reminders.append(reminder)
+    async def process_due(self, reminder_ids: List[int]):
+        """Hand due reminders to the delivery queue; rows are written in finish() once they are sent."""
+        dropped, finished, deliveries = [], [], []
+        current_time = datetime.utcnow()
+        for reminder_id in reminder_ids:
+            reminder = self.window.pop(reminder_id, None)
+            if reminder is None:
+                continue
+            times = 1
+            if reminder.recurring:
+                # The next occurrence follows the rule from the due time, not from now.
+                try:
+                    rule = RecurrenceRule(reminder.rule or "every 1d")
+                    times, reminder.time = catch_up(rule, reminder.time, current_time, reminder.catch_up)
+                except RuleError as e:
+                    logger.error(f"Dropping reminder {reminder.id} with bad rule {reminder.rule!r}: {e}")
+                    dropped.append(reminder.id)
+                    continue
+                self.track(reminder)
+            if times > 0:
+                self.inflight.add(reminder.id)
+                deliveries.append((reminder, times))
+            else:
+                finished.append(reminder)
 
-                self.manager.save_reminders(user_id, new_reminders)
+        self.delivery.submit(deliveries)
+        try:
+            self.store.delete_many(dropped)
         except Exception as e:
-            logger.error(f"Error in reminder check loop: {e}")
+            logger.error(f"Error deleting reminders with bad rules: {e}")
+        self.finish(finished)
+        self.refill_window()
 
-    async def send_reminder(self, user_id: int, reminder: Reminder):
-        """Send a reminder to the user or specified channel."""
+    def finish(self, reminders: List[Reminder]):
+        """Delete or advance reminders whose delivery is over, in one write each."""
+        if not reminders:
+            return
+        for reminder in reminders:
+            self.inflight.discard(reminder.id)
         try:
-            if reminder.channel_id:
-                channel = self.bot.get_channel(reminder.channel_id)
-                if channel:
-                    await channel.send(
-                        f"⏰ <@{user_id}> Reminder: {reminder.name}\n{reminder.message}"
-                    )
-                    return
-            
-            user = await self.bot.fetch_user(user_id)
-            if user:
-                message = f"⏰ Reminder: {reminder.name}"
-                if reminder.message:
-                    message += f"\n{reminder.message}"
-                await user.send(message)
+            self.store.delete_many([reminder.id for reminder in reminders if not reminder.recurring])
+            self.store.update_many([reminder for reminder in reminders if reminder.recurring])
         except Exception as e:
-            logger.error(f"Failed to send reminder to user {user_id}: {e}")
+            logger.error(f"Error saving fired reminders: {e}")
 
-    @reminder_check.before_loop
-    async def before_reminder_check(self):
-        """Wait for the bot to be ready before starting the reminder check loop."""
-        await self.bot.wait_until_ready()
+    def refill_window(self):
+        """Reload the window once firing, deletes or /clear have drained it."""
+        if self.horizon != float("inf") and len(self.scheduler) < self.SCHEDULE_WINDOW // 10:
+            self.load_window()
+
+    @commands.command(name="reminderstats")
+    @commands.is_owner()
+    async def reminder_stats(self, ctx):
+        """Show reminder delivery counters and the latest failures."""
+        stats = self.delivery.stats()
+        embed = nextcord.Embed(title="Reminder Delivery", color=nextcord.Color.blue())
+        embed.add_field(name="Queue", value=f"{stats['queued']} queued, {len(self.inflight)} awaiting delivery")
+        embed.add_field(name="Sent", value=f"{stats['sent']} messages ({stats['merged']} merged)")
+        embed.add_field(name="Retries / Failures", value=f"{stats['retried']} / {stats['failed']}")
+        embed.add_field(name="Scheduled", value=f"{len(self.scheduler)} of {self.store.count()} reminders")
+        failures = [
+            f"<t:{int(ts)}:R> {kind} {target_id}: {error[:100]}"
+            for ts, (kind, target_id), error in list(self.delivery.failures)[-5:]
+        ]
+        embed.add_field(name="Latest Failures", value="\n".join(failures) or "None", inline=False)
+        await ctx.send(embed=embed)
 
     @staticmethod
     def format_timedelta(td: timedelta) -> str:
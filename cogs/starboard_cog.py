@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import nextcord
 from nextcord.ext import commands
 from nextcord import Embed
@@ -6,17 +8,63 @@ import os
 import typing
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+STAR = "⭐"
+STAR_DEBOUNCE = 2.0 # seconds of star changes folded into one starboard update
+
+
+class PendingStars:
+    __slots__ = ("guild_id", "channel_id", "delta", "timer")
+
+    def __init__(self, guild_id: int, channel_id: int):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.delta = 0
+        self.timer: typing.Optional[asyncio.TimerHandle] = None
+
+
 class StarboardCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = Path("database/starboard/starboard.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the cog's lifetime, so sqlite3 reuses its
+        # prepared statements instead of reopening the file per query.
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self.setup_database()
+        self.configs: typing.Dict[int, tuple] = {
+            guild_id: (channel_id, threshold)
+            for guild_id, channel_id, threshold in self.conn.execute(
+                "SELECT guild_id, channel_id, threshold FROM config"
+            )
+        }
+
+        self.pending_stars: typing.Dict[int, PendingStars] = {}
+        self.flushing: typing.Set[int] = set()
+        self.star_tasks: typing.Set[asyncio.Task] = set()
+
+    def cog_unload(self):
+        # Keep the counts right; the starboard posts catch up on the next star.
+        for message_id, pending in self.pending_stars.items():
+            pending.timer.cancel()
+            self.apply_star_delta(message_id, pending.delta)
+        self.pending_stars.clear()
+        # Updates already talking to Discord still need the connection to
+        # record the posts they send, so close it once they are done.
+        if self.star_tasks:
+            asyncio.gather(*self.star_tasks, return_exceptions=True).add_done_callback(
+                lambda _: self.conn.close()
+            )
+        else:
+            self.conn.close()
 
     def setup_database(self):
         """Initialize the SQLite database and create required tables."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self.conn:
+            cursor = self.conn.cursor()
             
             # Table for starboard configuration
             cursor.execute('''
@@ -37,124 +85,182 @@ class StarboardCog(commands.Cog):
                     FOREIGN KEY (guild_id) REFERENCES config(guild_id)
                 )
             ''')
-            
-            conn.commit()
 
     def get_config(self, guild_id: int) -> tuple[int, int]:
         """Get starboard configuration for a guild."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT channel_id, threshold FROM config WHERE guild_id = ?",
-                (guild_id,)
+        return self.configs.get(guild_id, (None, 3))
+
+    def set_config(self, guild_id: int, channel_id: typing.Optional[int] = None,
+                   threshold: typing.Optional[int] = None):
+        """Update a guild's starboard configuration."""
+        current_channel, current_threshold = self.get_config(guild_id)
+        config = (
+            channel_id if channel_id is not None else current_channel,
+            threshold if threshold is not None else current_threshold
+        )
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO config (guild_id, channel_id, threshold)
+                VALUES (?, ?, ?)
+                ON CONFLICT(guild_id) 
+                DO UPDATE SET channel_id = excluded.channel_id, threshold = excluded.threshold
+            ''', (guild_id, *config))
+        self.configs[guild_id] = config
+
+    def apply_star_delta(self, message_id: int, delta: int) -> typing.Optional[tuple]:
+        """Add ``delta`` to a message's star count.
+
+        Returns ``(count, starboard message ID)``, or None when the message
+        has no counter yet and must be seeded with ``set_star_count``.
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE starred_messages SET star_count = max(star_count + ?, 0) WHERE original_message_id = ?",
+                (delta, message_id)
             )
-            result = cursor.fetchone()
-            return result if result else (None, 3)
+            return self.conn.execute(
+                "SELECT star_count, starboard_message_id FROM starred_messages WHERE original_message_id = ?",
+                (message_id,)
+            ).fetchone()
 
-    def update_star_count(self, message_id: int, guild_id: int, count: int):
-        """Update star count for a message."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+    def set_star_count(self, message_id: int, guild_id: int, count: int):
+        """Overwrite a message's star count with the real one from Discord."""
+        with self.conn:
+            self.conn.execute('''
                 INSERT INTO starred_messages (original_message_id, guild_id, star_count)
                 VALUES (?, ?, ?)
                 ON CONFLICT(original_message_id) 
-                DO UPDATE SET star_count = ?
-            ''', (message_id, guild_id, count, count))
-            conn.commit()
-
-    def get_starboard_message_id(self, original_message_id: int) -> int:
-        """Get the starboard message ID for an original message."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT starboard_message_id FROM starred_messages WHERE original_message_id = ?",
-                (original_message_id,)
-            )
-            result = cursor.fetchone()
-            return result[0] if result else None
+                DO UPDATE SET star_count = excluded.star_count
+            ''', (message_id, guild_id, count))
 
     def set_starboard_message_id(self, original_message_id: int, starboard_message_id: int):
         """Set the starboard message ID for an original message."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+        with self.conn:
+            self.conn.execute('''
                 UPDATE starred_messages 
                 SET starboard_message_id = ? 
                 WHERE original_message_id = ?
             ''', (starboard_message_id, original_message_id))
-            conn.commit()
-
-    def remove_starred_message(self, message_id: int):
-        """Remove a message from the starboard database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM starred_messages WHERE original_message_id = ?",
-                (message_id,)
-            )
-            conn.commit()
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: nextcord.RawReactionActionEvent):
-        if str(payload.emoji) == "⭐":
-            await self.process_star_reaction(payload)
+        if str(payload.emoji) == STAR:
+            self.queue_star_delta(payload, 1)
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: nextcord.RawReactionActionEvent):
-        if str(payload.emoji) == "⭐":
-            await self.process_star_reaction(payload, removed=True)
+        if str(payload.emoji) == STAR:
+            self.queue_star_delta(payload, -1)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear(self, payload: nextcord.RawReactionClearEvent):
+        self.clear_stars(payload)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: nextcord.RawReactionClearEmojiEvent):
+        if str(payload.emoji) == STAR:
+            self.clear_stars(payload)
 
-    async def process_star_reaction(self, payload: nextcord.RawReactionActionEvent, removed: bool = False):
-        if not (guild := self.bot.get_guild(payload.guild_id)):
+    def clear_stars(self, payload):
+        channel_id, _ = self.get_config(payload.guild_id)
+        if not channel_id or payload.channel_id == channel_id:
             return
+        self.set_star_count(payload.message_id, payload.guild_id, 0)
+        if payload.message_id in self.pending_stars:
+            self.pending_stars[payload.message_id].delta = 0
+        # A zero delta still schedules an update, which takes the post down.
+        self.queue_star_delta(payload, 0)
 
-        channel_id, threshold = self.get_config(guild.id)
-        if not channel_id:
+    def queue_star_delta(self, payload, delta: int):
+        """Collect star changes per message; the first one arms the debounce timer."""
+        channel_id, _ = self.get_config(payload.guild_id)
+        if not channel_id or payload.channel_id == channel_id:
             return
-            
+
+        pending = self.pending_stars.get(payload.message_id)
+        if pending is None:
+            pending = self.pending_stars[payload.message_id] = PendingStars(payload.guild_id, payload.channel_id)
+            pending.timer = asyncio.get_running_loop().call_later(
+                STAR_DEBOUNCE, self.start_star_flush, payload.message_id
+            )
+        pending.delta += delta
+
+    def start_star_flush(self, message_id: int):
+        if message_id in self.flushing:
+            # The previous flush is still talking to Discord; try again shortly.
+            pending = self.pending_stars[message_id]
+            pending.timer = asyncio.get_running_loop().call_later(STAR_DEBOUNCE, self.start_star_flush, message_id)
+            return
+        task = asyncio.create_task(self.process_star_reaction(message_id, self.pending_stars.pop(message_id)))
+        self.star_tasks.add(task)
+        task.add_done_callback(self.star_tasks.discard)
+
+    async def process_star_reaction(self, message_id: int, pending: "PendingStars"):
+        self.flushing.add(message_id)
+        try:
+            await self.update_starboard(message_id, pending)
+        except Exception as e:
+            logger.error(f"Failed to update starboard for message {message_id}: {e}")
+        finally:
+            self.flushing.discard(message_id)
+
+    @staticmethod
+    def count_stars(message: nextcord.Message) -> int:
+        return next((reaction.count for reaction in message.reactions if str(reaction.emoji) == STAR), 0)
+
+    async def update_starboard(self, message_id: int, pending: "PendingStars"):
+        channel_id, threshold = self.get_config(pending.guild_id)
+        row = self.apply_star_delta(message_id, pending.delta)
+        # Below the threshold and not on the board: the counter is all we need.
+        if row is not None and row[0] < threshold and not row[1]:
+            return
+
+        if not (guild := self.bot.get_guild(pending.guild_id)):
+            return
+
         if not (starboard_channel := guild.get_channel(channel_id)):
             return
             
-        if not (channel := guild.get_channel(payload.channel_id)):
+        if not (channel := guild.get_channel(pending.channel_id)):
             return
 
         try:
-            message = await channel.fetch_message(payload.message_id)
+            message = await channel.fetch_message(message_id)
         except nextcord.NotFound:
             return
 
-        if message.author.bot or channel.id == channel_id:
-            return
-
-        star_count = sum(1 for reaction in message.reactions 
-                        if str(reaction.emoji) == "⭐")
+        # First star change seen for this message: it may have had stars
+        # before the counter existed, so seed it from the real count once.
+        # Later fetches correct any drift the same way.
+        star_count = self.count_stars(message)
+        starboard_message_id = row[1] if row else None
+        if row is None or row[0] != star_count:
+            self.set_star_count(message_id, pending.guild_id, star_count)
 
-        self.update_star_count(message.id, guild.id, star_count)
+        if message.author.bot:
+            return
 
         if star_count >= threshold:
-            await self.add_to_starboard(message, starboard_channel)
-        elif star_count < threshold:
-            await self.remove_from_starboard(message, starboard_channel)
+            await self.add_to_starboard(message, starboard_channel, star_count, starboard_message_id)
+        elif starboard_message_id:
+            await self.remove_from_starboard(message, starboard_channel, starboard_message_id)
 
     async def add_to_starboard(self, message: nextcord.Message, 
-                             starboard_channel: nextcord.TextChannel) -> None:
-        starboard_message_id = self.get_starboard_message_id(message.id)
-        
+                             starboard_channel: nextcord.TextChannel,
+                             star_count: int, starboard_message_id: typing.Optional[int]) -> None:
+        embed = self.create_starboard_embed(message, star_count)
+
         if starboard_message_id:
             try:
-                starboard_message = await starboard_channel.fetch_message(starboard_message_id)
-                embed = self.create_starboard_embed(message)
-                await starboard_message.edit(embed=embed)
+                await starboard_channel.get_partial_message(starboard_message_id).edit(embed=embed)
                 return
             except nextcord.NotFound:
                 pass
 
-        embed = self.create_starboard_embed(message)
         starboard_message = await starboard_channel.send(embed=embed)
         self.set_starboard_message_id(message.id, starboard_message.id)
 
-    def create_starboard_embed(self, message: nextcord.Message) -> Embed:
+    def create_starboard_embed(self, message: nextcord.Message, star_count: int) -> Embed:
         embed = Embed(
             description=message.content or "[No Text]",
             color=nextcord.Color.gold(),
@@ -178,14 +284,6 @@ class StarboardCog(commands.Cog):
                 )
             embed.set_image(url=message.attachments[0].url)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT star_count FROM starred_messages WHERE original_message_id = ?",
-                (message.id,)
-            )
-            star_count = cursor.fetchone()[0]
-            
         embed.set_footer(
             text=f"⭐ {star_count} | Message ID: {message.id}"
         )
@@ -193,16 +291,15 @@ class StarboardCog(commands.Cog):
         return embed
 
     async def remove_from_starboard(self, message: nextcord.Message, 
-                                  starboard_channel: nextcord.TextChannel) -> None:
-        starboard_message_id = self.get_starboard_message_id(message.id)
-        
+                                  starboard_channel: nextcord.TextChannel,
+                                  starboard_message_id: typing.Optional[int]) -> None:
         if starboard_message_id:
             try:
-                starboard_message = await starboard_channel.fetch_message(starboard_message_id)
-                await starboard_message.delete()
-                self.remove_starred_message(message.id)
+                await starboard_channel.get_partial_message(starboard_message_id).delete()
             except nextcord.NotFound:
                 pass
+            # Keep the row: its star count is what brings the post back.
+            self.set_starboard_message_id(message.id, None)
 
     @nextcord.slash_command(name="starboard", description="Manage starboard settings")
     async def starboard(self, interaction: nextcord.Interaction):
@@ -211,15 +308,7 @@ class StarboardCog(commands.Cog):
     @starboard.subcommand(name="channel", description="Set the starboard channel")
     @commands.has_permissions(manage_channels=True)
     async def starboard_channel(self, interaction: nextcord.Interaction, channel: nextcord.TextChannel):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO config (guild_id, channel_id)
-                VALUES (?, ?)
-                ON CONFLICT(guild_id) 
-                DO UPDATE SET channel_id = ?
-            ''', (interaction.guild_id, channel.id, channel.id))
-            conn.commit()
+        self.set_config(interaction.guild_id, channel_id=channel.id)
             
         await interaction.response.send_message(f"✅ Starboard channel set to {channel.mention}")
 
@@ -230,15 +319,7 @@ class StarboardCog(commands.Cog):
             await interaction.response.send_message("❌ Star threshold must be at least 1.", ephemeral=True)
             return
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO config (guild_id, threshold)
-                VALUES (?, ?)
-                ON CONFLICT(guild_id) 
-                DO UPDATE SET threshold = ?
-            ''', (interaction.guild_id, stars, stars))
-            conn.commit()
+        self.set_config(interaction.guild_id, threshold=stars)
 
         await interaction.response.send_message(f"✅ Star threshold set to {stars} stars")
 
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.economy_journal import EconomyJournal, JournalRangeError
+from utils.economy_ledger import Ledger
+from utils.economy_store import SQLiteEconomyStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def make_ledger(tmp_path, segment_entries=2):
+    store = SQLiteEconomyStore(tmp_path / "economy.db")
+    # Balance from before the journal existed; only the baseline snapshot has it.
+    store.update_user(1, {'wallet': 500})
+    journal = EconomyJournal(tmp_path / "journal", segment_entries=segment_entries)
+    return store, journal, Ledger(store, journal)
+
+
+def test_apply_journal_fold_round_trip(tmp_path, clock):
+    store, journal, ledger = make_ledger(tmp_path)
+    for step in range(7):
+        clock[0] += 1
+        ledger.apply({1: 10, 2: step}, "test", {2: {'bank': step}})
+
+    assert len(journal.snapshots) > 1
+    folded = journal.fold()
+    for user_id in (1, 2):
+        row = store.get_user(user_id)
+        assert folded[user_id]['wallet'] == row['wallet']
+        assert folded[user_id]['bank'] == row['bank']
+    assert folded[1]['wallet'] == 570
+
+    # A reopened journal folds to the same state.
+    journal.close()
+    assert EconomyJournal(tmp_path / "journal", segment_entries=2).fold() == folded
+
+
+def test_restore_between_snapshots(tmp_path, clock):
+    store, journal, ledger = make_ledger(tmp_path)
+    for delta in (100, 50, -30, 10, 1):
+        clock[0] += 1
+        ledger.apply({1: delta}, "test")
+    # Snapshots at seq 0 (baseline), 2 and 4, stamped with their last entry.
+    assert journal.snapshots == [0, 2, 4]
+    assert journal._snapshot_header(2)['ts'] == 1002.0
+
+    asyncio.run(ledger.restore(1003.5))
+    assert store.get_user(1)['wallet'] == 620
+
+    asyncio.run(ledger.restore(1001.5))
+    assert store.get_user(1)['wallet'] == 600
+
+
+def test_restore_before_first_snapshot_is_refused(tmp_path, clock):
+    store, journal, ledger = make_ledger(tmp_path)
+    clock[0] += 1
+    ledger.apply({1: 100}, "test")
+
+    with pytest.raises(JournalRangeError) as error:
+        asyncio.run(ledger.restore(999.0))
+    assert error.value.earliest == 1000.0
+    assert store.get_user(1)['wallet'] == 600
@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+
+from utils.economy_journal import EconomyJournal
+from utils.economy_ledger import InsufficientFunds, Ledger
+from utils.economy_store import SQLiteEconomyStore
+
+
+def test_overdraft_raises_and_changes_nothing(tmp_path):
+    store = SQLiteEconomyStore(tmp_path / "economy.db")
+    ledger = Ledger(store, EconomyJournal(tmp_path / "journal"))
+    ledger.apply({1: 100}, "test")
+
+    with pytest.raises(InsufficientFunds) as error:
+        asyncio.run(ledger.transfer(1, 2, 150))
+    assert (error.value.user_id, error.value.wallet, error.value.amount) == (1, 100, 150)
+
+    assert store.get_user(1)['wallet'] == 100
+    assert store.get_user(2)['wallet'] == 0
+    assert len(ledger.history(1)) == 1
+    assert ledger.history(2) == []
@@ -0,0 +1,16 @@
+from utils.economy_store import CachedEconomyStore, SQLiteEconomyStore
+
+
+def test_cache_flushes_once_threshold_rows_are_dirty(tmp_path):
+    backend = SQLiteEconomyStore(tmp_path / "economy.db")
+    store = CachedEconomyStore(backend, flush_threshold=3)
+
+    store.update_user(1, {'wallet': 10})
+    store.update_user(2, {'wallet': 20})
+    assert backend.get_user(1)['wallet'] == 0
+    assert store.get_user(1)['wallet'] == 10
+
+    store.update_user(3, {'wallet': 30})
+    assert store.dirty == {}
+    assert [backend.get_user(user_id)['wallet'] for user_id in (1, 2, 3)] == [10, 20, 30]
+    assert store.stats()['rows_flushed'] == 3
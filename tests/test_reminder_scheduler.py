@@ -0,0 +1,27 @@
+import asyncio
+import time
+
+from utils.reminder_scheduler import ReminderScheduler
+
+
+def test_scheduler_survives_callback_errors():
+    async def scenario():
+        fired = []
+
+        async def callback(keys):
+            fired.extend(keys)
+            if "bad" in keys:
+                raise RuntimeError("boom")
+
+        scheduler = ReminderScheduler(callback)
+        scheduler.start()
+        scheduler.schedule("bad", time.time())
+        await asyncio.sleep(0.05)
+        assert not scheduler.task.done()
+
+        scheduler.schedule("good", time.time() + 0.05)
+        await asyncio.sleep(0.2)
+        scheduler.stop()
+        return fired
+
+    assert asyncio.run(scenario()) == ["bad", "good"]
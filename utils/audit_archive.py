@@ -0,0 +1,204 @@
+import asyncio
+import atexit
+import gzip
+import json
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from utils.config import AUDIT_ARCHIVE_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+AUDIT_PATH = "database/audit"
+READ_CHUNK = 64 * 1024
+INDEX_KEYS = ("user", "channel", "type")
+
+
+def _encode(entry: dict) -> bytes:
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _read_member(f, offset: int) -> Iterator[bytes]:
+    """Yield the lines of the single gzip member starting at ``offset``."""
+    f.seek(offset)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    tail = b""
+    while not decompressor.eof:
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            break
+        data = tail + decompressor.decompress(chunk)
+        *lines, tail = data.split(b"\n")
+        yield from lines
+
+
+class AuditArchive:
+    """Append-only archive of every mod log event, one segment per guild per day.
+
+    Events are buffered and written every ``flush_interval`` seconds. Each
+    flush appends one gzip member to ``<guild_id>/<YYYY-MM-DD>.jsonl.gz``,
+    so a segment is a valid gzip file at any point and nothing is ever
+    rewritten. The segment's ``.idx`` file gets one JSON line per member
+    with its byte offset, time range and the users, channels and event
+    types in it. ``search`` decompresses only matching members, one at a
+    time.
+
+    Writes run on a single background thread, so they stay in order and
+    never block the event loop. ``close`` writes whatever is buffered.
+    """
+
+    def __init__(self, directory: Union[str, Path] = AUDIT_PATH,
+                 flush_interval: float = AUDIT_ARCHIVE_FLUSH_INTERVAL, flush_threshold: int = 500):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.pending: Dict[int, List[dict]] = {}
+        self.pending_count = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-archive")
+
+        self.written = 0
+
+    def _segment_path(self, guild_id: int, day: str) -> Path:
+        return self.directory / str(guild_id) / f"{day}.jsonl.gz"
+
+    def _index_path(self, guild_id: int, day: str) -> Path:
+        return self.directory / str(guild_id) / f"{day}.idx"
+
+    def record(self, guild_id: int, event_type: str, user_id: Optional[int] = None,
+               channel_id: Optional[int] = None, **fields):
+        entry = {'ts': time.time(), 'type': event_type, 'user': user_id, 'channel': channel_id, **fields}
+        self.pending.setdefault(guild_id, []).append(entry)
+        self.pending_count += 1
+
+        if self.pending_count >= self.flush_threshold:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.flush_interval, self.flush)
+
+    def flush(self) -> Optional[asyncio.Future]:
+        """Hand buffered events to the writer thread.
+
+        Returns a future that completes once they, and every earlier
+        flush, are on disk; without a running loop they are written inline.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending, self.pending_count = self.pending, {}, 0
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(pending)
+            return None
+        future = loop.run_in_executor(self.writer, self._write, pending)
+        future.add_done_callback(self._flush_done)
+        return future
+
+    @staticmethod
+    def _flush_done(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Failed to write audit archive: {future.exception()}")
+
+    def _write(self, pending: Dict[int, List[dict]]):
+        for guild_id, entries in pending.items():
+            by_day: Dict[str, List[dict]] = {}
+            for entry in entries:
+                by_day.setdefault(_day(entry['ts']), []).append(entry)
+            for day, day_entries in by_day.items():
+                self._append(guild_id, day, day_entries)
+
+    def _append(self, guild_id: int, day: str, entries: List[dict]):
+        path = self._segment_path(guild_id, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('ab') as f:
+            offset = f.tell()
+            f.write(gzip.compress(b"".join(_encode(entry) for entry in entries)))
+
+        member = {'offset': offset, 'first': entries[0]['ts'], 'last': entries[-1]['ts']}
+        for key in INDEX_KEYS:
+            member[key] = sorted({str(entry[key]) for entry in entries if entry[key] is not None})
+        # The member is on disk before its index line, so readers never see
+        # an index entry pointing past the end of the segment.
+        with self._index_path(guild_id, day).open('ab') as f:
+            f.write(_encode(member))
+        self.written += len(entries)
+
+    def _read_index(self, guild_id: int, day: str) -> List[dict]:
+        path = self._index_path(guild_id, day)
+        if not path.exists():
+            return []
+        members = []
+        with path.open('rb') as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    members.append(json.loads(line))
+        return members
+
+    def days(self, guild_id: int) -> List[str]:
+        """Days with a segment for ``guild_id``, newest first."""
+        directory = self.directory / str(guild_id)
+        if not directory.is_dir():
+            return []
+        return sorted((path.name[:10] for path in directory.glob("*.jsonl.gz")), reverse=True)
+
+    def search(self, guild_id: int, user_id: Optional[int] = None, channel_id: Optional[int] = None,
+               event_type: Optional[str] = None, since: Optional[float] = None) -> Iterator[dict]:
+        """Yield matching events newest first, reading one gzip member at a time.
+
+        Only reads files, so it can run in any thread. Buffered events are
+        not searched; await ``flush`` first to include them.
+        """
+        filters = {key: str(value) for key, value in zip(INDEX_KEYS, (user_id, channel_id, event_type))
+                   if value is not None}
+        since_day = _day(since) if since is not None else None
+
+        for day in self.days(guild_id):
+            if since_day is not None and day < since_day:
+                return
+            candidates = [member for member in self._read_index(guild_id, day)
+                          if all(value in member[key] for key, value in filters.items())]
+            if not candidates:
+                continue
+
+            with self._segment_path(guild_id, day).open('rb') as f:
+                for member in reversed(candidates):
+                    if since is not None and member['last'] < since:
+                        return
+                    entries = [json.loads(line) for line in _read_member(f, member['offset']) if line]
+                    for entry in reversed(entries):
+                        if since is not None and entry['ts'] < since:
+                            return
+                        if all(str(entry[key]) == value for key, value in filters.items()):
+                            yield entry
+
+    def close(self):
+        """Write everything still buffered and stop the writer thread."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending, self.pending_count = self.pending, {}, 0
+        # Wait for queued flushes first so segments stay in time order.
+        self.writer.shutdown(wait=True)
+        self._write(pending)
+
+
+def get_audit_archive(bot) -> AuditArchive:
+    """Return the audit archive shared by the logging cogs."""
+    archive = getattr(bot, "audit_archive", None)
+    if archive is None:
+        archive = AuditArchive()
+        # Last-chance write of buffered events when the process exits.
+        atexit.register(archive.close)
+        bot.audit_archive = archive
+    return archive
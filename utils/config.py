@@ -5,4 +5,21 @@ LAVALINK_HOST = ""
 HEADERS = {"Authorization": ""}
 API_BASE_URL = ""
 OWNER_ID = 0000000000000000 
+# extra lavalink nodes, e.g. {"label": "EU-1", "host": "", "port": 2333, "password": "", "secure": False}
+# used alongside the MAIN node from LAVALINK_HOST/PORT/PASSWORD above (leave those empty to use only these)
+LAVALINK_NODES = []
+NODE_HEALTH_INTERVAL = 10 # seconds between failover checks
+# track search cache shared by all guilds
+TRACK_CACHE_TTL = 3600 # seconds a search result is reused
+TRACK_CACHE_NEGATIVE_TTL = 300 # seconds a "no results" answer is reused
+TRACK_CACHE_MAX_BYTES = 32 * 1024 * 1024
+MUSIC_SESSION_SAVE_INTERVAL = 10 # seconds between batched music session writes
+# message content kept for the delete/edit logs, per guild
+MESSAGE_CACHE_GUILD_BYTES = 1024 * 1024
+AUDIT_ARCHIVE_FLUSH_INTERVAL = 5 # seconds between audit archive writes
+
+# economy write-back cache
+ECONOMY_FLUSH_INTERVAL = 5 # seconds between batched writes
+ECONOMY_FLUSH_THRESHOLD = 500 # flush early once this many users are dirty
+ECONOMY_CACHE_SIZE = 50000 # users kept in memory
 # good luckk
\ No newline at end of file
@@ -0,0 +1,250 @@
+import bisect
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from utils.economy_store import default_user
+
+
+def _encode(entry: dict) -> bytes:
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+
+
+class JournalRangeError(ValueError):
+    """Raised when a fold asks for a time before the oldest snapshot."""
+
+    def __init__(self, until: float, earliest: Optional[float]):
+        super().__init__(f"no journal snapshot at or before {until} (earliest: {earliest})")
+        self.until = until
+        self.earliest = earliest
+
+
+def apply_entry(rows: Dict[int, dict], entry: dict):
+    """Fold one journal entry into ``rows``."""
+    user_id = entry['user']
+    row = rows.get(user_id)
+    if row is None:
+        row = rows[user_id] = default_user(user_id)
+    row['wallet'] += entry.get('wallet', 0)
+    row.update(entry.get('set', {}))
+
+
+class EconomyJournal:
+    """Event-sourced history of every economy change.
+
+    Entries are appended to JSONL segments (``segment-<first seq>.jsonl``).
+    When a segment reaches ``segment_entries`` lines the ledger writes a
+    snapshot of every row (``snapshot-<seq>.jsonl.gz``) and a new segment is
+    started, so balances are always the latest snapshot plus a short tail.
+
+    Each sealed segment gets a ``.idx`` file mapping user_id to the byte
+    offsets of that user's entries; the active segment's index is kept in
+    memory. ``history`` seeks straight to those offsets.
+
+    ``snapshot`` only reads the rows it is given and writes its own file,
+    so the ledger runs it in an executor; ``fold`` falls back to an older
+    snapshot plus more segments while a newer one is still being written.
+
+    A snapshot's header carries the time of the last entry it includes, so
+    ``fold(until)`` can pick the newest one that is not ahead of ``until``.
+    Balances from before the oldest snapshot are not in the journal at all,
+    so folding to an earlier time raises ``JournalRangeError``.
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_entries: int = 50000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_entries = segment_entries
+
+        self.segments = sorted(int(path.name[8:20]) for path in self.directory.glob("segment-*.jsonl"))
+        self.snapshots = sorted(int(path.name[9:21]) for path in self.directory.glob("snapshot-*.jsonl.gz"))
+
+        self.sealed_indexes: "OrderedDict[int, Dict[int, List[int]]]" = OrderedDict()
+        self.active_index: Dict[int, List[int]] = {}
+        self.active_entries = 0
+        self.next_seq = 1
+        self.last_ts: Optional[float] = None
+        if self.segments:
+            self._scan_active()
+        else:
+            self.segments.append(self.next_seq)
+        self.file = self._segment_path(self.segments[-1]).open('ab')
+
+    def _segment_path(self, start: int) -> Path:
+        return self.directory / f"segment-{start:012d}.jsonl"
+
+    def _index_path(self, start: int) -> Path:
+        return self.directory / f"segment-{start:012d}.idx"
+
+    def _snapshot_path(self, seq: int) -> Path:
+        return self.directory / f"snapshot-{seq:012d}.jsonl.gz"
+
+    def _scan_active(self):
+        path = self._segment_path(self.segments[-1])
+        self.next_seq = self.segments[-1]
+        with path.open('rb') as f:
+            offset = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    entry = json.loads(line)
+                    self.active_index.setdefault(entry['user'], []).append(offset)
+                    self.active_entries += 1
+                    self.next_seq = entry['seq'] + 1
+                    self.last_ts = entry['ts']
+                    offset += len(line)
+                else:
+                    # Torn write from a crash: drop the partial line.
+                    with path.open('r+b') as fix:
+                        fix.truncate(offset)
+                    break
+
+    @property
+    def last_seq(self) -> int:
+        return self.next_seq - 1
+
+    @property
+    def needs_rotation(self) -> bool:
+        return self.active_entries >= self.segment_entries
+
+    def append(self, entries: Iterable[dict]) -> int:
+        """Number and write ``entries``; returns the last sequence number."""
+        now = time.time()
+        chunks = []
+        offset = self.file.tell()
+        for entry in entries:
+            entry = {'seq': self.next_seq, 'ts': now, **entry}
+            self.next_seq += 1
+            line = _encode(entry)
+            self.active_index.setdefault(entry['user'], []).append(offset)
+            self.active_entries += 1
+            offset += len(line)
+            chunks.append(line)
+        self.file.write(b"".join(chunks))
+        self.file.flush()
+        self.last_ts = now
+        return self.next_seq - 1
+
+    def snapshot(self, users: Iterable[dict], seq: Optional[int] = None, ts: Optional[float] = None):
+        """Write ``users`` as the fold base at ``seq`` (default: the latest entry).
+
+        ``users`` must be the rows exactly as of ``seq``, and ``ts`` the time
+        they became current: by default the time of the latest entry, or now
+        for a journal without entries.
+        """
+        if seq is None:
+            seq, ts = self.last_seq, self.last_ts
+        if ts is None:
+            ts = time.time()
+        path = self._snapshot_path(seq)
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, 'wb') as f:
+            f.write(_encode({'seq': seq, 'ts': ts}))
+            for user in users:
+                f.write(_encode(user))
+        os.replace(tmp, path)
+        if seq not in self.snapshots:
+            bisect.insort(self.snapshots, seq)
+
+    def seal(self):
+        """Seal the active segment and start a new one."""
+        with self._index_path(self.segments[-1]).open('w', encoding='utf-8') as f:
+            json.dump(self.active_index, f, separators=(',', ':'))
+        self.file.close()
+
+        self.segments.append(self.next_seq)
+        self.active_index = {}
+        self.active_entries = 0
+        self.file = self._segment_path(self.segments[-1]).open('ab')
+
+    def _sealed_index(self, start: int) -> Dict[int, List[int]]:
+        index = self.sealed_indexes.get(start)
+        if index is None:
+            with self._index_path(start).open('r', encoding='utf-8') as f:
+                index = {int(user_id): offsets for user_id, offsets in json.load(f).items()}
+            self.sealed_indexes[start] = index
+            if len(self.sealed_indexes) > 16:
+                self.sealed_indexes.popitem(last=False)
+        else:
+            self.sealed_indexes.move_to_end(start)
+        return index
+
+    def _segment_index(self, start: int) -> Dict[int, List[int]]:
+        if start == self.segments[-1]:
+            return self.active_index
+        return self._sealed_index(start)
+
+    def history(self, user_id: int, limit: int = 10) -> List[dict]:
+        """The user's most recent entries, newest first."""
+        results = []
+        for start in reversed(self.segments):
+            offsets = self._segment_index(start).get(user_id, [])
+            if not offsets:
+                continue
+            with self._segment_path(start).open('rb') as f:
+                for offset in reversed(offsets):
+                    f.seek(offset)
+                    results.append(json.loads(f.readline()))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def _read_segment(self, start: int) -> Iterator[dict]:
+        with self._segment_path(start).open('rb') as f:
+            for line in f:
+                # fold may run in an executor while the active segment grows.
+                if not line.endswith(b"\n"):
+                    return
+                yield json.loads(line)
+
+    def _snapshot_header(self, seq: int) -> dict:
+        with gzip.open(self._snapshot_path(seq), 'rb') as f:
+            return json.loads(f.readline())
+
+    def _read_snapshot(self, seq: int) -> Iterator[dict]:
+        with gzip.open(self._snapshot_path(seq), 'rb') as f:
+            f.readline()
+            for line in f:
+                yield json.loads(line)
+
+    def fold(self, until: Optional[float] = None) -> Dict[int, dict]:
+        """Rebuild every row from the newest usable snapshot plus its tail.
+
+        With ``until`` (a unix timestamp) the state as of that moment is
+        returned instead of the current one; ``JournalRangeError`` is raised
+        if that is before the oldest snapshot.
+        """
+        rows: Dict[int, dict] = {}
+        base_seq = 0
+        for seq in reversed(self.snapshots):
+            if until is None or self._snapshot_header(seq)['ts'] <= until:
+                rows = {row['user_id']: row for row in self._read_snapshot(seq)}
+                base_seq = seq
+                break
+        else:
+            if until is not None:
+                raise JournalRangeError(until, self.earliest())
+
+        for index, start in enumerate(self.segments):
+            following = self.segments[index + 1] if index + 1 < len(self.segments) else None
+            if following is not None and following <= base_seq + 1:
+                continue
+            for entry in self._read_segment(start):
+                if entry['seq'] <= base_seq:
+                    continue
+                if until is not None and entry['ts'] > until:
+                    return rows
+                apply_entry(rows, entry)
+        return rows
+
+    def earliest(self) -> Optional[float]:
+        """Oldest time ``fold`` can rebuild, or None without snapshots."""
+        if not self.snapshots:
+            return None
+        return self._snapshot_header(self.snapshots[0])['ts']
+
+    def close(self):
+        self.file.close()
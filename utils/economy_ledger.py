@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from utils.economy_journal import EconomyJournal
+from utils.economy_store import EconomyStore, default_user, get_economy_store
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientFunds(Exception):
+    """Raised when a change would leave a wallet below zero."""
+
+    def __init__(self, user_id: int, wallet: int, amount: int):
+        super().__init__(f"user {user_id} has {wallet}, needs {amount}")
+        self.user_id = user_id
+        self.wallet = wallet
+        self.amount = amount
+
+
+class Ledger:
+    """Wallet mutations that cannot lose updates or mint money.
+
+    Every user has an ``asyncio.Lock``; commands hold the locks of the users
+    they touch while they read and write, so commands for different users
+    run in parallel and commands for the same user serialize. ``apply`` only
+    ever adds deltas to the current stored balance and refuses any change
+    that would take a wallet below zero.
+
+    Every change is also appended to the ``EconomyJournal`` so balances can
+    be audited, queried per user and rebuilt for any point in time. Row
+    snapshots for the journal are read from a pinned SQLite read
+    transaction and written in an executor, never on the event loop.
+    """
+
+    def __init__(self, store: EconomyStore, journal: EconomyJournal):
+        self.store = store
+        self.journal = journal
+        self.snapshot_task: Optional[asyncio.Future] = None
+        if not journal.snapshots:
+            # Baseline for balances that predate the journal.
+            self.start_snapshot()
+        self._locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _lock_for(self, user_id: int) -> asyncio.Lock:
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[user_id] = lock
+        return lock
+
+    @asynccontextmanager
+    async def lock(self, *user_ids: int):
+        """Hold the locks of ``user_ids`` (always taken in id order)."""
+        locks = [self._lock_for(user_id) for user_id in sorted(set(user_ids))]
+        acquired = []
+        try:
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def apply(self, deltas: Dict[int, int], reason: str, fields: Optional[Dict[int, dict]] = None) -> Dict[int, int]:
+        """Add ``deltas`` to wallets, set ``fields``, and journal both.
+
+        Callers must hold the locks of every user involved. Returns the new
+        wallet of each user in ``deltas``.
+        """
+        fields = fields or {}
+        changes = {}
+        balances = {}
+        for user_id, delta in deltas.items():
+            wallet = self.store.get_user(user_id)['wallet']
+            if wallet + delta < 0:
+                raise InsufficientFunds(user_id, wallet, -delta)
+            balances[user_id] = wallet + delta
+            changes[user_id] = {**fields.get(user_id, {}), 'wallet': wallet + delta}
+        for user_id, extra in fields.items():
+            changes.setdefault(user_id, dict(extra))
+
+        self.store.update_users(changes)
+
+        tx_id = uuid.uuid4().hex[:12]
+        entries = []
+        for user_id in changes:
+            entry = {'tx': tx_id, 'user': user_id, 'kind': reason}
+            if deltas.get(user_id):
+                entry['wallet'] = deltas[user_id]
+            if fields.get(user_id):
+                entry['set'] = fields[user_id]
+            entries.append(entry)
+        self.journal.append(entries)
+        if self.journal.needs_rotation and self.snapshot_task is None:
+            self.journal.seal()
+            self.start_snapshot()
+        return balances
+
+    def start_snapshot(self, ts: Optional[float] = None):
+        """Snapshot every row at the current journal sequence.
+
+        The rows are pinned here, on the loop, with no await between the
+        last journal append and the read; the gzip write then runs in an
+        executor. Without a running loop (startup) it is written inline.
+        ``ts`` defaults to the time of the latest journal entry.
+        """
+        seq = self.journal.last_seq
+        if ts is None:
+            ts = self.journal.last_ts
+        rows = self.store.snapshot()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.journal.snapshot(rows, seq, ts)
+            return
+        self.snapshot_task = loop.run_in_executor(None, self.journal.snapshot, rows, seq, ts)
+        self.snapshot_task.add_done_callback(self._snapshot_done)
+
+    def _snapshot_done(self, future: asyncio.Future):
+        self.snapshot_task = None
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Economy journal snapshot failed: {future.exception()}")
+
+    def history(self, user_id: int, limit: int = 10) -> List[dict]:
+        return self.journal.history(user_id, limit)
+
+    async def restore(self, until: float) -> int:
+        """Reset every row to its state at unix time ``until``.
+
+        Users created after ``until`` are reset to a fresh row. The restored
+        state becomes a new snapshot, so later folds start from it. Returns
+        the number of rows written. Raises ``JournalRangeError`` without
+        touching any row if ``until`` is before the oldest snapshot.
+        """
+        current = self.store.snapshot()
+
+        def rebuild() -> Dict[int, dict]:
+            rows = self.journal.fold(until)
+            for user in current:
+                rows.setdefault(user['user_id'], default_user(user['user_id']))
+            return rows
+
+        rows = await asyncio.get_running_loop().run_in_executor(None, rebuild)
+        # Writes go through the store (and its cache) on the loop.
+        self.store.insert_users(rows.values())
+        # The restore is not journaled, so it must become a snapshot, current
+        # from now on rather than from the last entry.
+        while self.snapshot_task is not None:
+            await asyncio.wait([self.snapshot_task])
+        self.start_snapshot(time.time())
+        return len(rows)
+
+    async def credit(self, user_id: int, amount: int, reason: str) -> int:
+        async with self.lock(user_id):
+            return self.apply({user_id: amount}, reason)[user_id]
+
+    async def debit(self, user_id: int, amount: int, reason: str) -> int:
+        async with self.lock(user_id):
+            return self.apply({user_id: -amount}, reason)[user_id]
+
+    async def transfer(self, sender_id: int, receiver_id: int, amount: int, reason: str = "transfer") -> Dict[int, int]:
+        if sender_id == receiver_id:
+            raise ValueError("cannot transfer to the same user")
+        async with self.lock(sender_id, receiver_id):
+            return self.apply({sender_id: -amount, receiver_id: amount}, reason)
+
+
+def get_ledger(bot) -> Ledger:
+    """Return the ledger shared by every cog, creating it on first use."""
+    ledger = getattr(bot, "economy_ledger", None)
+    if ledger is None:
+        ledger = Ledger(get_economy_store(bot), EconomyJournal("database/economy_journal"))
+        bot.economy_ledger = ledger
+    return ledger
@@ -0,0 +1,160 @@
+"""Monte Carlo simulator for fishing, !gamble and !slots economics.
+
+Usage: python -m utils.economy_sim [--luck 5] [--hours 200]
+                                   [--population 1000] [--bet 100]
+
+Samples are drawn in NumPy batches from the same tables the cogs use
+(``LOOT_TABLE`` and ``utils/gambling_data.py``), so tuning ``fish_data.py``
+and re-running this shows the effect before it reaches players.
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from utils.fish_data import FISHING_COOLDOWN_PER, FISHING_COOLDOWN_RATE
+from utils.gambling_data import gamble_win_chance, slot_payouts, slot_symbols
+from utils.loot_table import LOOT_TABLE, SPECIAL_EVENT_CHANCE, AliasSampler, LootTable
+
+MAX_CASTS_PER_HOUR = FISHING_COOLDOWN_RATE * 3600 // FISHING_COOLDOWN_PER
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+BATCH_SIZE = 1_000_000
+
+
+@dataclass
+class Summary:
+    name: str
+    samples: int
+    mean: float
+    variance: float
+    percentiles: Dict[int, float]
+
+    @classmethod
+    def of(cls, name: str, values: np.ndarray) -> "Summary":
+        return cls(
+            name=name,
+            samples=len(values),
+            mean=float(values.mean()),
+            variance=float(values.var()),
+            percentiles=dict(zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist()))
+        )
+
+    def format(self) -> str:
+        spread = " ".join(f"p{p}={value:,.0f}" for p, value in self.percentiles.items())
+        return (f"{self.name}: EV {self.mean:,.2f} | SD {self.variance ** 0.5:,.2f} "
+                f"| n={self.samples:,}\n  {spread}")
+
+
+def _alias_arrays(sampler: AliasSampler):
+    return np.asarray(sampler.prob), np.asarray(sampler.alias)
+
+
+def _draw(rng: np.random.Generator, prob: np.ndarray, alias: np.ndarray, n: int) -> np.ndarray:
+    column = rng.integers(0, len(prob), n)
+    return np.where(rng.random(n) < prob[column], column, alias[column])
+
+
+class FishingSimulator:
+    """Vectorized version of ``LootTable.cast`` for one luck level."""
+
+    def __init__(self, table: LootTable, luck_level: int):
+        sampler = table.fish_sampler(luck_level)
+        self.fish_prob, self.fish_alias = _alias_arrays(sampler)
+        self.min_price = np.array([fish.min_price for fish in sampler.outcomes])
+        self.max_price = np.array([fish.max_price for fish in sampler.outcomes])
+
+        self.mod_prob, self.mod_alias = _alias_arrays(table.modifier_sampler)
+        self.mod_multiplier = np.array([
+            modifier.multiplier if modifier else 1.0 for modifier in table.modifier_sampler.outcomes
+        ])
+
+        self.event_multiplier = np.array([event.multiplier for event in table.special_events])
+        self.event_bonus = np.array([event.bonus for event in table.special_events])
+
+    def cast(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Coins earned by ``n`` independent casts."""
+        fish = _draw(rng, self.fish_prob, self.fish_alias, n)
+        value = rng.integers(self.min_price[fish], self.max_price[fish] + 1)
+
+        modifier = _draw(rng, self.mod_prob, self.mod_alias, n)
+        value = np.floor(value * self.mod_multiplier[modifier])
+
+        event_hit = rng.random(n) < SPECIAL_EVENT_CHANCE
+        event = rng.integers(0, len(self.event_bonus), n)
+        value = np.where(event_hit, value * self.event_multiplier[event] + self.event_bonus[event], value)
+        return value.astype(np.int64)
+
+
+def simulate_gamble(rng: np.random.Generator, n: int, bet: int) -> np.ndarray:
+    """Net change in wallet for ``n`` !gamble bets of ``bet`` coins."""
+    return np.where(rng.random(n) < gamble_win_chance, bet, -bet)
+
+
+def simulate_slots(rng: np.random.Generator, n: int, bet: int) -> np.ndarray:
+    """Net change in wallet for ``n`` !slots spins of ``bet`` coins."""
+    reels = rng.integers(0, len(slot_symbols), (n, 3))
+    first, second, third = reels[:, 0], reels[:, 1], reels[:, 2]
+    jackpot = (first == second) & (second == third)
+    pair = ~jackpot & ((first == second) | (second == third) | (first == third))
+    return np.select([jackpot, pair], [bet * slot_payouts[3], bet * slot_payouts[2]], -bet)
+
+
+def _batched(draw, n: int) -> np.ndarray:
+    return np.concatenate([draw(min(BATCH_SIZE, n - start)) for start in range(0, n, BATCH_SIZE)])
+
+
+def run_simulation(luck: int = 5, hours: int = 200,
+                   casts_per_hour: int = MAX_CASTS_PER_HOUR, bet: int = 100,
+                   bets: int = 1_000_000, population: int = 1000,
+                   active_hours_per_day: float = 1.0, seed=None) -> List[str]:
+    """Run every simulation and return the report as lines of text."""
+    rng = np.random.default_rng(seed)
+    fishing = FishingSimulator(LOOT_TABLE, luck)
+
+    casts = _batched(lambda n: fishing.cast(rng, n), hours * casts_per_hour)
+    per_hour = casts[:hours * casts_per_hour].reshape(hours, casts_per_hour).sum(axis=1)
+    gamble = _batched(lambda n: simulate_gamble(rng, n, bet), bets)
+    slots = _batched(lambda n: simulate_slots(rng, n, bet), bets)
+
+    cast_summary = Summary.of("Fishing (per cast)", casts)
+    hour_summary = Summary.of(f"Fishing (per hour, {casts_per_hour:,} casts)", per_hour)
+    daily_inflation = hour_summary.mean * active_hours_per_day * population
+
+    return [
+        f"Rod: luck {luck}",
+        cast_summary.format(),
+        hour_summary.format(),
+        Summary.of(f"Gamble (bet {bet:,})", gamble).format(),
+        Summary.of(f"Slots (bet {bet:,})", slots).format(),
+        f"Inflation: {daily_inflation:,.0f} coins/day from {population:,} players "
+        f"fishing {active_hours_per_day:g}h/day",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--luck", type=int, default=5)
+    parser.add_argument("--hours", type=int, default=200, help="simulated hours of non-stop fishing")
+    parser.add_argument("--casts-per-hour", type=int, default=MAX_CASTS_PER_HOUR)
+    parser.add_argument("--bet", type=int, default=100)
+    parser.add_argument("--bets", type=int, default=1_000_000, help="gambles and slot spins to simulate")
+    parser.add_argument("--population", type=int, default=1000)
+    parser.add_argument("--active-hours", type=float, default=1.0, help="fishing hours per player per day")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    print("\n".join(run_simulation(
+        luck=args.luck,
+        hours=args.hours,
+        casts_per_hour=args.casts_per_hour,
+        bet=args.bet,
+        bets=args.bets,
+        population=args.population,
+        active_hours_per_day=args.active_hours,
+        seed=args.seed
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from utils.config import ECONOMY_CACHE_SIZE, ECONOMY_FLUSH_INTERVAL, ECONOMY_FLUSH_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Columns stored as JSON text; everything else is a plain scalar column.
+JSON_FIELDS = ("inventory", "fishing_stats", "rod_enchantments")
+
+
+def default_user(user_id: int) -> dict:
+    """Fresh economy row shared by the economy and fishing cogs."""
+    return {
+        'user_id': user_id,
+        'wallet': 0,
+        'bank': 0,
+        'bank_capacity': 1000,
+        'last_daily': 0,
+        'last_work': 0,
+        'inventory': {},
+        'fishing_stats': {
+            'total_caught': 0,
+            'best_catch': None,
+            'best_earnings': 0
+        },
+        'rod_enchantments': {
+            'luck': 0,
+            'fortune': 0,
+            'efficiency': 0
+        }
+    }
+
+
+def normalize_inventory(inventory) -> Dict[str, int]:
+    """Turn the old append-only item list into an ``{item_id: count}`` map."""
+    if isinstance(inventory, dict):
+        return inventory
+    counts: Dict[str, int] = {}
+    for item_id in inventory or []:
+        counts[item_id] = counts.get(item_id, 0) + 1
+    return counts
+
+
+def has_item(user: dict, item_id: str) -> bool:
+    return user['inventory'].get(item_id, 0) > 0
+
+
+class EconomyStore(ABC):
+    """Interface every economy backend implements."""
+
+    def __init__(self):
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """Call ``callback(user_id, fields)`` after every row change."""
+        self.listeners.append(callback)
+
+    def notify(self, changes: Dict[int, dict]):
+        for callback in self.listeners:
+            for user_id, fields in changes.items():
+                callback(user_id, fields)
+
+    @abstractmethod
+    def get_user(self, user_id: int) -> dict:
+        """Return a copy of the user's row, creating it if missing."""
+
+    @abstractmethod
+    def update_user(self, user_id: int, fields: dict):
+        """Overwrite the given fields of one user's row."""
+
+    @abstractmethod
+    def update_users(self, changes: Dict[int, dict]):
+        """Apply ``{user_id: fields}`` to several rows atomically."""
+
+    @abstractmethod
+    def all_users(self) -> Iterator[dict]:
+        """Every stored row."""
+
+    def snapshot(self) -> Iterator[dict]:
+        """Every row as of this call, safe to iterate from another thread."""
+        return iter(list(self.all_users()))
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored users."""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteEconomyStore(EconomyStore):
+    """Economy rows in SQLite (WAL mode), indexed by user_id."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        super().__init__()
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.setup_database()
+
+    def setup_database(self):
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                wallet INTEGER NOT NULL DEFAULT 0,
+                bank INTEGER NOT NULL DEFAULT 0,
+                bank_capacity INTEGER NOT NULL DEFAULT 1000,
+                last_daily REAL NOT NULL DEFAULT 0,
+                last_work REAL NOT NULL DEFAULT 0,
+                inventory TEXT,
+                fishing_stats TEXT,
+                rod_enchantments TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def _row_to_dict(self, row: sqlite3.Row) -> dict:
+        data = dict(row)
+        defaults = default_user(data['user_id'])
+        for field in JSON_FIELDS:
+            data[field] = json.loads(data[field]) if data[field] else defaults[field]
+        data['inventory'] = normalize_inventory(data['inventory'])
+        return data
+
+    def _encode(self, field: str, value):
+        return json.dumps(value, ensure_ascii=False) if field in JSON_FIELDS else value
+
+    def _fetch(self, user_id: int) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT * FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get_user(self, user_id: int) -> dict:
+        user = self._fetch(user_id)
+        if user is None:
+            user = default_user(user_id)
+            self.insert_users([user])
+        return user
+
+    def insert_users(self, users):
+        """Insert (or replace) whole rows in a single transaction."""
+        users = [{**default_user(user['user_id']), **user} for user in users]
+        for user in users:
+            user['inventory'] = normalize_inventory(user['inventory'])
+        columns = ["user_id", "wallet", "bank", "bank_capacity", "last_daily", "last_work", *JSON_FIELDS]
+        placeholders = ", ".join("?" for _ in columns)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO users ({', '.join(columns)}) VALUES ({placeholders})",
+                (
+                    tuple(self._encode(col, user[col]) for col in columns)
+                    for user in users
+                )
+            )
+        self.notify({user['user_id']: user for user in users})
+
+    def update_user(self, user_id: int, fields: dict):
+        self.update_users({user_id: fields})
+
+    def update_users(self, changes: Dict[int, dict]):
+        with self.conn:
+            for user_id, fields in changes.items():
+                fields = {key: value for key, value in fields.items() if key != 'user_id'}
+                if not fields:
+                    continue
+                self.conn.execute("INSERT OR IGNORE INTO users (user_id) VALUES (?)", (user_id,))
+                assignments = ", ".join(f"{key} = ?" for key in fields)
+                self.conn.execute(
+                    f"UPDATE users SET {assignments} WHERE user_id = ?",
+                    (*(self._encode(key, value) for key, value in fields.items()), user_id)
+                )
+        self.notify(changes)
+
+    def migrate_inventories(self) -> int:
+        """Rewrite every list-shaped inventory as a counted map, once."""
+        rows = self.conn.execute(
+            "SELECT user_id, inventory FROM users WHERE inventory LIKE '[%'"
+        ).fetchall()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE users SET inventory = ? WHERE user_id = ?",
+                (
+                    (self._encode('inventory', normalize_inventory(json.loads(row['inventory']))), row['user_id'])
+                    for row in rows
+                )
+            )
+        return len(rows)
+
+    def all_users(self) -> Iterator[dict]:
+        for row in self.conn.execute("SELECT * FROM users"):
+            yield self._row_to_dict(row)
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def snapshot(self) -> Iterator[dict]:
+        # A second connection, so the rows can be read in an executor. In
+        # WAL mode its read transaction sees the table as of the first
+        # step of the SELECT, which execute() takes before returning;
+        # later commits on self.conn are invisible to it.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("BEGIN")
+        cursor = conn.execute("SELECT * FROM users")
+
+        def rows():
+            try:
+                for row in cursor:
+                    yield self._row_to_dict(row)
+            finally:
+                conn.close()
+        return rows()
+
+    def close(self):
+        self.conn.close()
+
+
+class CachedEconomyStore(EconomyStore):
+    """Write-back cache in front of another store.
+
+    Reads are served from memory after the first load. Writes only update
+    the cached row and mark it dirty; dirty rows are written to the backend
+    in one transaction every ``flush_interval`` seconds, as soon as
+    ``flush_threshold`` rows are dirty, or when ``flush()`` is called.
+    Clean rows beyond ``max_rows`` are evicted least-recently-used first.
+    """
+
+    def __init__(self, backend: EconomyStore, flush_interval: float = 5.0,
+                 flush_threshold: int = 500, max_rows: int = 50000):
+        super().__init__()
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_rows = max_rows
+        self.rows: "OrderedDict[int, dict]" = OrderedDict()
+        self.dirty: Dict[int, dict] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self.flush_time_last = 0.0
+
+    @staticmethod
+    def _copy(row: dict) -> dict:
+        copied = dict(row)
+        for field in JSON_FIELDS:
+            copied[field] = copied[field].copy()
+        return copied
+
+    def _load(self, user_id: int) -> dict:
+        row = self.rows.get(user_id)
+        if row is not None:
+            self.hits += 1
+            self.rows.move_to_end(user_id)
+            return row
+
+        self.misses += 1
+        row = self.backend.get_user(user_id)
+        self.rows[user_id] = row
+        self._evict()
+        return row
+
+    def _evict(self):
+        if len(self.rows) <= self.max_rows:
+            return
+        for user_id in list(self.rows):
+            if len(self.rows) <= self.max_rows:
+                break
+            if user_id not in self.dirty:
+                del self.rows[user_id]
+
+    def get_user(self, user_id: int) -> dict:
+        return self._copy(self._load(user_id))
+
+    def update_users(self, changes: Dict[int, dict]):
+        for user_id, fields in changes.items():
+            fields = {key: value for key, value in fields.items() if key != 'user_id'}
+            self._load(user_id).update(fields)
+            self.dirty.setdefault(user_id, {}).update(fields)
+        self.notify(changes)
+
+        if len(self.dirty) >= self.flush_threshold:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def update_user(self, user_id: int, fields: dict):
+        self.update_users({user_id: fields})
+
+    def insert_users(self, users):
+        users = list(users)
+        self.backend.insert_users(users)
+        for user in users:
+            self.rows.pop(user['user_id'], None)
+            self.dirty.pop(user['user_id'], None)
+        self.notify({user['user_id']: user for user in users})
+
+    def _schedule_flush(self):
+        if self._flush_handle is not None or not self.dirty:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_handle = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self):
+        """Write every dirty row to the backend in one transaction."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self.dirty:
+            return
+
+        dirty, self.dirty = self.dirty, {}
+        start = time.perf_counter()
+        try:
+            self.backend.update_users(dirty)
+        except Exception:
+            # Keep the rows dirty so the next flush retries them.
+            for user_id, fields in dirty.items():
+                self.dirty[user_id] = {**fields, **self.dirty.get(user_id, {})}
+            self._schedule_flush()
+            raise
+        elapsed = time.perf_counter() - start
+
+        self.flushes += 1
+        self.rows_flushed += len(dirty)
+        self.flush_time_last = elapsed
+        self.flush_time_total += elapsed
+        self.flush_time_max = max(self.flush_time_max, elapsed)
+        self._evict()
+
+    def all_users(self) -> Iterator[dict]:
+        self.flush()
+        return self.backend.all_users()
+
+    def count(self) -> int:
+        self.flush()
+        return self.backend.count()
+
+    def snapshot(self) -> Iterator[dict]:
+        self.flush()
+        return self.backend.snapshot()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'cached_rows': len(self.rows),
+            'dirty_rows': len(self.dirty),
+            'flushes': self.flushes,
+            'rows_flushed': self.rows_flushed,
+            'flush_ms_last': self.flush_time_last * 1000,
+            'flush_ms_avg': self.flush_time_total / self.flushes * 1000 if self.flushes else 0.0,
+            'flush_ms_max': self.flush_time_max * 1000,
+        }
+
+    def close(self):
+        self.flush()
+        self.backend.close()
+
+
+def migrate_tinydb_json(store: EconomyStore, json_path: Union[str, Path]) -> int:
+    """One-shot import of a TinyDB economy.json file into ``store``.
+
+    The TinyDB file is renamed to ``*.migrated`` afterwards so the import
+    never runs twice. Returns the number of imported users.
+    """
+    json_path = Path(json_path)
+    if not json_path.exists():
+        return 0
+
+    with json_path.open('r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    # TinyDB layout: {"_default": {"1": {...}, "2": {...}}}. Both cogs used
+    # the same file, so a user may appear more than once; later docs win.
+    merged: Dict[int, dict] = {}
+    for table in raw.values():
+        for doc in table.values():
+            if 'user_id' not in doc:
+                continue
+            merged.setdefault(int(doc['user_id']), {}).update(doc)
+
+    store.insert_users(merged.values())
+    os.replace(json_path, json_path.with_name(json_path.name + ".migrated"))
+    return len(merged)
+
+
+def get_economy_store(bot) -> EconomyStore:
+    """Return the economy store shared by every cog, opening it on first use."""
+    store = getattr(bot, "economy_store", None)
+    if store is None:
+        backend = SQLiteEconomyStore("database/economy.db")
+        migrated = migrate_tinydb_json(backend, "database/economy.json")
+        if migrated:
+            logger.info(f"Migrated {migrated} users from economy.json")
+        migrated = backend.migrate_inventories()
+        if migrated:
+            logger.info(f"Converted {migrated} inventories to item counts")
+        store = CachedEconomyStore(
+            backend,
+            flush_interval=ECONOMY_FLUSH_INTERVAL,
+            flush_threshold=ECONOMY_FLUSH_THRESHOLD,
+            max_rows=ECONOMY_CACHE_SIZE
+        )
+        # Last-chance flush when the process exits (bot.run returning, Ctrl+C).
+        atexit.register(store.flush)
+        bot.economy_store = store
+    return store
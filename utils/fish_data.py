@@ -85,16 +85,52 @@ modifiers = {
 }
 
 # Special events that can occur while fishing
+# multiplier scales the catch value, bonus is a flat amount of extra coins
 special_events = [
-    "You found a treasure chest! Extra 500 coins! 💎",
-    "A friendly dolphin helped you fish! Double earnings! 🐬",
-    "You caught two fish at once! Double earnings! 🎣",
-    "A mermaid blessed your fishing rod! Triple earnings! 🧜‍♀️",
-    "The fish was wearing tiny glasses! Extra 200 coins! 👓",
-    "This fish knows how to dance! Extra 300 coins! 💃",
-    "You found a message in a bottle! Extra 100 coins! 📜",
-    "An ancient artifact washed up! Extra 1000 coins! ⚱️",
-    "A rare pearl was hidden in the fish! Extra 500 coins! 🦪",
-    "A pirate ghost appeared and shared treasure! Double earnings! 🏴‍☠️"
+    {'text': "You found a treasure chest! Extra 500 coins! 💎", 'bonus': 500},
+    {'text': "A friendly dolphin helped you fish! Double earnings! 🐬", 'multiplier': 2},
+    {'text': "You caught two fish at once! Double earnings! 🎣", 'multiplier': 2},
+    {'text': "A mermaid blessed your fishing rod! Triple earnings! 🧜‍♀️", 'multiplier': 3},
+    {'text': "The fish was wearing tiny glasses! Extra 200 coins! 👓", 'bonus': 200},
+    {'text': "This fish knows how to dance! Extra 300 coins! 💃", 'bonus': 300},
+    {'text': "You found a message in a bottle! Extra 100 coins! 📜", 'bonus': 100},
+    {'text': "An ancient artifact washed up! Extra 1000 coins! ⚱️", 'bonus': 1000},
+    {'text': "A rare pearl was hidden in the fish! Extra 500 coins! 🦪", 'bonus': 500},
+    {'text': "A pirate ghost appeared and shared treasure! Double earnings! 🏴‍☠️", 'multiplier': 2}
 ]
 
+# !fish cooldown: FISHING_COOLDOWN_RATE casts per FISHING_COOLDOWN_PER seconds
+FISHING_COOLDOWN_RATE = 5
+FISHING_COOLDOWN_PER = 3
+
+# !fish x N: most casts one bulk command may make (efficiency raises it)
+BULK_FISHING_MAX = 20
+
+# Rod enchantments: luck boosts the weight of boosted_tiers, efficiency
+# shortens the fishing cooldown. Fortune can be bought but has never
+# changed catch values; value_multiplier_per_level is not applied yet.
+ENCHANTMENTS = {
+    'luck': {
+        'name': 'Luck',
+        'description': 'Increases chance of better tier fish',
+        'max_level': 5,
+        'base_cost': 10000,
+        'tier_boost_per_level': 0.05,
+        'boosted_tiers': ['rare', 'epic', 'legendary']
+    },
+    'fortune': {
+        'name': 'Fortune',
+        'description': 'Increases fish value',
+        'max_level': 5,
+        'base_cost': 15000,
+        'value_multiplier_per_level': 0.1
+    },
+    'efficiency': {
+        'name': 'Efficiency',
+        'description': 'Reduces fishing cooldown',
+        'max_level': 3,
+        'base_cost': 20000,
+        'cooldown_reduction_per_level': 0.2,
+        'bulk_casts_per_level': 10
+    }
+}
@@ -0,0 +1,11 @@
+# gambling_data.py
+
+# !gamble: chance to double the bet
+gamble_win_chance = 0.45
+
+# !slots: three reels, payout multiplier by how many reels match
+slot_symbols = ["🍎", "🍊", "🍇", "🍒", "💎", "7️⃣"]
+slot_payouts = {
+    3: 5,  # jackpot
+    2: 2,  # two of a kind
+}
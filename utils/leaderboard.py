@@ -0,0 +1,92 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from utils.economy_store import EconomyStore, get_economy_store
+
+
+class LeaderboardIndex:
+    """Users ranked by ``wallet + bank``, kept current on every store write.
+
+    Entries are stored as ``(-total, user_id)`` so the richest user sorts
+    first and ties are broken by id. Updates are O(log n) and reading a page
+    is O(log n + page size), so ``!lb`` never scans the whole table.
+    """
+
+    def __init__(self):
+        self.balances: Dict[int, Tuple[int, int]] = {}
+        self.ranking = SortedList()
+
+    def __len__(self):
+        return len(self.ranking)
+
+    def __contains__(self, user_id: int):
+        return user_id in self.balances
+
+    def total(self, user_id: int) -> int:
+        wallet, bank = self.balances.get(user_id, (0, 0))
+        return wallet + bank
+
+    def update(self, user_id: int, fields: dict):
+        if 'wallet' not in fields and 'bank' not in fields and user_id in self.balances:
+            return
+        wallet, bank = self.balances.get(user_id, (0, 0))
+        wallet = fields.get('wallet', wallet)
+        bank = fields.get('bank', bank)
+
+        if user_id in self.balances:
+            self.ranking.remove((-self.total(user_id), user_id))
+        self.balances[user_id] = (wallet, bank)
+        self.ranking.add((-(wallet + bank), user_id))
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based global rank of ``user_id``."""
+        if user_id not in self.balances:
+            return None
+        return self.ranking.index((-self.total(user_id), user_id)) + 1
+
+    def page(self, page: int, per_page: int = 10,
+             member_filter: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, int, int]]:
+        """Return ``(rank, user_id, total)`` rows for a 1-based page.
+
+        With ``member_filter`` only matching users are ranked, which is how
+        per-guild leaderboards are built from the global index.
+        """
+        start = (page - 1) * per_page
+        if member_filter is None:
+            return [
+                (start + offset + 1, user_id, -negative_total)
+                for offset, (negative_total, user_id) in enumerate(self.ranking[start:start + per_page])
+            ]
+
+        rows = []
+        rank = 0
+        for negative_total, user_id in self.ranking:
+            if not member_filter(user_id):
+                continue
+            rank += 1
+            if rank > start:
+                rows.append((rank, user_id, -negative_total))
+                if len(rows) == per_page:
+                    break
+        return rows
+
+    def page_count(self, per_page: int = 10) -> int:
+        return max(1, -(-len(self.ranking) // per_page))
+
+
+def build_leaderboard(store: EconomyStore) -> LeaderboardIndex:
+    index = LeaderboardIndex()
+    for user in store.all_users():
+        index.update(user['user_id'], user)
+    store.add_listener(index.update)
+    return index
+
+
+def get_leaderboard(bot) -> LeaderboardIndex:
+    """Return the shared leaderboard index, building it from the store once."""
+    index = getattr(bot, "economy_leaderboard", None)
+    if index is None:
+        index = build_leaderboard(get_economy_store(bot))
+        bot.economy_leaderboard = index
+    return index
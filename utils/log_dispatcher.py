@@ -0,0 +1,174 @@
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Deque, Dict, Optional, Tuple
+
+import nextcord
+
+logger = logging.getLogger(__name__)
+
+EMBEDS_PER_MESSAGE = 10
+WEBHOOK_NAME = "Mod Log"
+
+
+class ChannelBuffer:
+    __slots__ = ("channel", "pending", "dropped", "timer", "task", "webhook", "use_webhook")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.pending: Deque[Tuple[str, nextcord.Embed]] = deque()
+        self.dropped: Counter = Counter()
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+        self.webhook: Optional[nextcord.Webhook] = None
+        self.use_webhook = True
+
+
+class LogDispatcher:
+    """Coalesces log embeds per log channel into messages of up to 10 embeds.
+
+    A buffer is flushed ``flush_delay`` seconds after its first embed, or
+    straight away once it holds a full message. Each channel has at most one
+    flush running, so a raid turns into a few large messages instead of
+    hundreds of single-embed sends fighting the 5/5s channel limit.
+
+    Buffers hold at most ``max_pending`` embeds; past that new events are
+    dropped and counted per log type, and the last message of the burst ends with a
+    summary such as "+340 more voice state events".
+
+    Messages go through a channel webhook when the bot can manage webhooks,
+    which has its own rate limit bucket, and through the channel otherwise.
+    A message that fails with a transient HTTP error goes back to the front
+    of its buffer and is retried once after ``retry_delay`` seconds.
+    """
+
+    def __init__(self, bot, flush_delay: float = 2.0, max_pending: int = 200, retry_delay: float = 5.0):
+        self.bot = bot
+        self.flush_delay = flush_delay
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+        self.buffers: Dict[int, ChannelBuffer] = {}
+
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.embeds_dropped = 0
+        self.send_failures = 0
+
+    def submit(self, channel, embed: nextcord.Embed, log_type: str):
+        buffer = self.buffers.get(channel.id)
+        if buffer is None:
+            buffer = self.buffers[channel.id] = ChannelBuffer(channel)
+        buffer.channel = channel
+
+        if len(buffer.pending) >= self.max_pending:
+            buffer.dropped[log_type] += 1
+            self.embeds_dropped += 1
+        else:
+            buffer.pending.append((log_type, embed))
+
+        if len(buffer.pending) >= EMBEDS_PER_MESSAGE:
+            self._start_flush(buffer)
+        elif buffer.timer is None and (buffer.task is None or buffer.task.done()):
+            buffer.timer = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush, buffer)
+
+    def _start_flush(self, buffer: ChannelBuffer):
+        if buffer.timer is not None:
+            buffer.timer.cancel()
+            buffer.timer = None
+        if buffer.task is None or buffer.task.done():
+            buffer.task = asyncio.create_task(self._flush(buffer))
+
+    def flush_all(self):
+        """Start sending every buffered embed now instead of waiting for timers."""
+        for buffer in self.buffers.values():
+            if buffer.pending or buffer.dropped:
+                self._start_flush(buffer)
+
+    @staticmethod
+    def _summary(dropped: Counter) -> nextcord.Embed:
+        lines = [f"+{count} more {log_type.replace('_', ' ')} events" for log_type, count in dropped.most_common()]
+        return nextcord.Embed(
+            title="⚠️ Log Rate Limited",
+            description="\n".join(lines)[:4096],
+            color=0xffa500
+        )
+
+    async def _get_webhook(self, buffer: ChannelBuffer) -> Optional[nextcord.Webhook]:
+        if buffer.webhook is not None or not buffer.use_webhook:
+            return buffer.webhook
+        channel = buffer.channel
+        if not channel.permissions_for(channel.guild.me).manage_webhooks:
+            buffer.use_webhook = False
+            return None
+        try:
+            webhooks = await channel.webhooks()
+            buffer.webhook = next((hook for hook in webhooks if hook.name == WEBHOOK_NAME and hook.token), None)
+            if buffer.webhook is None:
+                buffer.webhook = await channel.create_webhook(name=WEBHOOK_NAME)
+        except nextcord.HTTPException as e:
+            logger.warning(f"Falling back to channel sends for log channel {channel.id}: {e}")
+            buffer.use_webhook = False
+        return buffer.webhook
+
+    async def _send(self, buffer: ChannelBuffer, embeds):
+        webhook = await self._get_webhook(buffer)
+        if webhook is not None:
+            try:
+                await webhook.send(embeds=embeds, username=self.bot.user.name,
+                                   avatar_url=self.bot.user.display_avatar.url)
+                return
+            except (nextcord.NotFound, nextcord.Forbidden):
+                # Webhook deleted or permission revoked; fetch or skip it next time.
+                buffer.webhook = None
+        await buffer.channel.send(embeds=embeds)
+
+    async def _flush(self, buffer: ChannelBuffer):
+        buffer.timer = None
+        retried = False
+        while buffer.pending or buffer.dropped:
+            batch = [buffer.pending.popleft() for _ in range(min(EMBEDS_PER_MESSAGE, len(buffer.pending)))]
+            embeds = [embed for _, embed in batch]
+            dropped = None
+            # The drop summary rides on the last message of the burst.
+            if buffer.dropped and not buffer.pending and len(embeds) < EMBEDS_PER_MESSAGE:
+                dropped, buffer.dropped = buffer.dropped, Counter()
+                embeds.append(self._summary(dropped))
+            try:
+                await self._send(buffer, embeds)
+                self.messages_sent += 1
+                self.embeds_sent += len(embeds)
+                retried = False
+            except Exception as e:
+                self.send_failures += 1
+                logger.error(f"Failed to send {len(embeds)} log embeds to {buffer.channel.id}: {e}")
+                if isinstance(e, (nextcord.NotFound, nextcord.Forbidden)):
+                    buffer.pending.clear()
+                    buffer.dropped = Counter()
+                elif isinstance(e, nextcord.HTTPException) and not retried:
+                    buffer.pending.extendleft(reversed(batch))
+                    if dropped:
+                        buffer.dropped.update(dropped)
+                    retried = True
+                    await asyncio.sleep(self.retry_delay)
+
+    def stats(self) -> dict:
+        depths = {channel_id: len(buffer.pending) for channel_id, buffer in self.buffers.items()}
+        return {
+            'channels': len(self.buffers),
+            'queued': sum(depths.values()),
+            'max_depth': max(depths.values(), default=0),
+            'deepest_channel': max(depths, key=depths.get) if depths else None,
+            'messages_sent': self.messages_sent,
+            'embeds_sent': self.embeds_sent,
+            'embeds_dropped': self.embeds_dropped,
+            'send_failures': self.send_failures,
+        }
+
+
+def get_log_dispatcher(bot) -> LogDispatcher:
+    """Return the dispatcher shared by the logging cogs."""
+    dispatcher = getattr(bot, "log_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = LogDispatcher(bot)
+        bot.log_dispatcher = dispatcher
+    return dispatcher
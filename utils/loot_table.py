@@ -0,0 +1,168 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.fish_data import ENCHANTMENTS, fish_data, modifiers, special_events, tiers
+
+FALLBACK_FISH = "🐟 Small Fish"
+SPECIAL_EVENT_CHANCE = 0.10
+
+
+@dataclass(frozen=True)
+class Fish:
+    name: str
+    min_price: int
+    max_price: int
+    tier: str
+
+
+@dataclass(frozen=True)
+class Modifier:
+    name: str
+    chance: float
+    multiplier: float
+    prefix: str
+
+    def decorate(self, fish_name: str) -> str:
+        return f"{self.prefix} {fish_name} [{self.name.title()}]"
+
+
+@dataclass(frozen=True)
+class SpecialEvent:
+    text: str
+    multiplier: int = 1
+    bonus: int = 0
+
+
+@dataclass(frozen=True)
+class Catch:
+    """Result of one cast."""
+    fish: Fish
+    name: str
+    value: int
+    modifier: Optional[Modifier] = None
+    event: Optional[SpecialEvent] = None
+
+
+class AliasSampler:
+    """Walker/Vose alias table: O(n) to build, O(1) per draw."""
+
+    __slots__ = ("outcomes", "prob", "alias")
+
+    def __init__(self, outcomes: Sequence, weights: Sequence[float]):
+        total = float(sum(weights))
+        n = len(outcomes)
+        scaled = [weight * n / total for weight in weights]
+        self.outcomes = tuple(outcomes)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+    def sample(self, rng=random):
+        column = int(rng.random() * len(self.outcomes))
+        if rng.random() < self.prob[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.alias[column]]
+
+    def sample_many(self, k: int, rng=random) -> List:
+        outcomes, prob, alias = self.outcomes, self.prob, self.alias
+        n = len(outcomes)
+        draw = rng.random
+        result = []
+        for _ in range(k):
+            column = int(draw() * n)
+            result.append(outcomes[column] if draw() < prob[column] else outcomes[alias[column]])
+        return result
+
+
+class LootTable:
+    """Fishing probabilities compiled once from ``utils/fish_data.py``.
+
+    There is one fish sampler per luck level; each folds the tier roll and
+    the uniform pick inside the tier into a single alias table. Modifiers
+    are tried in declaration order, so their sequential chances are turned
+    into one exact distribution (including "no modifier") up front.
+    """
+
+    def __init__(self, tiers: Dict[str, float], fish_data: Dict[str, tuple],
+                 modifiers: Dict[str, dict], special_events: List[dict],
+                 enchantments: Dict[str, dict]):
+        self.tiers = dict(tiers)
+        self.enchantments = enchantments
+
+        self.tier_fish: Dict[str, Tuple[Fish, ...]] = {tier: () for tier in tiers}
+        for name, (min_price, max_price, tier) in fish_data.items():
+            self.tier_fish[tier] = self.tier_fish.get(tier, ()) + (Fish(name, min_price, max_price, tier),)
+        self.fallback = next(fish for group in self.tier_fish.values() for fish in group if fish.name == FALLBACK_FISH)
+
+        luck = enchantments['luck']
+        self.fish_samplers = [
+            self._build_fish_sampler(1 + luck['tier_boost_per_level'] * level, luck['boosted_tiers'])
+            for level in range(luck['max_level'] + 1)
+        ]
+
+        self.modifiers = tuple(
+            Modifier(name, data['chance'], data['multiplier'], data['prefix'])
+            for name, data in modifiers.items()
+        )
+        outcomes, weights = [], []
+        remaining = 1.0
+        for modifier in self.modifiers:
+            outcomes.append(modifier)
+            weights.append(remaining * modifier.chance)
+            remaining *= 1 - modifier.chance
+        outcomes.append(None)
+        weights.append(remaining)
+        self.modifier_sampler = AliasSampler(outcomes, weights)
+
+        self.special_events = tuple(
+            SpecialEvent(event['text'], event.get('multiplier', 1), event.get('bonus', 0))
+            for event in special_events
+        )
+
+    def _build_fish_sampler(self, boost: float, boosted_tiers: Sequence[str]) -> AliasSampler:
+        outcomes, weights = [], []
+        for tier, chance in self.tiers.items():
+            weight = chance * boost if tier in boosted_tiers else chance
+            group = self.tier_fish.get(tier) or (self.fallback,)
+            for fish in group:
+                outcomes.append(fish)
+                weights.append(weight / len(group))
+        return AliasSampler(outcomes, weights)
+
+    def _finish(self, fish: Fish, rng) -> Catch:
+        value = rng.randint(fish.min_price, fish.max_price)
+        name = fish.name
+
+        modifier = self.modifier_sampler.sample(rng)
+        if modifier is not None:
+            value = int(value * modifier.multiplier)
+            name = modifier.decorate(name)
+
+        event = None
+        if rng.random() < SPECIAL_EVENT_CHANCE:
+            event = rng.choice(self.special_events)
+            value = value * event.multiplier + event.bonus
+
+        return Catch(fish, name, value, modifier, event)
+
+    def fish_sampler(self, luck_level: int) -> AliasSampler:
+        return self.fish_samplers[max(0, min(luck_level, len(self.fish_samplers) - 1))]
+
+    def cast(self, luck_level: int = 0, rng=random) -> Catch:
+        return self._finish(self.fish_sampler(luck_level).sample(rng), rng)
+
+    def cast_many(self, count: int, luck_level: int = 0, rng=random) -> List[Catch]:
+        """``count`` casts with the fish drawn in one batch."""
+        return [self._finish(fish, rng) for fish in self.fish_sampler(luck_level).sample_many(count, rng)]
+
+
+LOOT_TABLE = LootTable(tiers, fish_data, modifiers, special_events, ENCHANTMENTS)
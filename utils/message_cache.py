@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from utils.config import MESSAGE_CACHE_GUILD_BYTES
+
+MAX_CONTENT = 1000
+ENTRY_OVERHEAD = 150
+
+
+class CachedMessage:
+    """What the delete/edit logs need from a message, and nothing else."""
+
+    __slots__ = ("id", "author_id", "channel_id", "content", "attachments", "edited_at")
+
+    def __init__(self, id: int, author_id: int, channel_id: int, content: str,
+                 attachments: Tuple[str, ...] = (), edited_at: Optional[float] = None):
+        self.id = id
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.content = content[:MAX_CONTENT]
+        self.attachments = attachments
+        self.edited_at = edited_at
+
+    @classmethod
+    def from_message(cls, message) -> "CachedMessage":
+        return cls(
+            message.id,
+            message.author.id,
+            message.channel.id,
+            message.content or "",
+            tuple(attachment.url for attachment in message.attachments),
+            message.edited_at.timestamp() if message.edited_at else None
+        )
+
+    @property
+    def size(self) -> int:
+        return ENTRY_OVERHEAD + len(self.content.encode("utf-8")) + sum(len(url) for url in self.attachments)
+
+
+class GuildMessages:
+    __slots__ = ("entries", "bytes")
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, CachedMessage]" = OrderedDict()
+        self.bytes = 0
+
+
+class MessageContentCache:
+    """Recent message content per guild, for the delete and edit logs.
+
+    nextcord's message cache is global and holds full ``Message`` objects.
+    This keeps one small slotted record per message instead, only for
+    guilds that log deletes or edits, and bounds each guild to
+    ``max_bytes`` so a busy server can't push a quiet one's messages out.
+    The least recently seen messages are evicted first.
+
+    Like nextcord's cache it lives in memory only, so it starts empty after
+    a restart. Deletes and edits of older messages are still logged through
+    the raw events, but without their previous content.
+    """
+
+    def __init__(self, max_bytes: int = MESSAGE_CACHE_GUILD_BYTES):
+        self.max_bytes = max_bytes
+        self.guilds: Dict[int, GuildMessages] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return sum(len(guild.entries) for guild in self.guilds.values())
+
+    def put(self, guild_id: int, record: CachedMessage):
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = self.guilds[guild_id] = GuildMessages()
+        old = guild.entries.pop(record.id, None)
+        if old is not None:
+            guild.bytes -= old.size
+        guild.entries[record.id] = record
+        guild.bytes += record.size
+        while guild.bytes > self.max_bytes and len(guild.entries) > 1:
+            _, evicted = guild.entries.popitem(last=False)
+            guild.bytes -= evicted.size
+            self.evictions += 1
+
+    def remember(self, message):
+        self.put(message.guild.id, CachedMessage.from_message(message))
+
+    def get(self, guild_id: int, message_id: int) -> Optional[CachedMessage]:
+        guild = self.guilds.get(guild_id)
+        record = guild.entries.get(message_id) if guild else None
+        if record is None:
+            self.misses += 1
+            return None
+        guild.entries.move_to_end(message_id)
+        self.hits += 1
+        return record
+
+    def pop(self, guild_id: int, message_id: int) -> Optional[CachedMessage]:
+        guild = self.guilds.get(guild_id)
+        record = guild.entries.pop(message_id, None) if guild else None
+        if record is None:
+            self.misses += 1
+            return None
+        guild.bytes -= record.size
+        self.hits += 1
+        return record
+
+    def drop_guild(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
+
+    def stats(self) -> dict:
+        return {
+            'guilds': len(self.guilds),
+            'messages': len(self),
+            'bytes': sum(guild.bytes for guild in self.guilds.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def get_message_cache(bot) -> MessageContentCache:
+    """Return the message content cache shared by the logging cogs."""
+    cache = getattr(bot, "message_cache", None)
+    if cache is None:
+        cache = MessageContentCache()
+        bot.message_cache = cache
+    return cache
@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MOD_LOG_PATH = "database/mod_logs"
+SCHEMA_VERSION = 1
+
+DEFAULT_LOG_TYPES = {
+    "message_delete": True,
+    "message_edit": True,
+    "member_ban": True,
+    "member_unban": True,
+    "role_update": True,
+    "member_join": True,
+    "member_leave": True,
+    "nickname_change": True,
+    "channel_create": True,
+    "channel_delete": True,
+    "channel_update": True,
+    "voice_state": True,
+    "role_create": True,
+    "role_delete": True,
+    "member_timeout": True
+}
+
+
+def default_config() -> dict:
+    """Configuration of a guild that never ran a /mod_log command."""
+    return {
+        "version": SCHEMA_VERSION,
+        "enabled": False,
+        "log_channel": None,
+        "log_types": dict(DEFAULT_LOG_TYPES)
+    }
+
+
+def migrate(config: dict) -> bool:
+    """Bring a stored config up to ``SCHEMA_VERSION`` in place; True if it changed."""
+    version = config.get("version", 0)
+    if version >= SCHEMA_VERSION:
+        return False
+    if version < 1:
+        # Unversioned files: log_channel was sometimes saved as a string.
+        if config.get("log_channel") is not None:
+            config["log_channel"] = int(config["log_channel"])
+        config.setdefault("log_types", {})
+    config["version"] = SCHEMA_VERSION
+    return True
+
+
+class ModLogConfigs:
+    """The one place mod log guild configs are read and written.
+
+    Shared by ``ModLogging`` (which edits configs) and ``LoggingListener``
+    (which reads one on every event). Each guild's file is read once; its
+    stored values are laid over ``default_config()`` in memory, so new log
+    types show up without rewriting any file. A file from an older schema
+    is migrated and saved once, when it is first loaded.
+
+    Configs returned by ``get`` are shared and must not be mutated; change
+    them with ``update``, which saves the file and then calls every
+    subscriber with ``(guild_id, config)``.
+    """
+
+    def __init__(self, base_path: str = MOD_LOG_PATH):
+        self.base_path = base_path
+        os.makedirs(base_path, exist_ok=True)
+        self.configs: Dict[int, dict] = {}
+        self.subscribers: List[Callable[[int, dict], None]] = []
+
+    def path(self, guild_id: int) -> str:
+        return os.path.join(self.base_path, f"{guild_id}.json")
+
+    def _load(self, guild_id: int) -> dict:
+        config = default_config()
+        path = self.path(guild_id)
+        if not os.path.exists(path):
+            return config
+
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if migrate(stored):
+            logger.info(f"Migrated mod log config for guild {guild_id} to version {SCHEMA_VERSION}")
+            self._write(guild_id, stored)
+        config["log_types"].update(stored.pop("log_types", {}))
+        config.update(stored)
+        return config
+
+    def _write(self, guild_id: int, config: dict):
+        path = self.path(guild_id)
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=4, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def get(self, guild_id: int) -> dict:
+        config = self.configs.get(guild_id)
+        if config is None:
+            config = self.configs[guild_id] = self._load(guild_id)
+        return config
+
+    def update(self, guild_id: int, log_types: Optional[Dict[str, bool]] = None, **fields) -> dict:
+        """Save a changed copy of the guild's config and notify subscribers."""
+        current = self.get(guild_id)
+        config = {**current, **fields, "log_types": {**current["log_types"], **(log_types or {})}}
+        self._write(guild_id, config)
+        self.configs[guild_id] = config
+
+        for callback in list(self.subscribers):
+            try:
+                callback(guild_id, config)
+            except Exception as e:
+                logger.error(f"Mod log config subscriber {callback!r} failed: {e}")
+        return config
+
+    def subscribe(self, callback: Callable[[int, dict], None]):
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int, dict], None]):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def invalidate(self, guild_id: int):
+        """Forget the cached config, e.g. after editing the file by hand."""
+        self.configs.pop(guild_id, None)
+
+
+def get_mod_log_configs(bot) -> ModLogConfigs:
+    """Return the config service shared by the mod log cogs."""
+    configs = getattr(bot, "mod_log_configs", None)
+    if configs is None:
+        configs = ModLogConfigs()
+        bot.mod_log_configs = configs
+    return configs
@@ -0,0 +1,48 @@
+from typing import Iterable, List, Optional
+
+from utils import config
+
+
+def configured_nodes() -> List[dict]:
+    """The ``MAIN`` node from ``LAVALINK_HOST``/``PORT``/``PASSWORD``, if set, plus ``LAVALINK_NODES``."""
+    nodes = []
+    if config.LAVALINK_HOST and config.LAVALINK_PORT and config.LAVALINK_PASSWORD:
+        nodes.append({
+            "label": "MAIN",
+            "host": config.LAVALINK_HOST,
+            "port": config.LAVALINK_PORT,
+            "password": config.LAVALINK_PASSWORD,
+        })
+    nodes.extend(dict(node) for node in getattr(config, "LAVALINK_NODES", []))
+    for index, node in enumerate(nodes):
+        node.setdefault("label", f"NODE-{index + 1}")
+        node.setdefault("secure", False)
+    return nodes
+
+
+def node_penalty(node) -> float:
+    """Load score in the spirit of Lavalink's own balancing: lower is better.
+
+    Each playing player counts once, CPU load grows the score exponentially
+    near saturation and memory pressure adds up to 100. Nodes that have not
+    reported stats yet only count their local players.
+    """
+    stats = node.stats
+    players = len(node.players)
+    if stats is None:
+        return float(players)
+
+    playing = stats.playing_player_count
+    cpu = 1.05 ** (100 * stats.cpu.lavalink_load) * 10 - 10
+    memory = 0.0
+    if stats.memory.reservable:
+        memory = stats.memory.used / stats.memory.reservable * 100
+    return players + playing + cpu + memory
+
+
+def least_loaded_node(nodes: Iterable, exclude=None) -> Optional[object]:
+    """The available node with the lowest ``node_penalty``."""
+    candidates = [node for node in nodes if node.available and node is not exclude]
+    if not candidates:
+        return None
+    return min(candidates, key=node_penalty)
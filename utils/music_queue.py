@@ -0,0 +1,162 @@
+import random
+from collections import deque
+from itertools import islice
+from typing import Iterable, List
+
+DEFAULT_MAX_TRACKS = 5000
+
+
+def track_key(track) -> str:
+    """Identity used for dedupe: the source identifier, falling back to the uri."""
+    return getattr(track, "identifier", None) or getattr(track, "uri", None) or track.title
+
+
+class TrackQueue:
+    """Upcoming tracks of one guild.
+
+    Backed by a ``deque`` so taking the next track and adding a whole
+    playlist are O(1) per track instead of ``list.pop(0)``'s O(n). Holds at
+    most ``max_size`` tracks; anything past the cap is dropped and reported
+    back to the caller.
+    """
+
+    def __init__(self, tracks: Iterable = (), max_size: int = DEFAULT_MAX_TRACKS):
+        self.max_size = max_size
+        self._tracks = deque()
+        self.extend(tracks)
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __bool__(self):
+        return bool(self._tracks)
+
+    def __iter__(self):
+        return iter(self._tracks)
+
+    def __getitem__(self, index: int):
+        return self._tracks[index]
+
+    @property
+    def free(self) -> int:
+        return max(0, self.max_size - len(self._tracks))
+
+    def append(self, track) -> bool:
+        if not self.free:
+            return False
+        self._tracks.append(track)
+        return True
+
+    def extend(self, tracks: Iterable) -> int:
+        """Add tracks up to the cap; returns how many were added."""
+        before = len(self._tracks)
+        self._tracks.extend(islice(tracks, self.free))
+        return len(self._tracks) - before
+
+    def pop(self):
+        """Remove and return the next track, or ``None`` when empty."""
+        return self._tracks.popleft() if self._tracks else None
+
+    def remove(self, index: int):
+        """Remove and return the track at 0-based ``index``."""
+        track = self._tracks[index]
+        del self._tracks[index]
+        return track
+
+    def move(self, source: int, destination: int):
+        """Move the track at ``source`` so it ends up at ``destination``."""
+        track = self.remove(source)
+        self._tracks.insert(destination, track)
+        return track
+
+    def shuffle(self):
+        # deque indexing is O(n) in the middle, so shuffle a list copy.
+        tracks = list(self._tracks)
+        random.shuffle(tracks)
+        self._tracks = deque(tracks)
+
+    def dedupe(self) -> int:
+        """Drop repeated tracks, keeping the first; returns how many were removed."""
+        seen = set()
+        unique = deque()
+        for track in self._tracks:
+            key = track_key(track)
+            if key not in seen:
+                seen.add(key)
+                unique.append(track)
+        removed = len(self._tracks) - len(unique)
+        self._tracks = unique
+        return removed
+
+    def clear(self):
+        self._tracks.clear()
+
+    def page(self, page: int, per_page: int = 10) -> List:
+        """Tracks on a 1-based page."""
+        start = (page - 1) * per_page
+        return list(islice(self._tracks, start, start + per_page))
+
+    def page_count(self, per_page: int = 10) -> int:
+        return max(1, -(-len(self._tracks) // per_page))
+
+    def duration(self) -> int:
+        """Total length in milliseconds."""
+        return sum(track.length for track in self._tracks)
+
+
+class AutoplayBuffer:
+    """Candidate tracks for autoplay, prefetched before the queue runs dry.
+
+    ``record`` is called for every track that starts; the last few played
+    tracks seed the next related-track search and the last ``history_size``
+    are never offered again, so autoplay does not loop the same songs.
+    """
+
+    def __init__(self, size: int = 5, history_size: int = 50, seeds: int = 3):
+        self.size = size
+        self.candidates = deque()
+        self.recent = deque(maxlen=seeds)
+        self.history = deque(maxlen=history_size)
+        self.refill_task = None
+
+    def __len__(self):
+        return len(self.candidates)
+
+    @property
+    def needs_refill(self) -> bool:
+        return len(self.candidates) < self.size and (self.refill_task is None or self.refill_task.done())
+
+    def record(self, track):
+        key = track_key(track)
+        if key in self.history:
+            self.history.remove(key)
+        self.history.append(key)
+        self.recent.append(track)
+
+    def seed(self):
+        """A recently played track to look up related tracks for."""
+        return random.choice(self.recent) if self.recent else None
+
+    def add(self, tracks: Iterable) -> int:
+        """Queue unseen tracks until the buffer is full; returns how many were added."""
+        skip = set(self.history)
+        skip.update(track_key(track) for track in self.candidates)
+        added = 0
+        for track in tracks:
+            if len(self.candidates) >= self.size:
+                break
+            key = track_key(track)
+            if key not in skip:
+                skip.add(key)
+                self.candidates.append(track)
+                added += 1
+        return added
+
+    def pop(self):
+        return self.candidates.popleft() if self.candidates else None
+
+    def clear(self):
+        self.candidates.clear()
+        if self.refill_task and not self.refill_task.done():
+            self.refill_task.cancel()
+        self.refill_task = None
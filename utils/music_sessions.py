@@ -0,0 +1,108 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+
+class MusicSessionStore:
+    """Guild music sessions (queue, current track, position, volume) in SQLite.
+
+    Changes are only marked here; ``flush`` writes every marked guild in one
+    transaction, so a burst of skips costs a single write. The queue column,
+    which can hold thousands of encoded tracks, is only rewritten for guilds
+    whose queue actually changed; other flushes just refresh the position.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.setup_database()
+
+        self.dirty: Dict[int, bool] = {}
+        self.writes = 0
+
+    def setup_database(self):
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                guild_id INTEGER PRIMARY KEY,
+                channel_id INTEGER NOT NULL,
+                current_track TEXT,
+                position INTEGER NOT NULL DEFAULT 0,
+                volume INTEGER NOT NULL DEFAULT 100,
+                autoplay INTEGER NOT NULL DEFAULT 0,
+                queue TEXT NOT NULL DEFAULT '[]',
+                updated_at REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        self.conn.commit()
+
+    def mark(self, guild_id: int, queue: bool = True):
+        """Schedule ``guild_id`` for the next flush."""
+        self.dirty[guild_id] = self.dirty.get(guild_id, False) or queue
+
+    def flush(self, snapshot: Callable[[int], Optional[dict]]) -> int:
+        """Write marked guilds; ``snapshot`` returns a session dict or ``None`` to drop it."""
+        if not self.dirty:
+            return 0
+        dirty, self.dirty = self.dirty, {}
+        now = time.time()
+        with self.conn:
+            for guild_id, queue_changed in dirty.items():
+                session = snapshot(guild_id)
+                if session is None:
+                    self.conn.execute("DELETE FROM sessions WHERE guild_id = ?", (guild_id,))
+                    continue
+                params = (guild_id, session['channel_id'], session['current_track'], session['position'],
+                          session['volume'], int(session['autoplay']), json.dumps(session['queue']), now)
+                if queue_changed:
+                    self.conn.execute('''
+                        INSERT OR REPLACE INTO sessions
+                            (guild_id, channel_id, current_track, position, volume, autoplay, queue, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', params)
+                else:
+                    self.conn.execute('''
+                        INSERT INTO sessions
+                            (guild_id, channel_id, current_track, position, volume, autoplay, queue, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(guild_id) DO UPDATE SET
+                            channel_id = excluded.channel_id,
+                            current_track = excluded.current_track,
+                            position = excluded.position,
+                            volume = excluded.volume,
+                            autoplay = excluded.autoplay,
+                            updated_at = excluded.updated_at
+                    ''', params)
+        self.writes += 1
+        return len(dirty)
+
+    def load_all(self) -> List[dict]:
+        sessions = []
+        for row in self.conn.execute("SELECT * FROM sessions"):
+            session = dict(row)
+            session['queue'] = json.loads(session['queue'])
+            session['autoplay'] = bool(session['autoplay'])
+            sessions.append(session)
+        return sessions
+
+    def delete(self, guild_id: int):
+        self.dirty.pop(guild_id, None)
+        with self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE guild_id = ?", (guild_id,))
+
+    def close(self):
+        self.conn.close()
+
+
+def get_music_sessions(bot) -> MusicSessionStore:
+    """Return the session store, kept on the bot so cog reloads reuse it."""
+    store = getattr(bot, "music_sessions", None)
+    if store is None:
+        store = MusicSessionStore("database/music_sessions.db")
+        bot.music_sessions = store
+    return store
@@ -0,0 +1,177 @@
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+CATCH_UP_POLICIES = ("once", "all", "skip")
+MAX_CATCH_UP = 24  # occurrences delivered at most by the "all" policy
+SKIP_GRACE = timedelta(minutes=1)  # "skip" still fires reminders this late
+
+DURATION_PATTERN = re.compile(r'(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?')
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})')
+
+
+class RuleError(ValueError):
+    """Raised for a recurrence rule that cannot be parsed."""
+
+
+def parse_interval(text: str) -> Optional[timedelta]:
+    match = DURATION_PATTERN.fullmatch(text)
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    delta = timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+    return delta if delta.total_seconds() > 0 else None
+
+
+class Interval:
+    """``every 30m`` / ``every 1d12h``: fixed steps from the previous due time."""
+
+    def __init__(self, step: timedelta):
+        if step < timedelta(minutes=1):
+            raise RuleError("intervals must be at least 1 minute")
+        self.step = step
+
+    def next_after(self, previous: datetime, now: datetime) -> datetime:
+        if previous > now:
+            return previous
+        missed = (now - previous) // self.step + 1
+        return previous + self.step * missed
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise RuleError(f"bad step in {field!r}")
+        if part == "*":
+            start, stop = low, high
+        elif "-" in part:
+            start, stop = (int(value) for value in part.split("-", 1))
+        else:
+            start = stop = int(part)
+            if step > 1:
+                stop = high
+        if not low <= start <= stop <= high:
+            raise RuleError(f"{field!r} is outside {low}-{high}")
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+class Cron:
+    """Five-field cron expression (minute hour day month weekday), in UTC.
+
+    Weekdays are 0-6 with 0 (or 7) as Sunday. As in cron, when both the
+    day-of-month and weekday fields are restricted a day matching either
+    one fires.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise RuleError("cron expressions need 5 fields: minute hour day month weekday")
+        try:
+            self.minutes = sorted(_parse_field(fields[0], 0, 59))
+            self.hours = sorted(_parse_field(fields[1], 0, 23))
+            self.days = _parse_field(fields[2], 1, 31)
+            self.months = _parse_field(fields[3], 1, 12)
+            self.weekdays = {day % 7 for day in _parse_field(fields[4], 0, 7)}
+        except ValueError as e:
+            raise RuleError(str(e)) from e
+        # As in vixie cron, a field starting with "*" (including "*/n")
+        # counts as unrestricted when combining day and weekday.
+        self.any_day = fields[2].startswith("*")
+        self.any_weekday = fields[4].startswith("*")
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        dom = day.day in self.days
+        dow = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return dow
+        if self.any_weekday:
+            return dom
+        return dom or dow
+
+    def next_after(self, previous: datetime, now: datetime) -> datetime:
+        after = max(previous, now).replace(second=0, microsecond=0)
+        day = after.replace(hour=0, minute=0)
+        # Four years covers every valid day/month/weekday combination (Feb 29).
+        for _ in range(366 * 4 + 1):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate > after:
+                            return candidate
+            day += timedelta(days=1)
+        raise RuleError("cron expression never fires")
+
+
+class RecurrenceRule:
+    """A parsed ``repeat`` option.
+
+    Accepted forms:
+    - ``every 30m``, ``every 2h``, ``every 1d12h``
+    - ``daily 09:00`` and ``weekdays 09:00`` (UTC)
+    - a five-field cron expression, e.g. ``*/15 9-17 * * 1-5``
+    """
+
+    def __init__(self, text: str):
+        self.text = " ".join(text.lower().split())
+        self.schedule = self._parse(self.text)
+
+    @staticmethod
+    def _parse(text: str):
+        words = text.split()
+        if not words:
+            raise RuleError("empty rule")
+        if words[0] == "every" and len(words) == 2:
+            step = parse_interval(words[1])
+            if step is None:
+                raise RuleError(f"bad interval {words[1]!r}")
+            return Interval(step)
+        if words[0] in ("daily", "weekdays") and len(words) <= 2:
+            hour, minute = 0, 0
+            if len(words) == 2:
+                match = TIME_PATTERN.fullmatch(words[1])
+                if not match:
+                    raise RuleError("times look like 09:30")
+                hour, minute = int(match.group(1)), int(match.group(2))
+            weekdays = "1-5" if words[0] == "weekdays" else "*"
+            return Cron(f"{minute} {hour} * * {weekdays}")
+        return Cron(text)
+
+    def next_after(self, previous: datetime, now: datetime) -> datetime:
+        """First occurrence after both ``previous`` and ``now``."""
+        return self.schedule.next_after(previous, now)
+
+    def occurrences(self, previous: datetime, now: datetime, limit: int = MAX_CATCH_UP) -> List[datetime]:
+        """Occurrences from ``previous`` (inclusive) up to ``now``, at most ``limit``."""
+        due = []
+        current = previous
+        while current <= now and len(due) < limit:
+            due.append(current)
+            current = self.schedule.next_after(current, current)
+        return due
+
+
+def catch_up(rule: RecurrenceRule, due: datetime, now: datetime, policy: str):
+    """Decide what a recurring reminder does when it comes due.
+
+    Returns ``(deliveries, next_due)`` where ``deliveries`` is how many
+    times to deliver now. After downtime, ``once`` delivers a single time,
+    ``all`` delivers every missed occurrence (capped at ``MAX_CATCH_UP``)
+    and ``skip`` delivers nothing unless the reminder is on time.
+    """
+    if policy == "all":
+        deliveries = len(rule.occurrences(due, now))
+    elif policy == "skip":
+        deliveries = 1 if now - due <= SKIP_GRACE else 0
+    else:
+        deliveries = 1
+    return deliveries, rule.next_after(due, now)
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import nextcord
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LIMIT = 2000
+
+
+class RateLimiter:
+    """Token bucket: at most ``rate`` sends per ``per`` seconds across all workers.
+
+    nextcord already honours per-route buckets and 429s; this keeps a burst
+    of due reminders well under the global limit so it never gets there.
+    """
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+
+def chunk_lines(items: List[Tuple[str, object]], limit: int = MESSAGE_LIMIT) -> List[Tuple[str, List[object]]]:
+    """Join ``(line, tag)`` pairs into as few messages under ``limit`` characters as possible.
+
+    Returns ``(content, tags)`` per message, the tags of the lines it holds.
+    """
+    messages, current, tags = [], "", []
+    for line, tag in items:
+        line = line[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            messages.append((current, tags))
+            current, tags = line, [tag]
+        else:
+            current = f"{current}\n{line}" if current else line
+            tags.append(tag)
+    if current:
+        messages.append((current, tags))
+    return messages
+
+
+class ReminderDelivery:
+    """Queue that delivers due reminders without holding up the scheduler.
+
+    Reminders due together for the same channel, or the same user's DMs,
+    are merged into one message. ``concurrency`` workers send in parallel
+    behind a shared ``RateLimiter``. Failed sends are retried with
+    exponential backoff; closed DMs and missing channels are not retried.
+    User objects come from the gateway cache or a small LRU, so
+    ``fetch_user`` is called at most once per user.
+
+    Once a message is sent, or has failed for good, ``on_done`` is called
+    with the reminders it carried, so the owner only deletes or advances
+    them after that; anything still queued when the bot stops is
+    delivered again from the store.
+    """
+
+    def __init__(self, bot, on_done: Optional[Callable[[List[object]], None]] = None,
+                 concurrency: int = 4, rate: int = 20, per: float = 1.0,
+                 retries: int = 3, backoff: float = 2.0, user_cache_size: int = 1000):
+        self.bot = bot
+        self.on_done = on_done
+        self.queue: "asyncio.Queue[Tuple[Tuple[str, int], str, int, List[object]]]" = asyncio.Queue()
+        self.limiter = RateLimiter(rate, per)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.users: "OrderedDict[int, nextcord.User]" = OrderedDict()
+        self.user_cache_size = user_cache_size
+        self.workers: List[asyncio.Task] = []
+
+        self.sent = 0
+        self.merged = 0
+        self.retried = 0
+        self.failed = 0
+        self.failures: Deque[Tuple[float, Tuple[str, int], str]] = deque(maxlen=50)
+
+    def start(self):
+        if not self.workers:
+            self.workers = [asyncio.create_task(self.worker()) for _ in range(self.concurrency)]
+
+    def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        self.workers = []
+
+    @staticmethod
+    def format(reminder, count: int, in_channel: bool) -> str:
+        line = f"⏰ <@{reminder.user_id}> Reminder: {reminder.name}" if in_channel else f"⏰ Reminder: {reminder.name}"
+        if count > 1:
+            line += f" (x{count})"
+        if reminder.message:
+            line += f"\n{reminder.message}"
+        return line
+
+    def submit(self, deliveries: List[Tuple[object, int]]):
+        """Queue ``(reminder, times)`` pairs, merged per destination."""
+        grouped: Dict[Tuple[str, int], List[Tuple[str, object]]] = {}
+        for reminder, count in deliveries:
+            if count <= 0:
+                continue
+            if reminder.channel_id and self.bot.get_channel(reminder.channel_id):
+                destination = ("channel", reminder.channel_id)
+            else:
+                destination = ("user", reminder.user_id)
+            line = self.format(reminder, count, destination[0] == "channel")
+            grouped.setdefault(destination, []).append((line, reminder))
+
+        for destination, lines in grouped.items():
+            self.merged += len(lines) - 1
+            for content, reminders in chunk_lines(lines):
+                self.queue.put_nowait((destination, content, 0, reminders))
+
+    async def get_user(self, user_id: int) -> Optional[nextcord.User]:
+        user = self.bot.get_user(user_id) or self.users.get(user_id)
+        if user is None:
+            user = await self.bot.fetch_user(user_id)
+            self.users[user_id] = user
+            if len(self.users) > self.user_cache_size:
+                self.users.popitem(last=False)
+        elif user_id in self.users:
+            self.users.move_to_end(user_id)
+        return user
+
+    async def send(self, destination: Tuple[str, int], content: str):
+        kind, target_id = destination
+        if kind == "channel":
+            channel = self.bot.get_channel(target_id)
+            if channel is None:
+                raise LookupError(f"channel {target_id} is gone")
+        else:
+            channel = await self.get_user(target_id)
+        await self.limiter.acquire()
+        await channel.send(content)
+
+    async def worker(self):
+        while True:
+            destination, content, attempt, reminders = await self.queue.get()
+            done = True
+            try:
+                await self.send(destination, content)
+                self.sent += 1
+            except (nextcord.Forbidden, nextcord.NotFound, LookupError) as e:
+                self.record_failure(destination, e)
+            except Exception as e:
+                if attempt + 1 < self.retries:
+                    done = False
+                    self.retried += 1
+                    delay = self.backoff ** attempt
+                    retry_after = getattr(e, "retry_after", None)
+                    if retry_after:
+                        delay = max(delay, retry_after)
+                    asyncio.get_running_loop().call_later(
+                        delay, self.queue.put_nowait, (destination, content, attempt + 1, reminders)
+                    )
+                else:
+                    self.record_failure(destination, e)
+            finally:
+                self.queue.task_done()
+            if done and self.on_done is not None:
+                try:
+                    self.on_done(reminders)
+                except Exception as e:
+                    logger.error(f"Error finishing {len(reminders)} delivered reminders: {e}")
+
+    def record_failure(self, destination: Tuple[str, int], error: Exception):
+        self.failed += 1
+        self.failures.append((time.time(), destination, str(error)))
+        logger.error(f"Failed to deliver reminder to {destination[0]} {destination[1]}: {error}")
+
+    def stats(self) -> dict:
+        return {
+            'queued': self.queue.qsize(),
+            'sent': self.sent,
+            'merged': self.merged,
+            'retried': self.retried,
+            'failed': self.failed,
+            'cached_users': len(self.users),
+        }
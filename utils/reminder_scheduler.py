@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+    """Min-heap of ``(due_time, key)`` served by a single sleeping task.
+
+    The task sleeps exactly until the earliest due time and is woken early
+    when something earlier is scheduled. Rescheduling or cancelling a key
+    leaves its old heap entry behind; ``due`` holds the live due time per
+    key so stale entries are skipped when they surface, and the heap is
+    rebuilt once stale entries outnumber live ones.
+    """
+
+    def __init__(self, callback: Callable[[List[Hashable]], Awaitable[None]]):
+        self.callback = callback
+        self.heap: List[Tuple[float, Hashable]] = []
+        self.due: Dict[Hashable, float] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self.due)
+
+    def __contains__(self, key):
+        return key in self.due
+
+    def schedule(self, key: Hashable, due_at: float):
+        """Schedule or move ``key`` to unix time ``due_at``."""
+        wake = not self.heap or due_at < self.heap[0][0]
+        self.due[key] = due_at
+        heapq.heappush(self.heap, (due_at, key))
+        self._compact()
+        if wake:
+            self.wakeup.set()
+
+    def cancel(self, key: Hashable):
+        if self.due.pop(key, None) is not None:
+            self._compact()
+
+    def next_due(self) -> Optional[float]:
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def _drop_stale(self):
+        while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def _compact(self):
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.due):
+            self.heap = [(due_at, key) for key, due_at in self.due.items()]
+            heapq.heapify(self.heap)
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """Remove and return every key due at or before ``now``, earliest first."""
+        keys = []
+        while True:
+            self._drop_stale()
+            if not self.heap or self.heap[0][0] > now:
+                return keys
+            _, key = heapq.heappop(self.heap)
+            del self.due[key]
+            keys.append(key)
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        if self.task is None or self.task.done():
+            self.task = (loop or asyncio.get_event_loop()).create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            keys = self.pop_due(time.time())
+            if keys:
+                # One bad batch must not stop every later reminder.
+                try:
+                    await self.callback(keys)
+                except Exception:
+                    logger.exception(f"Reminder callback failed for {len(keys)} due keys")
+                continue
+
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - time.time())
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Reminder:
+    """Data class for storing reminder information."""
+    name: str
+    time: datetime  # naive UTC
+    channel_id: Optional[int] = None  # Allow sending to specific channel
+    message: str = ""  # Optional custom message
+    recurring: bool = False  # Support for recurring reminders
+    user_id: int = 0
+    rule: Optional[str] = None  # see utils.recurrence.RecurrenceRule
+    catch_up: str = "once"  # what to do with occurrences missed during downtime
+    id: Optional[int] = None  # assigned by the store, never reused
+
+    @property
+    def due_at(self) -> float:
+        """Due time as a unix timestamp."""
+        return self.time.replace(tzinfo=timezone.utc).timestamp()
+
+    def to_dict(self) -> Dict:
+        """Convert reminder to dictionary for JSON storage."""
+        return {
+            "name": self.name,
+            "time": self.time.isoformat(),
+            "channel_id": self.channel_id,
+            "message": self.message,
+            "recurring": self.recurring
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Reminder':
+        """Create reminder from dictionary."""
+        return cls(
+            name=data["name"],
+            time=datetime.fromisoformat(data["time"]),
+            channel_id=data.get("channel_id"),
+            message=data.get("message", ""),
+            recurring=data.get("recurring", False)
+        )
+
+
+class ReminderStore:
+    """Every reminder in one SQLite table (WAL mode).
+
+    Ids are ``INTEGER PRIMARY KEY AUTOINCREMENT`` so they stay stable and are
+    never reused after a delete. ``due_at`` and ``(user_id, due_at)`` are
+    indexed: listing a user's reminders and pulling the next batch due are
+    both index range scans.
+    """
+
+    COLUMNS = ("user_id", "name", "due_at", "channel_id", "message", "recurring", "rule", "catch_up")
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.setup_database()
+
+    def setup_database(self):
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS reminders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    due_at REAL NOT NULL,
+                    channel_id INTEGER,
+                    message TEXT NOT NULL DEFAULT '',
+                    recurring INTEGER NOT NULL DEFAULT 0,
+                    rule TEXT,
+                    catch_up TEXT NOT NULL DEFAULT 'once'
+                )
+            ''')
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(reminders)")}
+            if 'rule' not in columns:
+                self.conn.execute("ALTER TABLE reminders ADD COLUMN rule TEXT")
+                self.conn.execute("ALTER TABLE reminders ADD COLUMN catch_up TEXT NOT NULL DEFAULT 'once'")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (due_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_user ON reminders (user_id, due_at)")
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Reminder:
+        return Reminder(
+            id=row['id'],
+            user_id=row['user_id'],
+            name=row['name'],
+            time=datetime.fromtimestamp(row['due_at'], timezone.utc).replace(tzinfo=None),
+            channel_id=row['channel_id'],
+            message=row['message'],
+            recurring=bool(row['recurring']),
+            rule=row['rule'],
+            catch_up=row['catch_up']
+        )
+
+    @staticmethod
+    def _values(reminder: Reminder) -> tuple:
+        return (reminder.user_id, reminder.name, reminder.due_at, reminder.channel_id,
+                reminder.message, int(reminder.recurring), reminder.rule, reminder.catch_up)
+
+    def add(self, reminder: Reminder) -> Reminder:
+        """Insert ``reminder`` and set its id."""
+        self.add_many([reminder])
+        return reminder
+
+    def add_many(self, reminders: Iterable[Reminder]):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self.conn:
+            for reminder in reminders:
+                cursor = self.conn.execute(
+                    f"INSERT INTO reminders ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                    self._values(reminder)
+                )
+                reminder.id = cursor.lastrowid
+
+    def update_many(self, reminders: Iterable[Reminder]):
+        assignments = ", ".join(f"{column} = ?" for column in self.COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"UPDATE reminders SET {assignments} WHERE id = ?",
+                (self._values(reminder) + (reminder.id,) for reminder in reminders)
+            )
+
+    def get(self, reminder_id: int) -> Optional[Reminder]:
+        row = self.conn.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def delete(self, reminder_id: int, user_id: Optional[int] = None) -> bool:
+        """Delete one reminder; with ``user_id`` only if it belongs to that user."""
+        with self.conn:
+            if user_id is None:
+                cursor = self.conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+            else:
+                cursor = self.conn.execute(
+                    "DELETE FROM reminders WHERE id = ? AND user_id = ?", (reminder_id, user_id)
+                )
+        return cursor.rowcount > 0
+
+    def delete_many(self, reminder_ids: Iterable[int]):
+        with self.conn:
+            self.conn.executemany("DELETE FROM reminders WHERE id = ?", ((rid,) for rid in reminder_ids))
+
+    def delete_user(self, user_id: int) -> List[int]:
+        """Delete all of a user's reminders; returns their ids."""
+        with self.conn:
+            ids = [row['id'] for row in self.conn.execute(
+                "SELECT id FROM reminders WHERE user_id = ?", (user_id,)
+            )]
+            self.conn.execute("DELETE FROM reminders WHERE user_id = ?", (user_id,))
+        return ids
+
+    def list_user(self, user_id: int, limit: int = 25) -> List[Reminder]:
+        """A user's reminders, soonest first."""
+        rows = self.conn.execute(
+            "SELECT * FROM reminders WHERE user_id = ? ORDER BY due_at LIMIT ?", (user_id, limit)
+        )
+        return [self._from_row(row) for row in rows]
+
+    def count_user(self, user_id: int) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM reminders WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def next_due(self, limit: int = 1000) -> List[Reminder]:
+        """The ``limit`` reminders due soonest."""
+        rows = self.conn.execute("SELECT * FROM reminders ORDER BY due_at LIMIT ?", (limit,))
+        return [self._from_row(row) for row in rows]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_reminder_files(store: ReminderStore, directory: Union[str, Path]) -> int:
+    """Import the old ``{user_id}_reminder.json`` files into ``store``.
+
+    Each file is renamed to ``*.migrated`` once imported, so the import
+    never runs twice. Returns the number of imported reminders.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0
+
+    migrated = 0
+    for path in directory.glob('*_reminder.json'):
+        user_id = int(path.stem.split('_')[0])
+        try:
+            with path.open('r') as file:
+                reminders = [Reminder.from_dict(data) for data in json.load(file)]
+        except Exception as e:
+            logger.error(f"Error migrating reminders from {path}: {e}")
+            continue
+        for reminder in reminders:
+            reminder.user_id = user_id
+        store.add_many(reminders)
+        os.replace(path, path.with_name(path.name + ".migrated"))
+        migrated += len(reminders)
+    return migrated
+
+
+def get_reminder_store(bot) -> ReminderStore:
+    """Return the reminder store shared by the bot, opening it on first use."""
+    store = getattr(bot, "reminder_store", None)
+    if store is None:
+        store = ReminderStore("database/reminders.db")
+        migrated = migrate_reminder_files(store, "database/reminder")
+        if migrated:
+            logger.info(f"Migrated {migrated} reminders from per-user files")
+        bot.reminder_store = store
+    return store
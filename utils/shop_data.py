@@ -0,0 +1,11 @@
+# shop_data.py
+
+# Items sold in !store, keyed by the id used with !buy
+items = {
+    "rod": {"name": "Fishing Rod", "price": 500},
+    "laptop": {"name": "Laptop", "price": 2000},
+    "bank_upgrade": {"name": "Bank Upgrade", "price": 5000}
+}
+
+# Bank capacity added by one bank_upgrade
+BANK_UPGRADE_CAPACITY = 5000
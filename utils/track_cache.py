@@ -0,0 +1,115 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from utils.config import TRACK_CACHE_MAX_BYTES, TRACK_CACHE_NEGATIVE_TTL, TRACK_CACHE_TTL
+
+URL_PATTERN = re.compile(r"^https?://", re.IGNORECASE)
+ENTRY_OVERHEAD = 200
+
+
+def cache_key(query: str, search_type) -> Tuple[str, str]:
+    """URLs are kept verbatim; searches are case and whitespace insensitive."""
+    query = query.strip()
+    if URL_PATTERN.match(query):
+        return ("url", query)
+    return (str(getattr(search_type, "value", search_type)), " ".join(query.lower().split()))
+
+
+def _track_size(track) -> int:
+    return ENTRY_OVERHEAD + sum(
+        len(getattr(track, field, None) or "") for field in ("id", "title", "author", "uri", "artwork_url")
+    )
+
+
+def result_size(result) -> int:
+    """Rough bytes held by a ``fetch_tracks`` result."""
+    if not result:
+        return ENTRY_OVERHEAD
+    tracks = getattr(result, "tracks", result)
+    return ENTRY_OVERHEAD + sum(_track_size(track) for track in tracks)
+
+
+class TrackSearchCache:
+    """LRU + TTL cache of Lavalink search results shared by every guild.
+
+    Misses (empty results) are cached too, for ``negative_ttl`` seconds, so
+    a typo spammed in ``/play`` only reaches YouTube once. The cache is
+    bounded by an estimate of the bytes it holds rather than entry count,
+    because one playlist can weigh as much as a thousand single tracks.
+    """
+
+    def __init__(self, max_bytes: int = TRACK_CACHE_MAX_BYTES, ttl: float = TRACK_CACHE_TTL,
+                 negative_ttl: float = TRACK_CACHE_NEGATIVE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _drop(self, key):
+        _, _, size = self.entries.pop(key)
+        self.bytes -= size
+
+    def get(self, key) -> Tuple[bool, Optional[object]]:
+        """Return ``(found, result)``; ``result`` may be empty for a cached miss."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        result, expires, _ = entry
+        if expires <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return False, None
+
+        self.entries.move_to_end(key)
+        if result:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return True, result
+
+    def put(self, key, result):
+        if key in self.entries:
+            self._drop(key)
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if result else self.negative_ttl
+        self.entries[key] = (result, time.monotonic() + ttl, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+def get_track_cache(bot) -> TrackSearchCache:
+    """Return the cache shared by every guild, surviving cog reloads."""
+    cache = getattr(bot, "track_cache", None)
+    if cache is None:
+        cache = TrackSearchCache()
+        bot.track_cache = cache
+    return cache